@@ -1,10 +1,10 @@
-from flask import Flask, send_from_directory, jsonify, request
+from flask import Flask, abort, send_from_directory, jsonify, request
 from flask_cors import CORS
 from flask_login import LoginManager 
 from flask_session import Session
 from app.models.user_model import Users
-from .config import SECRET_KEY
-import os
+from .config import SECRET_KEY, SESSION_BACKEND, SESSION_FILE_DIR
+from app.services.session_store import create_session_interface
 
 from app.college.college_controller import college_bp
 from app.program.program_controller import program_bp
@@ -12,12 +12,22 @@ from app.student.student_controller import student_bp
 from app.stats.stats_controller import stats_bp
 from app.users.auth_controller import auth_bp
 from app.users.user_controller import user_bp
+from app.uploads.upload_controller import upload_bp
+from app.models.student_model import StudentModel
+from app.models.program_model import program_reference
+from app.services.upload_queue import upload_queue
+from app.services import compression, metrics, rate_limit
+from app.services.password_hashing import password_hasher, HashingBusy
+from app.services.serialization import JSONProvider
+from app.services.static_assets import AssetManifest
+from app.services.storage import get_storage, LocalDiskStorage
 
 def create_app():
-    app = Flask(__name__, 
-                static_folder="../dist", 
-                static_url_path="/")
+    # The frontend build is served from the manifest below, not Flask's static route.
+    app = Flask(__name__, static_folder=None)
     
+    app.json = JSONProvider(app)
+
     if not SECRET_KEY:
         raise ValueError("SECRET_KEY environment variable is required")
     
@@ -32,7 +42,12 @@ def create_app():
         SESSION_REFRESH_EACH_REQUEST=True,
     )
 
-    Session(app)
+    if SESSION_BACKEND == 'filesystem':
+        if SESSION_FILE_DIR:
+            app.config['SESSION_FILE_DIR'] = SESSION_FILE_DIR
+        Session(app)
+    else:
+        app.session_interface = create_session_interface(SESSION_BACKEND)
 
     CORS(app, 
          origins=["http://localhost:5173", "http://127.0.0.1:5000", "http://localhost:5000"], 
@@ -41,13 +56,19 @@ def create_app():
          expose_headers=["Set-Cookie"],
          methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"])
 
+    metrics.init_app(app)
+    compression.init_app(app)
+
     login_manager = LoginManager()
     login_manager.init_app(app)
     login_manager.session_protection = "strong"
 
     @login_manager.user_loader
     def load_user(user_id):
-        return Users.get_by_id(user_id)
+        return Users.get_cached(user_id)
+
+    # After login_manager, so buckets can be keyed by the logged-in user.
+    rate_limit.init_app(app)
 
     app.register_blueprint(college_bp, url_prefix='/api/colleges')
     app.register_blueprint(program_bp, url_prefix='/api/programs')
@@ -55,23 +76,66 @@ def create_app():
     app.register_blueprint(stats_bp, url_prefix='/api/stats')
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(user_bp, url_prefix='/api/users')
+    app.register_blueprint(upload_bp, url_prefix='/api/uploads')
+
+    def set_student_avatar(id, url, variant_urls):
+        if not StudentModel.update_avatar(id, url, variant_urls):
+            raise LookupError(f"Student {id} no longer exists")
+
+    def set_user_avatar(user_id, url, variant_urls):
+        if Users.update_avatar(user_id, url, variant_urls) is None:
+            raise RuntimeError(f"Could not save avatar for user {user_id}")
+
+    upload_queue.register('student', set_student_avatar)
+    upload_queue.register('user', set_user_avatar)
+    upload_queue.start()
+
+    # Fork the hashing processes before any request thread exists.
+    password_hasher.start()
+
+    try:
+        program_reference.preload()
+    except Exception as e:
+        print(f"Could not preload {program_reference.table}: {e}")
+
+    storage = get_storage()
+    if isinstance(storage, LocalDiskStorage):
+        @app.route(storage.base_url + "<path:filename>")
+        def serve_upload(filename):
+            return send_from_directory(storage.root, filename)
+
+    assets = AssetManifest()
+
+    def serve_index():
+        if assets.index is None:
+            return jsonify({"error": "Frontend build not found"}), 404
+        return assets.send_index(request)
 
     @app.route("/")
     def serve():
-        if os.path.exists(os.path.join(app.static_folder, "index.html")):
-            return send_from_directory(app.static_folder, "index.html")
-        return "Frontend not built", 404
+        return serve_index()
+
+    @app.route("/<path:filename>")
+    def serve_asset(filename):
+        asset = assets.get(filename)
+        if asset is not None:
+            return assets.send(asset, request)
+        if filename.startswith("api/") or filename.startswith("assets/"):
+            abort(404)
+        return serve_index()
+
+    @app.errorhandler(HashingBusy)
+    def hashing_busy(e):
+        response = jsonify({"error": "Server busy, please try again shortly"})
+        response.status_code = 503
+        response.headers["Retry-After"] = "1"
+        return response
 
     @app.errorhandler(404)
     def not_found(e):
-        path = request.path
-        
-        if path and os.path.exists(os.path.join(app.static_folder, path.lstrip("/"))):
-             return send_from_directory(app.static_folder, path.lstrip("/"))
-        
-        if os.path.exists(os.path.join(app.static_folder, "index.html")):
-            return send_from_directory(app.static_folder, "index.html")
-        
-        return jsonify({"error": "Frontend build not found"}), 404
+        # Unknown API routes and missing build files get a real 404, never index.html.
+        if request.path.startswith(("/api/", "/assets/")):
+            return jsonify({"error": "Not found"}), 404
+        return serve_index()
 
     return app
\ No newline at end of file
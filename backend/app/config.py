@@ -1,3 +1,8 @@
 from os import getenv
 
-SECRET_KEY = getenv("SECRET_KEY")
\ No newline at end of file
+SECRET_KEY = getenv("SECRET_KEY")
+
+# filesystem (Flask-Session), postgres or redis
+SESSION_BACKEND = getenv("SESSION_BACKEND", "filesystem")
+# Where the filesystem backend keeps its files (Flask-Session's default: ./flask_session)
+SESSION_FILE_DIR = getenv("SESSION_FILE_DIR")
@@ -1,12 +1,317 @@
-import psycopg2
+import os
+import threading
+import time
+from contextlib import contextmanager
 from os import getenv
 
-def get_db_connection():
-    conn = psycopg2.connect(
+import psycopg2
+from psycopg2 import extensions
+
+from app.services.metrics import record_query
+
+
+class TimedCursorMixin:
+    """Reports the duration of every statement to app.services.metrics."""
+
+    def execute(self, query, vars=None):
+        started = time.perf_counter()
+        try:
+            return super().execute(query, vars)
+        finally:
+            record_query(query, vars, time.perf_counter() - started)
+
+    def executemany(self, query, vars_list):
+        started = time.perf_counter()
+        try:
+            return super().executemany(query, vars_list)
+        finally:
+            record_query(query, None, time.perf_counter() - started)
+
+    def copy_expert(self, sql, file, size=8192):
+        started = time.perf_counter()
+        try:
+            return super().copy_expert(sql, file, size)
+        finally:
+            record_query(sql, None, time.perf_counter() - started)
+
+
+_timed_cursor_classes = {}
+
+
+def _timed_cursor_class(factory):
+    cls = _timed_cursor_classes.get(factory)
+    if cls is None:
+        cls = _timed_cursor_classes[factory] = type(f"Timed{factory.__name__}", (TimedCursorMixin, factory), {})
+    return cls
+
+
+class InstrumentedConnection(extensions.connection):
+    """Connection whose cursors, whatever cursor_factory is requested, are timed."""
+
+    def cursor(self, *args, **kwargs):
+        factory = kwargs.get('cursor_factory') or self.cursor_factory or extensions.cursor
+        kwargs['cursor_factory'] = _timed_cursor_class(factory)
+        return super().cursor(*args, **kwargs)
+
+
+def connect():
+    return psycopg2.connect(
         host=getenv('DB_HOST'),
         database=getenv('DB_NAME'),
         user=getenv('DB_USERNAME'),
         password=getenv('DB_PASSWORD'),
-        port=getenv('DB_PORT')
+        port=getenv('DB_PORT'),
+        connection_factory=InstrumentedConnection
     )
-    return conn
\ No newline at end of file
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    """
+    Thread-safe PostgreSQL connection pool.
+
+    Connections are created lazily up to max_size, health-checked on checkout
+    when they have been idle longer than check_after seconds, and closed once
+    they sit idle longer than max_idle (never dropping below min_size).
+    """
+
+    def __init__(self, min_size=1, max_size=10, timeout=10.0, max_idle=300.0, check_after=30.0):
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError("Invalid pool size configuration")
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.check_after = check_after
+
+        self._cond = threading.Condition()
+        self._idle = []
+        self._size = 0
+        self._in_use = 0
+        self._closed = False
+
+        self._checkouts = 0
+        self._checkout_failures = 0
+        self._timeouts = 0
+        self._created = 0
+        self._discarded = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def getconn(self):
+        started = time.monotonic()
+        deadline = started + self.timeout
+        conn = None
+        last_used = None
+        expired = []
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolTimeout("Connection pool is closed")
+
+                expired.extend(self._reap_locked())
+
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                    break
+
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    self._checkout_failures += 1
+                    raise PoolTimeout(f"No database connection available after {self.timeout}s")
+                self._cond.wait(remaining)
+
+            self._in_use += 1
+
+        for stale in expired:
+            self._close_quietly(stale)
+
+        try:
+            if conn is not None and not self._is_healthy(conn, last_used):
+                self._close_quietly(conn)
+                conn = None
+                with self._cond:
+                    self._discarded += 1
+            if conn is None:
+                conn = connect()
+                with self._cond:
+                    self._created += 1
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._in_use -= 1
+                self._checkout_failures += 1
+                self._cond.notify()
+            raise
+
+        waited = time.monotonic() - started
+        with self._cond:
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        return conn
+
+    def putconn(self, conn, discard=False):
+        if not discard and not conn.closed:
+            try:
+                if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception:
+                discard = True
+
+        with self._cond:
+            self._in_use -= 1
+            keep = not (discard or conn.closed or self._closed)
+            if keep:
+                self._idle.append((conn, time.monotonic()))
+            else:
+                self._size -= 1
+                self._discarded += 1
+            self._cond.notify()
+
+        if not keep:
+            self._close_quietly(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self.getconn()
+        discard = False
+        try:
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            discard = True
+            raise
+        finally:
+            self.putconn(conn, discard=discard)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._size -= len(idle)
+            self._idle = []
+            self._cond.notify_all()
+        for conn in idle:
+            self._close_quietly(conn)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "size": self._size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "checkouts": self._checkouts,
+                "checkout_failures": self._checkout_failures,
+                "timeouts": self._timeouts,
+                "created": self._created,
+                "discarded": self._discarded,
+                "wait_time_total": self._wait_total,
+                "wait_time_max": self._wait_max,
+                "wait_time_avg": self._wait_total / self._checkouts if self._checkouts else 0.0,
+            }
+
+    def _reap_locked(self):
+        if self.max_idle is None:
+            return []
+        now = time.monotonic()
+        keep = []
+        expired = []
+        # The idle list is used as a stack, so the oldest connections sit at the front.
+        for conn, last_used in self._idle:
+            if now - last_used > self.max_idle and self._size - len(expired) > self.min_size:
+                expired.append(conn)
+            else:
+                keep.append((conn, last_used))
+        self._idle = keep
+        self._size -= len(expired)
+        self._discarded += len(expired)
+        return expired
+
+    def _is_healthy(self, conn, last_used):
+        if conn.closed:
+            return False
+        if time.monotonic() - last_used < self.check_after:
+            return True
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT 1")
+            cur.close()
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+_pool_overrides = {}
+
+
+def configure_pool(**options):
+    """
+    Overrides ConnectionPool settings (min_size, max_size, ...) for pools
+    built from now on in this process, taking precedence over the DB_POOL_*
+    environment variables. Used by serve.py to size each worker's pool.
+    """
+    _pool_overrides.update(options)
+
+
+def get_pool():
+    global _pool, _pool_pid
+    # A pool inherited across fork() shares sockets with the parent, so each process builds its own.
+    if _pool is None or _pool_pid != os.getpid():
+        with _pool_lock:
+            if _pool is None or _pool_pid != os.getpid():
+                options = dict(
+                    min_size=int(getenv('DB_POOL_MIN_SIZE', '1')),
+                    max_size=int(getenv('DB_POOL_MAX_SIZE', '10')),
+                    timeout=float(getenv('DB_POOL_TIMEOUT', '10')),
+                    max_idle=float(getenv('DB_POOL_MAX_IDLE', '300')),
+                    check_after=float(getenv('DB_POOL_CHECK_AFTER', '30')),
+                )
+                options.update(_pool_overrides)
+                _pool = ConnectionPool(**options)
+                _pool_pid = os.getpid()
+    return _pool
+
+
+def close_pool():
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.close()
+        _pool = None
+        _pool_pid = None
+
+
+def get_pool_stats():
+    return get_pool().stats()
+
+
+def get_db_connection():
+    """
+    Borrow a pooled connection for the duration of a `with` block.
+
+    Any transaction left open is rolled back when the connection is returned.
+    """
+    return get_pool().connection()
@@ -1,7 +1,15 @@
+import psycopg2
 from app.db import get_db_connection
-from psycopg2.extras import DictCursor
+from app.models.pagination import keyset_page, offset_page
+from app.models.rows import COLLEGE_ROW
+from app.models.constraints import constraint_error
+from app.services.table_versions import bump
 
 class CollegeModel:
+    DELETE_ERRORS = {
+        'program_table_college_code_fkey': (400, "Unable to delete college because there are programs (and students) listed under it.")
+    }
+
     def __init__(self, id, college_code, college_name):
         self.id = id
         self.college_code = college_code
@@ -9,216 +17,186 @@ class CollegeModel:
 
     @classmethod
     def get_all(cls):
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=DictCursor)
-        
-        cur.execute("SELECT id, college_code, college_name FROM college_table")
-        rows = cur.fetchall() 
-        
-        cur.close()
-        conn.close()
-        
-        colleges = []
-        for row in rows:
-            colleges.append({
-                "id": row["id"], 
-                "college_code": row["college_code"], 
-                "college_name": row["college_name"]
-            })
-        return colleges
-    
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(f"SELECT {COLLEGE_ROW.select_list} FROM college_table")
+            rows = cur.fetchall()
+            cur.close()
+
+        return COLLEGE_ROW.many(rows)
+
     @classmethod
     def get_by_code(cls, code):
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=DictCursor)
-        
-        cur.execute("SELECT id, college_code, college_name FROM college_table WHERE college_code = %s", (code,))
-        row = cur.fetchone()
-        
-        cur.close()
-        conn.close()
-
-        if row:
-            return {
-                "id": row["id"], 
-                "college_code": row["college_code"], 
-                "college_name": row["college_name"]
-            }
-        return None
-    
-    @classmethod
-    def get_by_name(cls, college_name):
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=DictCursor)
-
-        cur.execute(
-            """
-            SELECT id, college_code, college_name
-            FROM college_table
-            WHERE LOWER(TRIM(college_name)) = LOWER(TRIM(%s))
-            """,
-            (college_name,)
-        )
-        row = cur.fetchone()
-
-        cur.close()
-        conn.close()
-
-        if row:
-            return {
-                "id": row["id"],
-                "college_code": row["college_code"],
-                "college_name": row["college_name"]
-            }
-        return None
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(f"SELECT {COLLEGE_ROW.select_list} FROM college_table WHERE college_code = %s", (code,))
+            row = cur.fetchone()
+            cur.close()
+
+        return COLLEGE_ROW.one(row)
 
     @classmethod
     def add(cls, code, name):
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=DictCursor)
-        
-        try:
-            cur.execute(
-                "INSERT INTO college_table (college_code, college_name) VALUES (%s, %s) RETURNING id, college_code, college_name",
-                (code, name)
-            )
-            new_row = cur.fetchone()
-            conn.commit()
-            
-            return {
-                "id": new_row["id"], 
-                "college_code": new_row["college_code"], 
-                "college_name": new_row["college_name"]
-            }
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            cur.close()
-            conn.close()
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+
+            try:
+                cur.execute(
+                    f"INSERT INTO college_table (college_code, college_name) VALUES (%s, %s) RETURNING {COLLEGE_ROW.select_list}",
+                    (code, name)
+                )
+                new_row = cur.fetchone()
+                conn.commit()
+                bump('college_table')
+
+                return COLLEGE_ROW.one(new_row)
+            except psycopg2.IntegrityError as e:
+                conn.rollback()
+                raise constraint_error(e)
+            except Exception as e:
+                conn.rollback()
+                raise e
+            finally:
+                cur.close()
 
     @classmethod
-    def update(cls, original_code, new_code, new_name):
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=DictCursor)
-        try:
-            cur.execute(
-                """
-                UPDATE college_table 
-                SET college_code = %s, college_name = %s 
-                WHERE college_code = %s 
-                RETURNING id, college_code, college_name
-                """,
-                (new_code, new_name, original_code)
-            )
-            updated_row = cur.fetchone()
-            conn.commit()
-            
-            if updated_row:
-                return {
-                    "id": updated_row["id"], 
-                    "college_code": updated_row["college_code"], 
-                    "college_name": updated_row["college_name"]
-                }
-            return None
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            cur.close()
-            conn.close()
+    def update(cls, original_code, new_code=None, new_name=None):
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute(
+                    f"""
+                    UPDATE college_table
+                    SET college_code = COALESCE(%s, college_code),
+                        college_name = COALESCE(%s, college_name)
+                    WHERE college_code = %s
+                    RETURNING {COLLEGE_ROW.select_list}
+                    """,
+                    (new_code, new_name, original_code)
+                )
+                updated_row = cur.fetchone()
+                conn.commit()
+                bump('college_table', 'program_table')
+
+                return COLLEGE_ROW.one(updated_row)
+            except psycopg2.IntegrityError as e:
+                conn.rollback()
+                raise constraint_error(e)
+            except Exception as e:
+                conn.rollback()
+                raise e
+            finally:
+                cur.close()
 
     @classmethod
     def delete(cls, code):
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=DictCursor)
-        try:
-            cur.execute("DELETE FROM college_table WHERE college_code = %s RETURNING id", (code,))
-            deleted_row = cur.fetchone()
-            conn.commit()
-            return True if deleted_row else False
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            cur.close()
-            conn.close()
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute("DELETE FROM college_table WHERE college_code = %s RETURNING id", (code,))
+                deleted_row = cur.fetchone()
+                conn.commit()
+                bump('college_table')
+                return True if deleted_row else False
+            except psycopg2.IntegrityError as e:
+                conn.rollback()
+                raise constraint_error(e, cls.DELETE_ERRORS)
+            except Exception as e:
+                conn.rollback()
+                raise e
+            finally:
+                cur.close()
 
     @classmethod
     def get_count(cls):
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=DictCursor)
-        try:
-            cur.execute("SELECT COUNT(*) FROM college_table")
-            count_row = cur.fetchone()
-            return count_row['count'] 
-        except Exception as e:
-            return 0
-        finally:
-            cur.close()
-            conn.close()
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute("SELECT COUNT(*) FROM college_table")
+                count_row = cur.fetchone()
+                return count_row[0]
+            except Exception as e:
+                return 0
+            finally:
+                cur.close()
 
     @classmethod
-    def by_pagination(cls, page: int, limit: int, sort_by: str = None, sort_order: str = 'ASC', search: str = ''):
-        offset = (page - 1) * limit
+    def _build_filters(cls, search: str = ''):
+        conditions = []
+        params = []
+
+        if search:
+            search_term = f"%{search}%"
+            conditions.append("(college_code ILIKE %s OR college_name ILIKE %s)")
+            params.extend([search_term] * 2)
 
+        return conditions, params
+
+    @classmethod
+    def _normalize_sort(cls, sort_by, sort_order):
         allowed_columns = {'college_code', 'college_name', 'id'}
-        
+
         if not sort_by or sort_by not in allowed_columns:
-            sort_by = 'id' 
-        
-        if sort_order.upper() not in ['ASC', 'DESC']:
+            sort_by = 'id'
+
+        if (sort_order or '').upper() not in ['ASC', 'DESC']:
             sort_order = 'ASC'
         else:
             sort_order = sort_order.upper()
 
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=DictCursor)
-
-        try:
-            base_query = """
-                SELECT id, college_code, college_name
-                FROM college_table
-            """
-            count_query = "SELECT COUNT(*) AS total_count FROM college_table"
-            
-            params = []
-            
-            if search:
-                search_term = f"%{search}%"
-                where_clause = " WHERE (college_code ILIKE %s OR college_name ILIKE %s)"
-                
-                base_query += where_clause
-                count_query += where_clause
-                params.extend([search_term, search_term])
-
-            base_query += f" ORDER BY {sort_by} {sort_order} LIMIT %s OFFSET %s"
-            params.extend([limit, offset])
-
-            cur.execute(base_query, tuple(params))
-            rows = cur.fetchall()
-            
-            count_params = [search_term, search_term] if search else []
-            cur.execute(count_query, tuple(count_params))
-            
-            total_row = cur.fetchone()
-            total = total_row['total_count'] if total_row else 0
-            
-            colleges = []
-            for row in rows:
-                colleges.append({
-                    "id": row["id"], 
-                    "college_code": row["college_code"], 
-                    "college_name": row["college_name"]
-                })
-                
-            return {
-                    "data": colleges,
-                    "page": page,
-                    "limit": limit,
-                    "total": total
-                }
-
-        finally:
-            cur.close()
-            conn.close()
\ No newline at end of file
+        return sort_by, sort_order
+
+    @classmethod
+    def by_pagination(cls, page: int, limit: int, sort_by: str = None, sort_order: str = 'ASC', search: str = '', total_mode: str = 'exact', fields=None):
+        offset = (page - 1) * limit
+        mapper = COLLEGE_ROW.project(fields)
+        sort_by, sort_order = cls._normalize_sort(sort_by, sort_order)
+
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+
+            try:
+                conditions, params = cls._build_filters(search)
+                order_clause = "id " + sort_order if sort_by == 'id' else f"{sort_by} {sort_order}, id {sort_order}"
+
+                rows, total, total_type = offset_page(
+                    cur,
+                    "college_table",
+                    mapper.select_list,
+                    conditions, params, order_clause, limit, offset, total_mode
+                )
+
+                return {
+                        "data": mapper.many(rows),
+                        "page": page,
+                        "limit": limit,
+                        "total": total,
+                        "total_type": total_type
+                    }
+
+            finally:
+                cur.close()
+
+    @classmethod
+    def by_cursor(cls, limit: int, sort_by: str = None, sort_order: str = 'ASC', search: str = '', cursor: str = None):
+        sort_by, sort_order = cls._normalize_sort(sort_by, sort_order)
+        conditions, params = cls._build_filters(search)
+
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            try:
+                rows, next_cursor, prev_cursor = keyset_page(
+                    cur,
+                    f"SELECT {COLLEGE_ROW.select_list} FROM college_table",
+                    conditions, params, sort_by, sort_order, limit, cursor
+                )
+            finally:
+                cur.close()
+
+        return {
+            "data": COLLEGE_ROW.many(rows),
+            "limit": limit,
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor
+        }
+
@@ -0,0 +1,42 @@
+import psycopg2
+
+# Constraint (or unique index) name -> (HTTP status, message). Writes rely on
+# these constraints instead of looking rows up first, so the error a client
+# sees is decided by the statement that actually failed.
+CONSTRAINT_ERRORS = {
+    'college_table_college_code_key': (409, "College code already exists"),
+    'college_table_college_name_key': (409, "College name already exists"),
+    'college_table_college_name_ci_key': (409, "College name already exists"),
+    'program_table_program_code_key': (409, "Program code already exists"),
+    'program_table_program_name_key': (409, "Program name already exists"),
+    'program_table_program_name_ci_key': (409, "Program name already exists"),
+    'program_table_college_code_fkey': (400, "College code does not exist"),
+    'student_table_student_id_key': (409, "Student ID already exists"),
+    'student_table_program_code_fkey': (400, "Program code does not exist"),
+    'student_table_year_check': (400, "Year must be between 1 and 4"),
+    'student_table_gender_check': (400, "Gender must be Male, Female or Other"),
+}
+
+
+class ConstraintViolation(Exception):
+    def __init__(self, message, status=400, constraint=None):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+        self.constraint = constraint
+
+
+def constraint_error(e, overrides=None):
+    """
+    Maps a psycopg2 IntegrityError to a ConstraintViolation using the name of
+    the violated constraint. overrides replaces entries for one call site,
+    e.g. a foreign key seen from the referenced side on DELETE.
+    """
+    name = getattr(getattr(e, 'diag', None), 'constraint_name', None)
+    known = dict(CONSTRAINT_ERRORS, **(overrides or {}))
+    if name in known:
+        status, message = known[name]
+        return ConstraintViolation(message, status, name)
+    if isinstance(e, psycopg2.errors.NotNullViolation):
+        return ConstraintViolation(f"Missing required field '{e.diag.column_name}'", 400, name)
+    return ConstraintViolation("Request conflicts with existing data", 409, name)
@@ -0,0 +1,170 @@
+import base64
+import binascii
+import json
+
+import psycopg2
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def where_sql(conditions):
+    if not conditions:
+        return ""
+    return " WHERE " + " AND ".join(conditions)
+
+
+def encode_cursor(sort_by, sort_order, value, row_id, direction):
+    payload = {"s": sort_by, "o": sort_order, "v": value, "id": row_id, "d": direction}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token, sort_by, sort_order):
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError, binascii.Error):
+        raise InvalidCursor("Invalid cursor")
+
+    if not isinstance(payload, dict) or payload.get("d") not in ("next", "prev"):
+        raise InvalidCursor("Invalid cursor")
+
+    # Only shapes encode_cursor produces; anything else would reach the query as an unadaptable parameter.
+    row_id, value = payload.get("id"), payload.get("v")
+    if not isinstance(row_id, int) or isinstance(row_id, bool):
+        raise InvalidCursor("Invalid cursor")
+    if value is not None and (not isinstance(value, (str, int, float)) or isinstance(value, bool)):
+        raise InvalidCursor("Invalid cursor")
+
+    if payload.get("s") != sort_by or payload.get("o") != sort_order:
+        raise InvalidCursor("Cursor does not match the requested sort")
+
+    return payload
+
+
+def keyset_query(select_query, conditions, params, sort_by, sort_order, limit, cursor=None):
+    """The statement keyset_page runs, as (query, params, direction)."""
+    conditions = list(conditions)
+    params = list(params)
+    direction = "next"
+
+    if cursor:
+        boundary = decode_cursor(cursor, sort_by, sort_order)
+        direction = boundary["d"]
+        forward = (sort_order == 'ASC') == (direction == 'next')
+        op = '>' if forward else '<'
+
+        if sort_by == 'id':
+            conditions.append(f"id {op} %s")
+            params.append(boundary["id"])
+        else:
+            conditions.append(f"({sort_by}, id) {op} (%s, %s)")
+            params.extend([boundary["v"], boundary["id"]])
+
+    if direction == 'next':
+        scan_order = sort_order
+    else:
+        scan_order = 'DESC' if sort_order == 'ASC' else 'ASC'
+
+    order_clause = f"id {scan_order}" if sort_by == 'id' else f"{sort_by} {scan_order}, id {scan_order}"
+    query = f"{select_query}{where_sql(conditions)} ORDER BY {order_clause} LIMIT %s"
+    params.append(limit + 1)
+    return query, tuple(params), direction
+
+
+def keyset_page(cur, select_query, conditions, params, sort_by, sort_order, limit, cursor=None):
+    """
+    Runs a keyset-paginated query ordered by (sort_by, id).
+
+    The cursor is an opaque token produced by a previous call; it records the
+    boundary row and whether the client is paging forwards or backwards.
+    Returns (rows, next_cursor, prev_cursor).
+    """
+    query, query_params, direction = keyset_query(select_query, conditions, params, sort_by, sort_order, limit, cursor)
+    try:
+        cur.execute(query, query_params)
+    except (psycopg2.DataError, psycopg2.ProgrammingError):
+        # Without a cursor the statement is fixed, so this is a boundary value of the wrong type.
+        if not cursor:
+            raise
+        raise InvalidCursor("Invalid cursor")
+    rows = cur.fetchall()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if direction == 'prev':
+        rows.reverse()
+
+    has_next = has_more if direction == 'next' else bool(cursor)
+    has_prev = bool(cursor) if direction == 'next' else has_more
+
+    names = [column[0] for column in cur.description]
+    sort_index, id_index = names.index(sort_by), names.index("id")
+
+    next_cursor = None
+    prev_cursor = None
+    if rows and has_next:
+        next_cursor = encode_cursor(sort_by, sort_order, rows[-1][sort_index], rows[-1][id_index], "next")
+    if rows and has_prev:
+        prev_cursor = encode_cursor(sort_by, sort_order, rows[0][sort_index], rows[0][id_index], "prev")
+
+    return rows, next_cursor, prev_cursor
+
+
+# Below this many rows an exact count is cheap enough that an estimate is not worth returning.
+ESTIMATED_TOTAL_MIN_ROWS = 100000
+
+ESTIMATE_QUERY = "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass"
+
+
+def offset_query(table, columns, conditions, params, order_clause, limit, offset, total_mode='exact', order_params=()):
+    """The page statement offset_page runs, as (query, params, use_estimate)."""
+    use_estimate = total_mode == 'estimated' and not conditions
+    where_clause = where_sql(conditions)
+
+    if use_estimate:
+        total_column = f"({ESTIMATE_QUERY}) AS total_count"
+        query_params = [table] + list(params) + list(order_params) + [limit, offset]
+    else:
+        # Not COUNT(*) OVER (): PostgreSQL 16 costs that window as if LIMIT could stop it early and
+        # walks a whole sort index to feed it. A scalar subquery is planned (and run once) on its own.
+        total_column = f"(SELECT COUNT(*) FROM {table}{where_clause}) AS total_count"
+        query_params = list(params) + list(params) + list(order_params) + [limit, offset]
+
+    query = f"SELECT {columns}, {total_column} FROM {table}{where_clause} ORDER BY {order_clause} LIMIT %s OFFSET %s"
+    return query, tuple(query_params), use_estimate
+
+
+def offset_page(cur, table, columns, conditions, params, order_clause, limit, offset, total_mode='exact', order_params=()):
+    """
+    Runs an offset-paginated query and returns (rows, total, total_type).
+    Each row is the requested columns followed by total_count.
+
+    The total comes back on every row of the page (a COUNT(*) subquery for
+    an exact total, or the planner's pg_class.reltuples for an estimated one),
+    so a page and its total normally cost a single round-trip. Estimates are
+    only used for unfiltered queries on tables of at least
+    ESTIMATED_TOTAL_MIN_ROWS rows; anything else gets an exact count.
+    """
+    query, query_params, use_estimate = offset_query(
+        table, columns, conditions, params, order_clause, limit, offset, total_mode, order_params
+    )
+    cur.execute(query, query_params)
+    rows = cur.fetchall()
+
+    if use_estimate:
+        if rows:
+            estimate = rows[0][-1]
+        else:
+            cur.execute(ESTIMATE_QUERY, (table,))
+            estimate = cur.fetchone()[0]
+        if estimate is not None and estimate >= ESTIMATED_TOTAL_MIN_ROWS:
+            return rows, estimate, 'estimated'
+    elif rows:
+        return rows, rows[0][-1], 'exact'
+
+    # Either the page is past the end (no row to carry the COUNT(*) subquery's total) or the estimate was unusable.
+    cur.execute(f"SELECT COUNT(*) FROM {table}{where_sql(conditions)}", tuple(params))
+    return rows, cur.fetchone()[0], 'exact'
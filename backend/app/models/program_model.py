@@ -1,8 +1,16 @@
-#
+import psycopg2
 from app.db import get_db_connection
-from psycopg2.extras import DictCursor
+from app.models.pagination import keyset_page, offset_page
+from app.models.rows import PROGRAM_ROW
+from app.models.constraints import constraint_error
+from app.services.table_versions import bump
+from app.services.reference_data import ReferenceTable
 
 class ProgramModel:
+    DELETE_ERRORS = {
+        'student_table_program_code_fkey': (400, "Unable to delete program because there are students enrolled in it.")
+    }
+
     def __init__(self, id, program_code, program_name, college_code):
         self.id = id
         self.program_code = program_code
@@ -11,224 +19,205 @@ class ProgramModel:
 
     @classmethod
     def get_all(cls):
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=DictCursor)
-        
-        cur.execute("SELECT id, program_code, program_name, college_code FROM program_table")
-        rows = cur.fetchall()
-        
-        cur.close()
-        conn.close()
-        
-        programs = []
-        for row in rows:
-            programs.append({
-                "id": row["id"],
-                "program_code": row["program_code"],
-                "program_name": row["program_name"],
-                "college_code": row["college_code"]
-            })
-        return programs
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(f"SELECT {PROGRAM_ROW.select_list} FROM program_table")
+            rows = cur.fetchall()
+            cur.close()
+
+        return PROGRAM_ROW.many(rows)
 
     @classmethod
     def get_by_code(cls, code):
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=DictCursor)
-        
-        cur.execute("""
-            SELECT id, program_code, program_name, college_code 
-            FROM program_table 
-            WHERE program_code = %s
-        """, (code,))
-        
-        row = cur.fetchone()
-        cur.close()
-        conn.close()
-
-        if row:
-            return {
-                "id": row["id"],
-                "program_code": row["program_code"],
-                "program_name": row["program_name"],
-                "college_code": row["college_code"]
-            }
-        return None
-    
-    @classmethod
-    def get_by_name(cls, program_name):
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=DictCursor)
-        cur.execute("""
-            SELECT id, program_code, program_name, college_code 
-            FROM program_table 
-            WHERE LOWER(TRIM(program_name)) = LOWER(TRIM(%s))
-        """, (program_name,))
-        row = cur.fetchone()
-        cur.close()
-        conn.close()
-
-        if row:
-            return {
-                "id": row["id"],
-                "program_code": row["program_code"],
-                "program_name": row["program_name"],
-                "college_code": row["college_code"]
-            }
-        return None
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(f"""
+                SELECT {PROGRAM_ROW.select_list}
+                FROM program_table
+                WHERE program_code = %s
+            """, (code,))
+            row = cur.fetchone()
+            cur.close()
+
+        return PROGRAM_ROW.one(row)
 
     @classmethod
     def add(cls, code, name, college_code):
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=DictCursor)
-        try:
-            cur.execute(
-                """
-                INSERT INTO program_table (program_code, program_name, college_code) 
-                VALUES (%s, %s, %s) 
-                RETURNING id, program_code, program_name, college_code
-                """,
-                (code, name, college_code)
-            )
-            new_row = cur.fetchone()
-            conn.commit()
-            
-            return {
-                "id": new_row["id"],
-                "program_code": new_row["program_code"],
-                "program_name": new_row["program_name"],
-                "college_code": new_row["college_code"]
-            }
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            cur.close()
-            conn.close()
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute(
+                    f"""
+                    INSERT INTO program_table (program_code, program_name, college_code)
+                    VALUES (%s, %s, %s)
+                    RETURNING {PROGRAM_ROW.select_list}
+                    """,
+                    (code, name, college_code)
+                )
+                new_row = cur.fetchone()
+                conn.commit()
+                bump('program_table')
+
+                return PROGRAM_ROW.one(new_row)
+            except psycopg2.IntegrityError as e:
+                conn.rollback()
+                raise constraint_error(e)
+            except Exception as e:
+                conn.rollback()
+                raise e
+            finally:
+                cur.close()
 
     @classmethod
-    def update(cls, original_code, new_code, new_name, new_college_code):
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=DictCursor)
-        try:
-            cur.execute(
-                """
-                UPDATE program_table 
-                SET program_code = %s, program_name = %s, college_code = %s 
-                WHERE program_code = %s 
-                RETURNING id, program_code, program_name, college_code
-                """,
-                (new_code, new_name, new_college_code, original_code)
-            )
-            updated_row = cur.fetchone()
-            conn.commit()
-            
-            if updated_row:
-                return {
-                    "id": updated_row["id"],
-                    "program_code": updated_row["program_code"],
-                    "program_name": updated_row["program_name"],
-                    "college_code": updated_row["college_code"]
-                }
-            return None
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            cur.close()
-            conn.close()
+    def update(cls, original_code, new_code=None, new_name=None, new_college_code=None):
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute(
+                    f"""
+                    UPDATE program_table
+                    SET program_code = COALESCE(%s, program_code),
+                        program_name = COALESCE(%s, program_name),
+                        college_code = COALESCE(%s, college_code)
+                    WHERE program_code = %s
+                    RETURNING {PROGRAM_ROW.select_list}
+                    """,
+                    (new_code, new_name, new_college_code, original_code)
+                )
+                updated_row = cur.fetchone()
+                conn.commit()
+                bump('program_table')
+
+                return PROGRAM_ROW.one(updated_row)
+            except psycopg2.IntegrityError as e:
+                conn.rollback()
+                raise constraint_error(e)
+            except Exception as e:
+                conn.rollback()
+                raise e
+            finally:
+                cur.close()
 
     @classmethod
     def delete(cls, code):
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=DictCursor)
-        try:
-            cur.execute("DELETE FROM program_table WHERE program_code = %s RETURNING id", (code,))
-            deleted_id = cur.fetchone()
-            conn.commit()
-            return True if deleted_id else False
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            cur.close()
-            conn.close()
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute("DELETE FROM program_table WHERE program_code = %s RETURNING id", (code,))
+                deleted_id = cur.fetchone()
+                conn.commit()
+                bump('program_table')
+                return True if deleted_id else False
+            except psycopg2.IntegrityError as e:
+                conn.rollback()
+                raise constraint_error(e, cls.DELETE_ERRORS)
+            except Exception as e:
+                conn.rollback()
+                raise e
+            finally:
+                cur.close()
 
     @classmethod
     def get_count(cls):
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=DictCursor)
-        try:
-            cur.execute("SELECT COUNT(*) FROM program_table")
-            count = cur.fetchone()[0]
-            return count
-        except Exception as e:
-            return 0
-        finally:
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute("SELECT COUNT(*) FROM program_table")
+                count = cur.fetchone()[0]
+                return count
+            except Exception as e:
+                return 0
+            finally:
+                cur.close()
+
+    @classmethod
+    def get_codes(cls):
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT program_code FROM program_table")
+            codes = {row[0] for row in cur.fetchall()}
             cur.close()
-            conn.close()    
+        return codes
 
     @classmethod
-    def by_pagination(cls, page: int, limit: int, sort_by: str = None, sort_order: str = 'ASC', search: str = ''):
-        offset = (page - 1) * limit
+    def _build_filters(cls, search: str = ''):
+        conditions = []
+        params = []
+
+        if search:
+            search_term = f"%{search}%"
+            conditions.append("(program_code ILIKE %s OR program_name ILIKE %s OR college_code ILIKE %s)")
+            params.extend([search_term] * 3)
+
+        return conditions, params
 
+    @classmethod
+    def _normalize_sort(cls, sort_by, sort_order):
         allowed_columns = {'program_code', 'program_name', 'college_code', 'id'}
 
         if not sort_by or sort_by not in allowed_columns:
             sort_by = 'id'
 
-        if sort_order.upper() not in ['ASC', 'DESC']:
+        if (sort_order or '').upper() not in ['ASC', 'DESC']:
             sort_order = 'ASC'
         else:
             sort_order = sort_order.upper()
 
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=DictCursor)
+        return sort_by, sort_order
 
-        try:
-            base_query = """
-                SELECT id, program_code, program_name, college_code
-                FROM program_table
-            """
-            count_query = "SELECT COUNT(*) AS total_count FROM program_table"
+    @classmethod
+    def by_pagination(cls, page: int, limit: int, sort_by: str = None, sort_order: str = 'ASC', search: str = '', total_mode: str = 'exact', fields=None):
+        offset = (page - 1) * limit
+        mapper = PROGRAM_ROW.project(fields)
+        sort_by, sort_order = cls._normalize_sort(sort_by, sort_order)
 
-            params = []
+        with get_db_connection() as conn:
+            cur = conn.cursor()
 
-            if search:
-                search_term = f"%{search}%"
-                where_clause = " WHERE (program_code ILIKE %s OR program_name ILIKE %s OR college_code ILIKE %s)"
+            try:
+                conditions, params = cls._build_filters(search)
+                order_clause = "id " + sort_order if sort_by == 'id' else f"{sort_by} {sort_order}, id {sort_order}"
 
-                base_query += where_clause
-                count_query += where_clause
-                params.extend([search_term, search_term, search_term]) 
+                rows, total, total_type = offset_page(
+                    cur,
+                    "program_table",
+                    mapper.select_list,
+                    conditions, params, order_clause, limit, offset, total_mode
+                )
 
-            base_query += f" ORDER BY {sort_by} {sort_order} LIMIT %s OFFSET %s"
-            params.extend([limit, offset])
+                return {
+                        "data": mapper.many(rows),
+                        "page": page,
+                        "limit": limit,
+                        "total": total,
+                        "total_type": total_type
+                    }
 
-            cur.execute(base_query, tuple(params))
-            rows = cur.fetchall()
-            
-            count_params = [search_term, search_term, search_term] if search else []
-            cur.execute(count_query, tuple(count_params))
-            
-            total_row = cur.fetchone()
-            total = total_row['total_count'] if total_row else 0
-            
-            programs = []
-            for row in rows:
-                programs.append({
-                    "id": row["id"], 
-                    "program_code": row["program_code"], 
-                    "program_name": row["program_name"],
-                    "college_code" : row["college_code"]
-                })
-                
-            return {
-                    "data": programs,
-                    "page": page,
-                    "limit": limit,
-                    "total": total
-                }
-
-        finally:
-            cur.close()
-            conn.close()
\ No newline at end of file
+            finally:
+                cur.close()
+
+    @classmethod
+    def by_cursor(cls, limit: int, sort_by: str = None, sort_order: str = 'ASC', search: str = '', cursor: str = None):
+        sort_by, sort_order = cls._normalize_sort(sort_by, sort_order)
+        conditions, params = cls._build_filters(search)
+
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            try:
+                rows, next_cursor, prev_cursor = keyset_page(
+                    cur,
+                    f"SELECT {PROGRAM_ROW.select_list} FROM program_table",
+                    conditions, params, sort_by, sort_order, limit, cursor
+                )
+            finally:
+                cur.close()
+
+        return {
+            "data": PROGRAM_ROW.many(rows),
+            "limit": limit,
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor
+        }
+
+
+program_reference = ReferenceTable('program_table', ProgramModel.get_codes)
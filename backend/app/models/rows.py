@@ -0,0 +1,35 @@
+class RowMapper:
+    """
+    Maps plain cursor tuples to the dicts the API returns, so models select
+    one column list and never spell the keys out again. Rows only have to
+    start with the mapped columns; trailing extras such as offset_page's
+    total_count are ignored.
+    """
+    __slots__ = ("columns", "select_list")
+
+    def __init__(self, *columns):
+        self.columns = columns
+        self.select_list = ", ".join(columns)
+
+    def project(self, fields):
+        """
+        Mapper for just the requested columns, kept in table order. Unknown
+        names are ignored; no (valid) fields means every column.
+        """
+        if not fields:
+            return self
+        wanted = set(fields)
+        columns = tuple(column for column in self.columns if column in wanted)
+        return RowMapper(*columns) if columns else self
+
+    def one(self, row):
+        return dict(zip(self.columns, row)) if row is not None else None
+
+    def many(self, rows):
+        columns = self.columns
+        return [dict(zip(columns, row)) for row in rows]
+
+
+STUDENT_ROW = RowMapper("id", "student_id", "firstname", "lastname", "program_code", "year", "gender", "pfp_url", "pfp_urls")
+PROGRAM_ROW = RowMapper("id", "program_code", "program_name", "college_code")
+COLLEGE_ROW = RowMapper("id", "college_code", "college_name")
@@ -0,0 +1,88 @@
+import psycopg2
+from app.db import get_db_connection
+from psycopg2.extras import DictCursor
+
+# Trigger-maintained counters (migration 0008), and the equivalent live
+# aggregate used when that migration has not been applied yet.
+COUNTER_SOURCE = "SELECT program_code, year, gender, student_count, updated_at FROM student_stats WHERE student_count > 0"
+LIVE_SOURCE = "SELECT program_code, year, gender, COUNT(*) AS student_count, NOW() AS updated_at FROM student_table GROUP BY program_code, year, gender"
+
+DASHBOARD_QUERY = """
+    WITH counts AS ({source}),
+    by_program AS (
+        SELECT p.program_code, p.college_code, COALESCE(SUM(c.student_count), 0) AS n
+        FROM program_table p
+        LEFT JOIN counts c ON c.program_code = p.program_code
+        GROUP BY p.program_code, p.college_code
+    )
+    SELECT
+        (SELECT COALESCE(SUM(student_count), 0) FROM counts) AS total_students,
+        (SELECT COUNT(*) FROM college_table) AS total_colleges,
+        (SELECT COUNT(*) FROM program_table) AS total_programs,
+        (SELECT COALESCE(json_object_agg(program_code, n ORDER BY program_code), '{{}}') FROM by_program) AS by_program,
+        (SELECT COALESCE(json_object_agg(college_code, n ORDER BY college_code), '{{}}')
+            FROM (
+                SELECT col.college_code, COALESCE(SUM(bp.n), 0) AS n
+                FROM college_table col
+                LEFT JOIN by_program bp ON bp.college_code = col.college_code
+                GROUP BY col.college_code
+            ) colleges) AS by_college,
+        (SELECT COALESCE(json_object_agg(year, n ORDER BY year), '{{}}')
+            FROM (SELECT year, SUM(student_count) AS n FROM counts GROUP BY year) years) AS by_year,
+        (SELECT COALESCE(json_object_agg(gender, n ORDER BY gender), '{{}}')
+            FROM (SELECT gender, SUM(student_count) AS n FROM counts GROUP BY gender) genders) AS by_gender,
+        (SELECT MAX(updated_at) FROM counts) AS updated_at,
+        NOW() AS generated_at
+"""
+
+
+class StatsModel:
+    @classmethod
+    def get_dashboard(cls):
+        """
+        Totals plus students per program, college, year and gender in a
+        single query. Reads the student_stats counters when they exist and
+        falls back to aggregating student_table directly.
+        """
+        with get_db_connection() as conn:
+            cur = conn.cursor(cursor_factory=DictCursor)
+            try:
+                try:
+                    cur.execute(DASHBOARD_QUERY.format(source=COUNTER_SOURCE))
+                    source = "counters"
+                except psycopg2.errors.UndefinedTable:
+                    conn.rollback()
+                    cur.execute(DASHBOARD_QUERY.format(source=LIVE_SOURCE))
+                    source = "live"
+                row = cur.fetchone()
+            finally:
+                cur.close()
+
+        return {
+            "total_students": int(row["total_students"]),
+            "total_colleges": row["total_colleges"],
+            "total_programs": row["total_programs"],
+            "by_program": row["by_program"],
+            "by_college": row["by_college"],
+            "by_year": row["by_year"],
+            "by_gender": row["by_gender"],
+            "freshness": {
+                "source": source,
+                "updated_at": row["updated_at"].isoformat() if row["updated_at"] else None,
+                "generated_at": row["generated_at"].isoformat()
+            }
+        }
+
+    @classmethod
+    def rebuild(cls):
+        """Recomputes student_stats from student_table (repairs any drift)."""
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute("SELECT rebuild_student_stats()")
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                raise e
+            finally:
+                cur.close()
@@ -1,5 +1,21 @@
+import psycopg2
+from os import getenv
 from app.db import get_db_connection
-from psycopg2.extras import DictCursor
+from psycopg2.extras import Json
+from app.models.pagination import keyset_page, offset_page, where_sql
+from app.models.rows import STUDENT_ROW
+from app.models.constraints import constraint_error
+from app.models.student_search import build_student_search
+
+BULK_MAX_IDS = int(getenv('BULK_MAX_IDS', '10000'))
+# Counts are always complete; only the per-row list is capped.
+BULK_MAX_OUTCOMES = int(getenv('BULK_MAX_OUTCOMES', '10000'))
+BULK_FIELDS = ('firstname', 'lastname', 'program_code', 'year', 'gender')
+
+
+class InvalidBulkRequest(ValueError):
+    pass
+
 
 class StudentModel:
     def __init__(self, id, student_id, firstname, lastname, program_code, year, gender, pfp_url):
@@ -14,252 +30,397 @@ class StudentModel:
 
     @classmethod
     def get_all(cls):
-        conn = get_db_connection()
-        cur = conn.cursor()
-        cur.execute("""
-            SELECT id, student_id, firstname, lastname, program_code, year, gender, pfp_url
-            FROM student_table
-        """)
-        rows = cur.fetchall()
-        cur.close()
-        conn.close()
-        
-        students = []
-        for row in rows:
-            students.append({
-                "id": row["id"],
-                "student_id": row["student_id"],
-                "firstname": row["firstname"],
-                "lastname": row["lastname"],
-                "program_code": row["program_code"],
-                "year": row["year"],
-                "gender": row["gender"],
-                "pfp_url": row["pfp_url"]
-            })
-        return students
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(f"SELECT {STUDENT_ROW.select_list} FROM student_table")
+            rows = cur.fetchall()
+            cur.close()
+
+        return STUDENT_ROW.many(rows)
 
     @classmethod
     def get_by_id(cls, student_id):
-        conn = get_db_connection()
-        cur = conn.cursor()
-        cur.execute("""
-            SELECT id, student_id, firstname, lastname, program_code, year, gender, pfp_url 
-            FROM student_table 
-            WHERE student_id = %s
-        """, (student_id,))
-        row = cur.fetchone()
-        cur.close()
-        conn.close()
-
-        if row:
-            return {
-               "id": row[0],
-                    "student_id": row[1],
-                    "firstname": row[2],
-                    "lastname": row[3],
-                    "program_code": row[4],
-                    "year": row[5],
-                    "gender": row[6],
-                    "pfp_url": row[7]
-            }
-        return None
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(f"SELECT {STUDENT_ROW.select_list} FROM student_table WHERE student_id = %s", (student_id,))
+            row = cur.fetchone()
+            cur.close()
+
+        return STUDENT_ROW.one(row)
 
     @classmethod
     def add(cls, student_id, firstname, lastname, program_code, year, gender, pfp_url=None):
-        conn = get_db_connection()
-        cur = conn.cursor()
-        
-        try:
-            cur.execute("""
-                INSERT INTO student_table 
-                (student_id, firstname, lastname, program_code, year, gender, pfp_url)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                RETURNING id, student_id, firstname, lastname, program_code, year, gender, pfp_url
-            """, (student_id, firstname, lastname, program_code, year, gender, pfp_url))
-            
-            row = cur.fetchone()
-            conn.commit()
-            
-            return {
-                "id": row[0],
-                "student_id": row[1],
-                "firstname": row[2],
-                "lastname": row[3],
-                "program_code": row[4],
-                "year": row[5],
-                "gender": row[6],
-                "pfp_url": row[7]
-            }
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            cur.close()
-            conn.close()
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+
+            try:
+                cur.execute(f"""
+                    INSERT INTO student_table
+                    (student_id, firstname, lastname, program_code, year, gender, pfp_url)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    RETURNING {STUDENT_ROW.select_list}
+                """, (student_id, firstname, lastname, program_code, year, gender, pfp_url))
+
+                row = cur.fetchone()
+                conn.commit()
+
+                return STUDENT_ROW.one(row)
+            except psycopg2.IntegrityError as e:
+                conn.rollback()
+                raise constraint_error(e)
+            except Exception as e:
+                conn.rollback()
+                raise e
+            finally:
+                cur.close()
 
     @classmethod
-    def update(cls, original_student_id, new_student_id, firstname, lastname, program_code, year, gender, pfp_url):
-        conn = get_db_connection()
-        cur = conn.cursor()
-        
-        try:
-            cur.execute("""
-                UPDATE student_table 
-                SET student_id = %s,
-                    firstname = %s,
-                    lastname = %s,
-                    program_code = %s,
-                    year = %s,
-                    gender = %s,
-                    pfp_url = %s
-                WHERE student_id = %s
-                RETURNING id, student_id, firstname, lastname, program_code, year, gender, pfp_url
-            """, (new_student_id, firstname, lastname, program_code, year, gender, pfp_url, original_student_id))
-            
-            row = cur.fetchone()
-            conn.commit()
-            
-            if row:
-                return {
-                    "id": row[0],
-                    "student_id": row[1],
-                    "firstname": row[2],
-                    "lastname": row[3],
-                    "program_code": row[4],
-                    "year": row[5],
-                    "gender": row[6],
-                    "pfp_url": row[7]
-                }
-            return None
-            
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            cur.close()
-            conn.close()
+    def update(cls, original_student_id, new_student_id=None, firstname=None, lastname=None, program_code=None, year=None, gender=None, pfp_url=None):
+        """Single-statement update; fields passed as None keep their current value."""
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+
+            try:
+                cur.execute(f"""
+                    UPDATE student_table
+                    SET student_id = COALESCE(%s, student_id),
+                        firstname = COALESCE(%s, firstname),
+                        lastname = COALESCE(%s, lastname),
+                        program_code = COALESCE(%s, program_code),
+                        year = COALESCE(%s, year),
+                        gender = COALESCE(%s, gender),
+                        pfp_url = COALESCE(%s, pfp_url)
+                    WHERE student_id = %s
+                    RETURNING {STUDENT_ROW.select_list}
+                """, (new_student_id, firstname, lastname, program_code, year, gender, pfp_url, original_student_id))
+
+                row = cur.fetchone()
+                conn.commit()
+
+                return STUDENT_ROW.one(row)
+
+            except psycopg2.IntegrityError as e:
+                conn.rollback()
+                raise constraint_error(e)
+            except Exception as e:
+                conn.rollback()
+                raise e
+            finally:
+                cur.close()
+
+    @classmethod
+    def update_avatar(cls, id, pfp_url, pfp_urls=None):
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute(
+                    "UPDATE student_table SET pfp_url = %s, pfp_urls = %s WHERE id = %s RETURNING id",
+                    (pfp_url, Json(pfp_urls) if pfp_urls else None, id)
+                )
+                updated = cur.fetchone()
+                conn.commit()
+                return True if updated else False
+            except Exception as e:
+                conn.rollback()
+                raise e
+            finally:
+                cur.close()
 
     @classmethod
     def delete(cls, student_id):
-        conn = get_db_connection()
-        cur = conn.cursor()
-        try:
-            cur.execute("DELETE FROM student_table WHERE student_id = %s RETURNING id", (student_id,))
-            deleted_id = cur.fetchone()
-            conn.commit()
-            return True if deleted_id else False
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            cur.close()
-            conn.close()
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute("DELETE FROM student_table WHERE student_id = %s RETURNING id", (student_id,))
+                deleted_id = cur.fetchone()
+                conn.commit()
+                return True if deleted_id else False
+            except Exception as e:
+                conn.rollback()
+                raise e
+            finally:
+                cur.close()
+
+    @classmethod
+    def _selection_sql(cls, selection):
+        """
+        Query for the students a bulk operation applies to, as rows of
+        (student_id, id, position). selection is either {"ids": [...]},
+        reported in the given order with id NULL for unknown IDs, or
+        {"search": ..., "filters": {...}} as by_pagination takes them.
+        """
+        if selection.get('ids') is not None:
+            ids = list(dict.fromkeys(str(student_id) for student_id in selection['ids']))
+            if not ids:
+                raise InvalidBulkRequest("ids must not be empty")
+            if len(ids) > BULK_MAX_IDS:
+                raise InvalidBulkRequest(f"At most {BULK_MAX_IDS} ids per request")
+            return """
+                SELECT listed.student_id, s.id, listed.position
+                FROM unnest(%s::varchar[]) WITH ORDINALITY AS listed(student_id, position)
+                LEFT JOIN student_table s ON s.student_id = listed.student_id
+            """, [ids]
+
+        conditions, params = cls._build_filters(selection.get('search', ''), selection.get('filters'))
+        if not conditions:
+            # Guard against an empty filter set silently meaning "every student".
+            raise InvalidBulkRequest("Select students by ids, search or at least one filter")
+        return f"SELECT student_id, id, 0 AS position FROM student_table{where_sql(conditions)}", params
+
+    @classmethod
+    def _bulk(cls, selection, change_sql, change_params, done, skipped_reason=None):
+        """
+        Runs change_sql (an UPDATE or DELETE aliasing student_table as s and
+        joining the matched CTE) as one statement, and reports what happened
+        to every selected student: done, 'skipped' (matched but left alone by
+        change_sql's own condition) or 'not_found'.
+        """
+        matched_sql, matched_params = cls._selection_sql(selection)
+
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute(f"""
+                    WITH matched AS ({matched_sql}),
+                    changed AS ({change_sql} RETURNING s.id)
+                    SELECT m.student_id,
+                           CASE WHEN m.id IS NULL THEN 'not_found'
+                                WHEN c.id IS NULL THEN 'skipped'
+                                ELSE %s END
+                    FROM matched m
+                    LEFT JOIN changed c ON c.id = m.id
+                    ORDER BY m.position, m.student_id
+                """, matched_params + change_params + [done])
+                rows = cur.fetchall()
+                conn.commit()
+            except psycopg2.IntegrityError as e:
+                conn.rollback()
+                raise constraint_error(e)
+            except Exception as e:
+                conn.rollback()
+                raise e
+            finally:
+                cur.close()
+
+        report = {"matched": 0, done: 0, "skipped": 0, "not_found": 0, "rows": []}
+        for student_id, outcome in rows:
+            report[outcome] += 1
+            if len(report["rows"]) < BULK_MAX_OUTCOMES:
+                row = {"student_id": student_id, "outcome": outcome}
+                if outcome == 'skipped' and skipped_reason:
+                    row["reason"] = skipped_reason
+                report["rows"].append(row)
+        report["matched"] = len(rows) - report["not_found"]
+        if len(rows) > BULK_MAX_OUTCOMES:
+            report["rows_truncated"] = True
+        return report
+
+    @classmethod
+    def bulk_update(cls, selection, changes):
+        """Sets the same values (any of BULK_FIELDS) on every selected student."""
+        changes = {field: changes[field] for field in BULK_FIELDS if changes.get(field) is not None}
+        if not changes:
+            raise InvalidBulkRequest(f"Nothing to change; set one of {', '.join(BULK_FIELDS)}")
+
+        assignments = ", ".join(f"{field} = %s" for field in changes)
+        return cls._bulk(
+            selection,
+            f"UPDATE student_table s SET {assignments} FROM matched m WHERE s.id = m.id",
+            list(changes.values()),
+            'updated'
+        )
+
+    @classmethod
+    def promote(cls, selection, by=1):
+        """Moves the selected students by years (negative to hold back); anyone who would leave 1-4 is skipped."""
+        return cls._bulk(
+            selection,
+            "UPDATE student_table s SET year = s.year + %s FROM matched m WHERE s.id = m.id AND s.year + %s BETWEEN 1 AND 4",
+            [by, by],
+            'updated',
+            "Year would leave 1-4"
+        )
+
+    @classmethod
+    def move_program(cls, selection, program_code):
+        """Moves the selected students to program_code; students already in it are skipped."""
+        return cls._bulk(
+            selection,
+            "UPDATE student_table s SET program_code = %s FROM matched m WHERE s.id = m.id AND s.program_code IS DISTINCT FROM %s",
+            [program_code, program_code],
+            'updated',
+            "Already in this program"
+        )
+
+    @classmethod
+    def bulk_delete(cls, selection):
+        return cls._bulk(
+            selection,
+            "DELETE FROM student_table s USING matched m WHERE s.id = m.id",
+            [],
+            'deleted'
+        )
 
     @classmethod
     def get_count(cls):
-        conn = get_db_connection()
-        cur = conn.cursor()
-        try:
-            cur.execute("SELECT COUNT(*) FROM student_table")
-            count = cur.fetchone()[0]
-            return count
-        except Exception as e:
-            return 0
-        finally:
-            cur.close()
-            conn.close()
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute("SELECT COUNT(*) FROM student_table")
+                count = cur.fetchone()[0]
+                return count
+            except Exception as e:
+                return 0
+            finally:
+                cur.close()
 
     @classmethod
-    def by_pagination(cls, page: int, limit: int, sort_by: str = None, sort_order: str = 'ASC', search: str = '', filters: dict = None):
-        offset = (page - 1) * limit
+    def _build_filters(cls, search: str = '', filters: dict = None):
+        conditions = []
+        params = []
+
+        if search and search.strip():
+            search_clause, search_params, _, _ = build_student_search(search)
+            conditions.append(search_clause)
+            params.extend(search_params)
+
+        if filters:
+            if filters.get('program'):
+                conditions.append("program_code = ANY(%s)")
+                params.append(filters['program'])
 
+            if filters.get('year'):
+                conditions.append("year = ANY(%s)")
+                params.append(filters['year'])
+
+            if filters.get('gender'):
+                conditions.append("gender = ANY(%s)")
+                params.append(filters['gender'])
+
+        return conditions, params
+
+    @classmethod
+    def _normalize_sort(cls, sort_by, sort_order):
         allowed_columns = {'student_id', 'firstname', 'lastname', 'program_code', 'year', 'gender'}
         if not sort_by or sort_by not in allowed_columns:
             sort_by = 'student_id'
-        
-        sort_order = 'DESC' if sort_order.upper() == 'DESC' else 'ASC'
-
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=DictCursor)
-
-        try:
-            base_query = """
-                SELECT id, student_id, firstname, lastname, program_code, year, gender, pfp_url
-                FROM student_table
-                WHERE 1=1
-            """
-            count_query = "SELECT COUNT(*) AS total_count FROM student_table WHERE 1=1"
-
-            params = []
-
-            if search:
-                search_term = f"%{search}%"
-                
-                search_clause = """
-                    AND (student_id ILIKE %s 
-                        OR firstname ILIKE %s 
-                        OR lastname ILIKE %s 
-                        OR gender ILIKE %s 
-                        OR year::text ILIKE %s
-                        OR program_code ILIKE %s) 
-                """
-                base_query += search_clause
-                count_query += search_clause
-                params.extend([search_term] * 6)
-
-            if filters:
-                if filters.get('program'):
-                    base_query += " AND program_code = ANY(%s)"
-                    count_query += " AND program_code = ANY(%s)"
-                    params.append(filters['program'])
-
-                if filters.get('year'):
-                    base_query += " AND year = ANY(%s)"
-                    count_query += " AND year = ANY(%s)"
-                    params.append(filters['year'])
-
-                if filters.get('gender'):
-                    base_query += " AND gender = ANY(%s)"
-                    count_query += " AND gender = ANY(%s)"
-                    params.append(filters['gender'])
-
-            base_query += f" ORDER BY {sort_by} {sort_order} LIMIT %s OFFSET %s"
-
-            count_params = list(params) 
-            
-            params.extend([limit, offset])
-
-            cur.execute(base_query, tuple(params))
-            rows = cur.fetchall()
-            
-            cur.execute(count_query, tuple(count_params))
-            total_row = cur.fetchone()
-            total = total_row['total_count'] if total_row else 0
-
-            students = []
-            for row in rows:
-                students.append({
-                    "id": row["id"],
-                    "student_id": row["student_id"],
-                    "firstname": row["firstname"],
-                    "lastname": row["lastname"],
-                    "program_code": row["program_code"],
-                    "year": row["year"],
-                    "gender": row["gender"],
-                    "pfp_url": row["pfp_url"] 
-                }) 
-
-            return {
-                "data": students,
-                "page": page,
-                "limit": limit,
-                "total": total
-            }
-        
-        except Exception as e:
-            print(f"Pagination Error: {e}")
-            return {"data": [], "page": page, "limit": limit, "total": 0} 
-
-        finally:
-            cur.close()
-            conn.close()
\ No newline at end of file
+
+        sort_order = 'DESC' if (sort_order or '').upper() == 'DESC' else 'ASC'
+        return sort_by, sort_order
+
+    @classmethod
+    def _order_clause(cls, sort_by, sort_order, search):
+        rank_by_relevance = sort_by == 'relevance' and search and search.strip()
+        sort_by, sort_order = cls._normalize_sort(sort_by, sort_order)
+
+        order_clause = f"{sort_by} {sort_order}, id {sort_order}"
+        order_params = []
+        if rank_by_relevance:
+            _, _, rank_sql, order_params = build_student_search(search)
+            order_clause = f"{rank_sql}, {order_clause}"
+        return order_clause, order_params
+
+    @classmethod
+    def _pagination_args(cls, page, limit, sort_by=None, sort_order='ASC', search='', filters=None, total_mode='exact', fields=None):
+        """offset_page's arguments for a page of the list; migrations/migrate.py check EXPLAINs the same statement."""
+        mapper = STUDENT_ROW.project(fields)
+        order_clause, order_params = cls._order_clause(sort_by, sort_order, search)
+        conditions, params = cls._build_filters(search, filters)
+        return mapper, (
+            "student_table", mapper.select_list, conditions, params, order_clause,
+            limit, (page - 1) * limit, total_mode, order_params
+        )
+
+    @classmethod
+    def _cursor_args(cls, limit, sort_by=None, sort_order='ASC', search='', filters=None, cursor=None):
+        """keyset_page's arguments, like _pagination_args."""
+        sort_by, sort_order = cls._normalize_sort(sort_by, sort_order)
+        conditions, params = cls._build_filters(search, filters)
+        return (
+            f"SELECT {STUDENT_ROW.select_list} FROM student_table",
+            conditions, params, sort_by, sort_order, limit, cursor
+        )
+
+    @classmethod
+    def by_pagination(cls, page: int, limit: int, sort_by: str = None, sort_order: str = 'ASC', search: str = '', filters: dict = None, total_mode: str = 'exact', fields=None):
+        mapper, args = cls._pagination_args(page, limit, sort_by, sort_order, search, filters, total_mode, fields)
+
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+
+            try:
+                rows, total, total_type = offset_page(cur, *args)
+
+                return {
+                    "data": mapper.many(rows),
+                    "page": page,
+                    "limit": limit,
+                    "total": total,
+                    "total_type": total_type
+                }
+
+            except Exception as e:
+                print(f"Pagination Error: {e}")
+                return {"data": [], "page": page, "limit": limit, "total": 0, "total_type": "exact"}
+
+            finally:
+                cur.close()
+
+    @classmethod
+    def by_cursor(cls, limit: int, sort_by: str = None, sort_order: str = 'ASC', search: str = '', filters: dict = None, cursor: str = None):
+        args = cls._cursor_args(limit, sort_by, sort_order, search, filters, cursor)
+
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            try:
+                rows, next_cursor, prev_cursor = keyset_page(cur, *args)
+            finally:
+                cur.close()
+
+        return {
+            "data": STUDENT_ROW.many(rows),
+            "limit": limit,
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor
+        }
+
+    # Everything the API returns for a student, avatar variant URLs (pfp_urls) included.
+    EXPORT_COLUMNS = STUDENT_ROW.columns
+
+    @classmethod
+    def stream(cls, sort_by: str = None, sort_order: str = 'ASC', search: str = '', filters: dict = None, itersize: int = 2000, columns=EXPORT_COLUMNS):
+        """
+        Returns a generator of every matching student as a tuple of columns,
+        read through a named (server-side) cursor so only itersize rows are
+        held in memory at a time.
+
+        The connection is taken, the query run and the first batch fetched
+        before this returns, so database errors are raised here, while the
+        caller can still answer with an error status, instead of halfway
+        through a streamed response. The pooled connection stays checked
+        out until the generator is exhausted or closed.
+        """
+        rows = cls._stream_rows(sort_by, sort_order, search, filters, itersize, columns)
+        next(rows)
+        return rows
+
+    @classmethod
+    def _stream_rows(cls, sort_by, sort_order, search, filters, itersize, columns):
+        conditions, params = cls._build_filters(search, filters)
+        order_clause, order_params = cls._order_clause(sort_by, sort_order, search)
+
+        with get_db_connection() as conn:
+            cur = conn.cursor(name="student_export")
+            try:
+                cur.execute(
+                    f"SELECT {', '.join(columns)} FROM student_table{where_sql(conditions)} ORDER BY {order_clause}",
+                    params + list(order_params)
+                )
+                batch = cur.fetchmany(itersize)
+                # Primed: stream() stops here before handing the generator out.
+                yield None
+                while batch:
+                    yield from batch
+                    batch = cur.fetchmany(itersize)
+            finally:
+                cur.close()
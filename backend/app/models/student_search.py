@@ -0,0 +1,71 @@
+import re
+
+GENDERS = ('Male', 'Female', 'Other')
+YEARS = (1, 2, 3, 4)
+
+STUDENT_ID_PREFIX = re.compile(r'^\d{4}-\d*$')
+
+
+def _escape_like(term):
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def build_student_search(search):
+    """
+    Rewrites a free-text search term into index-friendly predicates.
+
+    Returns (condition, params, rank_sql, rank_params). The condition keeps the
+    meaning of the old six-way ILIKE, but:
+
+    * a term shaped like a student ID ("2024-" / "2024-00") becomes a prefix
+      match served by the varchar_pattern_ops index;
+    * name, ID and program substrings use ILIKE, served by the pg_trgm GIN
+      indexes from migrations/0002_student_search_indexes.up.sql;
+    * year and gender are resolved in Python against their CHECK-constrained
+      values and become exact matches instead of casts and ILIKEs.
+
+    rank_sql orders exact and prefix hits ahead of plain substring hits.
+    """
+    term = search.strip()
+    escaped = _escape_like(term)
+    contains = f"%{escaped}%"
+    prefix = f"{escaped}%"
+
+    predicates = []
+    params = []
+
+    if STUDENT_ID_PREFIX.match(term):
+        predicates.append("student_id LIKE %s")
+        params.append(prefix)
+    else:
+        predicates.append("student_id ILIKE %s")
+        params.append(contains)
+        predicates.append("firstname ILIKE %s")
+        params.append(contains)
+        predicates.append("lastname ILIKE %s")
+        params.append(contains)
+        predicates.append("program_code ILIKE %s")
+        params.append(contains)
+
+    years = [y for y in YEARS if term and term in str(y)]
+    if years:
+        predicates.append("year = ANY(%s)")
+        params.append(years)
+
+    genders = [g for g in GENDERS if term.lower() in g.lower()]
+    if genders:
+        predicates.append("gender = ANY(%s)")
+        params.append(genders)
+
+    condition = "(" + " OR ".join(predicates) + ")"
+
+    rank_sql = """CASE
+            WHEN student_id = %s THEN 0
+            WHEN student_id LIKE %s THEN 1
+            WHEN LOWER(lastname) = LOWER(%s) OR LOWER(firstname) = LOWER(%s) THEN 2
+            WHEN lastname ILIKE %s OR firstname ILIKE %s THEN 3
+            ELSE 4
+        END"""
+    rank_params = [term, prefix, term, term, prefix, prefix]
+
+    return condition, params, rank_sql, rank_params
@@ -0,0 +1,145 @@
+import psycopg2
+from app.db import get_db_connection
+from psycopg2.extras import DictCursor
+
+class UploadJobModel:
+    def __init__(self, id, target_type, target_id, status, attempts, url, error):
+        self.id = id
+        self.target_type = target_type
+        self.target_id = target_id
+        self.status = status
+        self.attempts = attempts
+        self.url = url
+        self.error = error
+
+    @classmethod
+    def create(cls, target_type, target_id, payload=None, filename=None, content_type=None):
+        """Records a pending job; payload (the uploaded bytes) is kept until the job finishes."""
+        with get_db_connection() as conn:
+            cur = conn.cursor(cursor_factory=DictCursor)
+            try:
+                cur.execute("""
+                    INSERT INTO upload_job_table (target_type, target_id, payload, filename, content_type)
+                    VALUES (%s, %s, %s, %s, %s)
+                    RETURNING id
+                """, (target_type, target_id, psycopg2.Binary(payload) if payload is not None else None,
+                      filename, content_type))
+                job_id = cur.fetchone()['id']
+                conn.commit()
+                return job_id
+            except Exception as e:
+                conn.rollback()
+                raise e
+            finally:
+                cur.close()
+
+    @classmethod
+    def get_by_id(cls, job_id):
+        with get_db_connection() as conn:
+            cur = conn.cursor(cursor_factory=DictCursor)
+            cur.execute("""
+                SELECT id, target_type, target_id, status, attempts, url, error, created_at, updated_at
+                FROM upload_job_table
+                WHERE id = %s
+            """, (job_id,))
+            row = cur.fetchone()
+            cur.close()
+
+        if row:
+            return {
+                "id": row["id"],
+                "target_type": row["target_type"],
+                "target_id": row["target_id"],
+                "status": row["status"],
+                "attempts": row["attempts"],
+                "url": row["url"],
+                "error": row["error"],
+                "created_at": row["created_at"].isoformat(),
+                "updated_at": row["updated_at"].isoformat()
+            }
+        return None
+
+    @classmethod
+    def get_pending(cls, target_type, target_id):
+        """The newest unfinished job for a record, so reads can show that a new avatar is on its way."""
+        with get_db_connection() as conn:
+            cur = conn.cursor(cursor_factory=DictCursor)
+            cur.execute("""
+                SELECT id, status
+                FROM upload_job_table
+                WHERE target_type = %s AND target_id = %s AND status IN ('pending', 'processing')
+                ORDER BY id DESC
+                LIMIT 1
+            """, (target_type, target_id))
+            row = cur.fetchone()
+            cur.close()
+
+        if row:
+            return {"job_id": row["id"], "status": row["status"]}
+        return None
+
+    @classmethod
+    def update_status(cls, job_id, status, attempts=None, url=None, error=None):
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute("""
+                    UPDATE upload_job_table
+                    SET status = %s,
+                        attempts = COALESCE(%s, attempts),
+                        url = COALESCE(%s, url),
+                        error = %s,
+                        payload = CASE WHEN %s IN ('done', 'failed') THEN NULL ELSE payload END,
+                        updated_at = NOW()
+                    WHERE id = %s
+                """, (status, attempts, url, error, status, job_id))
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                raise e
+            finally:
+                cur.close()
+
+    @classmethod
+    def claim_stale(cls, older_than, limit=100):
+        """
+        Claims unfinished jobs not touched for older_than seconds (their
+        process died) by marking them pending again, and returns them with
+        their payload. SKIP LOCKED keeps two workers from claiming one job.
+        """
+        with get_db_connection() as conn:
+            cur = conn.cursor(cursor_factory=DictCursor)
+            try:
+                cur.execute("""
+                    UPDATE upload_job_table
+                    SET status = 'pending', updated_at = NOW()
+                    WHERE id IN (
+                        SELECT id FROM upload_job_table
+                        WHERE status IN ('pending', 'processing')
+                          AND updated_at < NOW() - make_interval(secs => %s)
+                        ORDER BY updated_at
+                        LIMIT %s
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    RETURNING id, target_type, target_id, attempts, payload, filename, content_type
+                """, (older_than, limit))
+                rows = cur.fetchall()
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                raise e
+            finally:
+                cur.close()
+
+        return [
+            {
+                "id": row["id"],
+                "target_type": row["target_type"],
+                "target_id": row["target_id"],
+                "attempts": row["attempts"],
+                "payload": bytes(row["payload"]) if row["payload"] is not None else None,
+                "filename": row["filename"],
+                "content_type": row["content_type"],
+            }
+            for row in rows
+        ]
@@ -1,135 +1,203 @@
 from app.db import get_db_connection
-from psycopg2.extras import DictCursor
+from psycopg2.extras import DictCursor, Json
 import psycopg2.errors
-from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import UserMixin
+from app.services.cache import create_cache
+from app.services.password_hashing import password_hasher
+from os import getenv
+
+user_cache = create_cache(
+    'users',
+    maxsize=int(getenv('USER_CACHE_SIZE', '1024')),
+    ttl=float(getenv('USER_CACHE_TTL', '60'))
+)
+
+# Everything but user_password: users are loaded without their hash; only get_credentials reads it.
+USER_COLUMNS = "id, username, email, pfp_url, pfp_urls"
 
 class Users(UserMixin):
-    def __init__(self, id, username, email, user_password):
+    def __init__(self, id, username, email, pfp_url=None, pfp_urls=None):
         self.id = str(id)
         self.username = username
         self.email = email
-        self.user_password = user_password
+        self.pfp_url = pfp_url
+        self.pfp_urls = pfp_urls
 
     @classmethod
     def create_user(cls, username, email, password):
-        hashed_pass = generate_password_hash(password)
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=DictCursor)
-        try:
-            cur.execute("""
-                INSERT INTO user_table (username, email, user_password)
-                VALUES (%s, %s, %s) RETURNING id
-            """, (username, email, hashed_pass))
-            new_id = cur.fetchone()['id']
-            conn.commit()
-            return {"success": True, "id": new_id}
-        except psycopg2.errors.UniqueViolation as e:
-            conn.rollback()
-            error_msg = str(e)
-            if 'username' in error_msg:
-                return {"success": False, "error": "Username already taken"}
-            elif 'email' in error_msg:
-                return {"success": False, "error": "Email already in use"}
-            return {"success": False, "error": "Registration failed"}
-        except Exception as e: 
-            print(f"Error creating user: {e}") 
-            conn.rollback()
-            return {"success": False, "error": "An error occurred"}
-        finally:
-            cur.close()
-            conn.close()
+        hashed_pass = password_hasher.hash(password)
+        with get_db_connection() as conn:
+            cur = conn.cursor(cursor_factory=DictCursor)
+            try:
+                cur.execute("""
+                    INSERT INTO user_table (username, email, user_password)
+                    VALUES (%s, %s, %s) RETURNING id
+                """, (username, email, hashed_pass))
+                new_id = cur.fetchone()['id']
+                conn.commit()
+                return {"success": True, "id": new_id}
+            except psycopg2.errors.UniqueViolation as e:
+                conn.rollback()
+                error_msg = str(e)
+                if 'username' in error_msg:
+                    return {"success": False, "error": "Username already taken"}
+                elif 'email' in error_msg:
+                    return {"success": False, "error": "Email already in use"}
+                return {"success": False, "error": "Registration failed"}
+            except Exception as e:
+                print(f"Error creating user: {e}")
+                conn.rollback()
+                return {"success": False, "error": "An error occurred"}
+            finally:
+                cur.close()
 
     @classmethod
     def get_all(cls):
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=DictCursor)
-        try:
-            cur.execute("SELECT id, username, email FROM user_table")
-            rows = cur.fetchall()
-            users = [dict(row) for row in rows]
-            return users
-        finally:
-            cur.close()
-            conn.close()
+        with get_db_connection() as conn:
+            cur = conn.cursor(cursor_factory=DictCursor)
+            try:
+                cur.execute("SELECT id, username, email FROM user_table")
+                rows = cur.fetchall()
+                users = [dict(row) for row in rows]
+                return users
+            finally:
+                cur.close()
 
     @classmethod
-    def get_by_username(cls, username):
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=DictCursor)
-        cur.execute("SELECT * FROM user_table WHERE username = %s", (username,))
-        row = cur.fetchone()
-        cur.close()
-        conn.close()
-        return cls(row['id'], row['username'], row['email'], row['user_password']) if row else None
+    def get_credentials(cls, username):
+        """Returns (user, password_hash) for login, or (None, None) for an unknown username."""
+        with get_db_connection() as conn:
+            cur = conn.cursor(cursor_factory=DictCursor)
+            cur.execute(f"SELECT {USER_COLUMNS}, user_password FROM user_table WHERE username = %s", (username,))
+            row = cur.fetchone()
+            cur.close()
+        if not row:
+            return None, None
+        return cls(row['id'], row['username'], row['email'], row['pfp_url'], row['pfp_urls']), row['user_password']
 
     @classmethod
     def get_by_id(cls, user_id):
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=DictCursor)
-        cur.execute("SELECT * FROM user_table WHERE id = %s", (user_id,))
-        row = cur.fetchone()
-        cur.close()
-        conn.close()
-        return cls(row['id'], row['username'], row['email'], row['user_password']) if row else None
+        with get_db_connection() as conn:
+            cur = conn.cursor(cursor_factory=DictCursor)
+            cur.execute(f"SELECT {USER_COLUMNS} FROM user_table WHERE id = %s", (user_id,))
+            row = cur.fetchone()
+            cur.close()
+        return cls(row['id'], row['username'], row['email'], row['pfp_url'], row['pfp_urls']) if row else None
+
+    @classmethod
+    def get_cached(cls, user_id):
+        """Looks a user up through user_cache, falling back to the database on a miss."""
+        key = str(user_id)
+        cached = user_cache.get(key)
+        if cached is not None:
+            return cls(cached['id'], cached['username'], cached['email'], cached.get('pfp_url'), cached.get('pfp_urls'))
+
+        user = cls.get_by_id(user_id)
+        if user:
+            user_cache.set(key, {
+                "id": user.id,
+                "username": user.username,
+                "email": user.email,
+                "pfp_url": user.pfp_url,
+                "pfp_urls": user.pfp_urls
+            })
+        return user
+
+    @classmethod
+    def invalidate_cache(cls, user_id):
+        user_cache.delete(str(user_id))
 
     @classmethod
     def update_user(cls, user_id, username, email, password=None):
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=DictCursor)
-        try:
-            if password:
-                hashed_pw = generate_password_hash(password)
+        # Hashed before taking a connection; HashingBusy propagates as a 503.
+        hashed_pw = password_hasher.hash(password) if password else None
+        with get_db_connection() as conn:
+            cur = conn.cursor(cursor_factory=DictCursor)
+            try:
+                if hashed_pw:
+                    cur.execute("""
+                        UPDATE user_table SET username=%s, email=%s, user_password=%s
+                        WHERE id=%s RETURNING id, username, email
+                    """, (username, email, hashed_pw, user_id))
+                else:
+                    cur.execute("""
+                        UPDATE user_table SET username=%s, email=%s
+                        WHERE id=%s RETURNING id, username, email
+                    """, (username, email, user_id))
+
+                row = cur.fetchone()
+                conn.commit()
+                cls.invalidate_cache(user_id)
+                return row
+            except Exception:
+                conn.rollback()
+                return None
+            finally:
+                cur.close()
+
+    @classmethod
+    def update_avatar(cls, user_id, image_url, image_urls=None):
+        with get_db_connection() as conn:
+            cur = conn.cursor(cursor_factory=DictCursor)
+            try:
                 cur.execute("""
-                    UPDATE user_table SET username=%s, email=%s, user_password=%s 
-                    WHERE id=%s RETURNING id, username, email
-                """, (username, email, hashed_pw, user_id))
-            else:
+                    UPDATE user_table
+                    SET pfp_url = %s,
+                        pfp_urls = %s
+                    WHERE id = %s
+                    RETURNING pfp_url
+                """, (image_url, Json(image_urls) if image_urls else None, user_id))
+
+                updated_row = cur.fetchone()
+                conn.commit()
+                cls.invalidate_cache(user_id)
+                return updated_row['pfp_url'] if updated_row else None
+            except Exception as e:
+                print(f"Error updating avatar: {e}")
+                conn.rollback()
+                return None
+            finally:
+                cur.close()
+
+    @classmethod
+    def update_password_hash(cls, user_id, old_hash, new_hash):
+        """Swaps in a rehashed password, unless the password changed in the meantime."""
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            try:
                 cur.execute("""
-                    UPDATE user_table SET username=%s, email=%s 
-                    WHERE id=%s RETURNING id, username, email
-                """, (username, email, user_id))
-            
-            row = cur.fetchone()
-            conn.commit()
-            return row
-        except Exception:
-            conn.rollback()
-            return None
-        finally:
-            cur.close()
-            conn.close()
-    
+                    UPDATE user_table SET user_password = %s
+                    WHERE id = %s AND user_password = %s
+                """, (new_hash, user_id, old_hash))
+                conn.commit()
+                return cur.rowcount == 1
+            except Exception as e:
+                print(f"Error upgrading password hash: {e}")
+                conn.rollback()
+                return False
+            finally:
+                cur.close()
+
     @classmethod
-    def update_avatar(cls, user_id, image_url):
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=DictCursor)
-        try:
-            cur.execute("""
-                UPDATE user_table 
-                SET pfp_url = %s 
-                WHERE id = %s
-                RETURNING pfp_url
-            """, (image_url, user_id))
-            
-            updated_row = cur.fetchone()
-            conn.commit()
-            return updated_row['pfp_url'] if updated_row else None
-        except Exception as e:
-            print(f"Error updating avatar: {e}")
-            conn.rollback()
+    def authenticate(cls, username, password):
+        """
+        Returns the user when password matches, otherwise None. The check
+        runs on the hashing pool (raises HashingBusy when it is saturated),
+        and a hash made with older parameters is upgraded in place on success.
+        """
+        user, stored = cls.get_credentials(username)
+        if user is None:
             return None
-        finally:
-            cur.close()
-            conn.close()
+        matches, upgraded = password_hasher.verify(stored, password)
+        if upgraded:
+            cls.update_password_hash(user.id, stored, upgraded)
+        return user if matches else None
 
-    def check_password(self, password):
-        return check_password_hash(self.user_password, password)
-    
     def to_dict(self):
         return {
-            "id": self.id, 
-            "username": self.username, 
+            "id": self.id,
+            "username": self.username,
             "email": self.email,
-            "pfp_url": self.pfp_url if hasattr(self, 'pfp_url') else None
-        }
\ No newline at end of file
+            "pfp_url": self.pfp_url,
+            "pfp_urls": self.pfp_urls
+        }
@@ -1,19 +1,28 @@
 from flask import Blueprint, jsonify, request
 from app.models.program_model import ProgramModel
-from app.models.college_model import CollegeModel
+from app.models.pagination import InvalidCursor
+from app.models.constraints import ConstraintViolation
+from app.services.table_versions import conditional
 
 program_bp = Blueprint('programs', __name__, url_prefix='/programs')
 
 @program_bp.route('/', methods=['GET'])
+@conditional('program_table')
 def get_programs():
     page = request.args.get('page', type=int)
     limit = request.args.get('limit', type=int)
     sort_by = request.args.get('sort_by', 'program_code')
     sort_order = request.args.get('sort_order', 'asc')
     search = request.args.get('search', '')
+    total_mode = request.args.get('total', 'exact')
+    fields = [f for f in request.args.get('fields', '').split(',') if f]
+    cursor = request.args.get('cursor')
+
+    if cursor is not None and limit is not None:
+        return get_cursor_programs_handler(limit, sort_by, sort_order, search, cursor)
 
     if page is not None and limit is not None:
-        return get_paginated_programs_handler(page, limit, sort_by, sort_order, search)
+        return get_paginated_programs_handler(page, limit, sort_by, sort_order, search, total_mode, fields)
 
     try:
         programs = ProgramModel.get_all()
@@ -21,17 +30,29 @@ def get_programs():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-def get_paginated_programs_handler(page, limit, sort_by, sort_order, search):
+def get_paginated_programs_handler(page, limit, sort_by, sort_order, search, total_mode='exact', fields=None):
     try:
         page = max(1, page)
         limit = max(1, limit)
-        pagination_data = ProgramModel.by_pagination(page, limit, sort_by, sort_order, search)
+        pagination_data = ProgramModel.by_pagination(page, limit, sort_by, sort_order, search, total_mode, fields)
         return jsonify(pagination_data), 200
     except Exception as e:
         print(f"Error fetching paginated programs: {e}")
         return jsonify({"error": str(e)}), 500
 
+def get_cursor_programs_handler(limit, sort_by, sort_order, search, cursor):
+    try:
+        limit = max(1, limit)
+        pagination_data = ProgramModel.by_cursor(limit, sort_by, sort_order, search, cursor)
+        return jsonify(pagination_data), 200
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(f"Error fetching programs by cursor: {e}")
+        return jsonify({"error": str(e)}), 500
+
 @program_bp.route('/<string:code>', methods=['GET'])
+@conditional('program_table')
 def get_program(code):
     program = ProgramModel.get_by_code(code)
     if program:
@@ -49,21 +70,6 @@ def add_program():
     program_name = data['program_name'].strip()
     college_code = data['college_code'].strip()
         
-    if not CollegeModel.get_by_code(college_code):
-        return jsonify({"error": "College code does not exist"}), 400
-
-    existing_code = ProgramModel.get_by_code(program_code)
-    existing_name = ProgramModel.get_by_name(program_name)
-
-    if existing_code and existing_name:
-        return jsonify({"error": "Program already exists"}), 409
-
-    if existing_code:
-         return jsonify({"error": "Program code already exists"}), 409
-
-    if existing_name:
-         return jsonify({"error": "Program name already exists"}), 409
-
     try:
         new_program = ProgramModel.add(
             program_code, 
@@ -71,6 +77,8 @@ def add_program():
             college_code
         )
         return jsonify(new_program), 201
+    except ConstraintViolation as e:
+        return jsonify({"error": e.message}), e.status
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -80,28 +88,18 @@ def update_program(code):
     if not data:
         return jsonify({"error": "No data provided"}), 400
     
-    current_program = ProgramModel.get_by_code(code)
-    if not current_program:
-        return jsonify({"error": "Program not found"}), 404
-
-    new_code = data.get('program_code', current_program['program_code'])
-    new_name = data.get('program_name', current_program['program_name'])
-    new_college = data.get('college_code', current_program['college_code'])
-
-    if new_code != current_program['program_code'] and ProgramModel.get_by_code(new_code):
-        return jsonify({"error": f"Program code '{new_code}' already exists"}), 400
-
-    if new_name != current_program['program_name'] and ProgramModel.get_by_name(new_name):
-        return jsonify({"error": f"Program name '{new_name}' already exists"}), 400
-
-    if new_college != current_program['college_code'] and not CollegeModel.get_by_code(new_college):
-        return jsonify({"error": "New college code does not exist"}), 400
-
     try:
-        updated_program = ProgramModel.update(code, new_code, new_name, new_college)
+        updated_program = ProgramModel.update(
+            code,
+            data.get('program_code'),
+            data.get('program_name'),
+            data.get('college_code')
+        )
         if updated_program:
             return jsonify(updated_program)
-        return jsonify({"error": "Update failed"}), 500
+        return jsonify({"error": "Program not found"}), 404
+    except ConstraintViolation as e:
+        return jsonify({"error": e.message}), e.status
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -113,10 +111,7 @@ def delete_program(code):
             return jsonify({"message": "Program deleted successfully"}), 200
         return jsonify({"error": "Program not found"}), 404
         
+    except ConstraintViolation as e:
+        return jsonify({"error": e.message}), e.status
     except Exception as e:
-        if "foreign key constraint" in str(e):
-             return jsonify({
-                 "error": "Unable to delete program because there are students enrolled in it."
-             }), 400
-        
         return jsonify({"error": str(e)}), 500
\ No newline at end of file
@@ -0,0 +1,142 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from os import getenv
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+class TTLCache:
+    """
+    In-process LRU cache whose entries also expire after ttl seconds.
+    Values should be JSON-compatible so the cache can be swapped for RedisCache.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self._misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "backend": "memory",
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+
+class RedisCache:
+    """
+    Same interface as TTLCache, backed by a shared Redis (or compatible) server
+    so every worker sees the same entries and invalidations.
+    """
+
+    def __init__(self, client, namespace, ttl=60.0):
+        self.client = client
+        self.namespace = namespace
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def _key(self, key):
+        return f"{self.namespace}:{key}"
+
+    def get(self, key):
+        raw = self.client.get(self._key(key))
+        with self._lock:
+            if raw is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+        return json.loads(raw)
+
+    def set(self, key, value, ttl=None):
+        seconds = self.ttl if ttl is None else ttl
+        self.client.set(self._key(key), json.dumps(value), px=max(1, int(seconds * 1000)))
+
+    def delete(self, key):
+        self.client.delete(self._key(key))
+
+    def clear(self):
+        for key in self.client.scan_iter(match=f"{self.namespace}:*"):
+            self.client.delete(key)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "backend": "redis",
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+
+_caches = {}
+
+
+def create_cache(namespace, maxsize=1024, ttl=60.0):
+    """
+    Returns a RedisCache when CACHE_REDIS_URL is set (and the redis package is
+    installed), otherwise a per-process TTLCache. Caches are registered by
+    namespace so their stats can be reported together.
+    """
+    redis_url = getenv('CACHE_REDIS_URL')
+    if redis_url and redis is not None:
+        cache = RedisCache(redis.Redis.from_url(redis_url), namespace, ttl)
+    else:
+        if redis_url:
+            print("CACHE_REDIS_URL is set but the redis package is not installed; using in-process cache")
+        cache = TTLCache(maxsize, ttl)
+
+    _caches[namespace] = cache
+    return cache
+
+
+def get_cache_stats():
+    return {namespace: cache.stats() for namespace, cache in _caches.items()}
@@ -0,0 +1,120 @@
+"""
+Negotiated response compression (brotli or gzip) for API and static
+responses.
+
+init_app() registers an after_request hook that picks an encoding from
+Accept-Encoding and compresses the body: buffered responses in one go,
+streamed ones (exports, the unpaginated student list) chunk by chunk
+without buffering them. Small bodies, already-encoded or non-text
+responses and partial content are left alone. brotli is optional; without
+it only gzip is offered.
+"""
+import gzip
+import zlib
+from os import getenv
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESS_MIN_BYTES = int(getenv('COMPRESS_MIN_BYTES', '512'))
+GZIP_LEVEL = int(getenv('GZIP_LEVEL', '6'))
+# Quality 11 is for precompressed assets; 4-5 is the usual on-the-fly tradeoff.
+BROTLI_QUALITY = int(getenv('BROTLI_QUALITY', '5'))
+
+COMPRESSIBLE_TYPES = (
+    'application/json', 'application/x-ndjson', 'application/javascript', 'application/xml',
+    'image/svg+xml', 'application/manifest+json',
+)
+
+
+def supported_encodings():
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def choose_encoding(accept_encodings, encodings=None):
+    """
+    Picks the best of encodings (default: the ones we can produce) from a
+    parsed Accept-Encoding header (werkzeug's request.accept_encodings), or
+    None for identity.
+    """
+    # Exact entries first: "gzip;q=0" refuses gzip even when "*" would allow it.
+    qualities = {value.lower(): quality for value, quality in accept_encodings}
+    best, best_quality = None, 0
+    for encoding in encodings if encodings is not None else supported_encodings():
+        quality = qualities[encoding] if encoding in qualities else qualities.get('*', 0)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(mimetype):
+    return bool(mimetype) and (mimetype.startswith('text/') or mimetype in COMPRESSIBLE_TYPES)
+
+
+def compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, GZIP_LEVEL, mtime=0)
+
+
+def compress_stream(chunks, encoding):
+    """Compresses an iterable of chunks, flushing after each so clients still receive data progressively."""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        for chunk in chunks:
+            out = compressor.process(chunk.encode() if isinstance(chunk, str) else chunk) + compressor.flush()
+            if out:
+                yield out
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            out = compressor.compress(chunk.encode() if isinstance(chunk, str) else chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if out:
+                yield out
+        yield compressor.flush()
+
+
+def compress_response(response, accept_encodings):
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return response
+    if 'Content-Encoding' in response.headers or 'Content-Range' in response.headers:
+        return response
+    if not is_compressible(response.mimetype):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = choose_encoding(accept_encodings)
+    if encoding is None:
+        return response
+
+    if response.direct_passthrough:
+        # Static files are sent as file wrappers; read them into a normal body.
+        response.direct_passthrough = False
+        response.make_sequence()
+
+    if response.is_streamed:
+        response.response = compress_stream(response.response, encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_BYTES:
+            return response
+        response.set_data(compress(data, encoding))
+
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        # The encoded body is no longer byte-identical to what the strong validator described.
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_app(app):
+    from flask import request
+
+    @app.after_request
+    def compress_after_request(response):
+        return compress_response(response, request.accept_encodings)
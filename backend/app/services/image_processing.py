@@ -0,0 +1,119 @@
+import io
+from os import getenv
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+    ImageOps = None
+
+
+# Square edge length in pixels for each stored avatar variant.
+THUMBNAIL_SIZES = {
+    "sm": 64,
+    "md": 160,
+    "lg": 480,
+}
+
+MAX_UPLOAD_BYTES = int(getenv('AVATAR_MAX_BYTES', str(10 * 1024 * 1024)))
+MAX_PIXELS = int(getenv('AVATAR_MAX_PIXELS', str(40_000_000)))
+JPEG_QUALITY = int(getenv('AVATAR_JPEG_QUALITY', '85'))
+
+ALLOWED_FORMATS = {"JPEG", "PNG", "GIF", "WEBP"}
+
+_SIGNATURES = (
+    (b"\xff\xd8\xff", "JPEG"),
+    (b"\x89PNG\r\n\x1a\n", "PNG"),
+    (b"GIF87a", "GIF"),
+    (b"GIF89a", "GIF"),
+)
+
+
+class InvalidImage(ValueError):
+    pass
+
+
+def _sniff_format(data):
+    for signature, fmt in _SIGNATURES:
+        if data.startswith(signature):
+            return fmt
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "WEBP"
+    return None
+
+
+def validate_image(data):
+    """
+    Cheap checks done in the request thread: size limit, a known image
+    signature and, when Pillow is installed, a header parse that also
+    rejects decompression bombs. Returns the detected format.
+    """
+    if not data:
+        raise InvalidImage("Empty file")
+    if len(data) > MAX_UPLOAD_BYTES:
+        raise InvalidImage(f"Image is larger than {MAX_UPLOAD_BYTES // (1024 * 1024)} MB")
+
+    fmt = _sniff_format(data)
+    if fmt is None:
+        raise InvalidImage("Unsupported image type, expected JPEG, PNG, GIF or WebP")
+
+    if Image is not None:
+        try:
+            with Image.open(io.BytesIO(data)) as img:
+                if img.format not in ALLOWED_FORMATS:
+                    raise InvalidImage(f"Unsupported image type '{img.format}'")
+                if img.width * img.height > MAX_PIXELS:
+                    raise InvalidImage("Image dimensions are too large")
+                img.verify()
+        except InvalidImage:
+            raise
+        except Exception as e:
+            raise InvalidImage(f"Could not read image: {e}")
+
+    return fmt
+
+
+def make_thumbnails(data):
+    """
+    Returns {size_name: (bytes, content_type)} for every THUMBNAIL_SIZES entry.
+
+    Each variant is re-encoded from decoded pixels, so EXIF (including GPS
+    tags), ICC profiles and comments are dropped; the EXIF orientation is
+    applied first so phone photos stay upright. Images are centre-cropped
+    to a square because avatars are always rendered in a circle.
+
+    Without Pillow the original bytes are returned as a single 'original'
+    variant and no resizing takes place.
+    """
+    validate_image(data)
+
+    if Image is None:
+        return {"original": (data, None)}
+
+    try:
+        return _resize(data)
+    except (OSError, Image.DecompressionBombError) as e:
+        # verify() only parses headers; a truncated or corrupt body fails here, on decode.
+        raise InvalidImage(f"Could not read image: {e}")
+
+
+def _resize(data):
+    with Image.open(io.BytesIO(data)) as img:
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ("RGB", "L"):
+            background = Image.new("RGB", img.size, (255, 255, 255))
+            rgba = img.convert("RGBA")
+            background.paste(rgba, mask=rgba.getchannel("A"))
+            img = background
+        elif img.mode == "L":
+            img = img.convert("RGB")
+
+        variants = {}
+        for name, edge in THUMBNAIL_SIZES.items():
+            edge = min(edge, img.width, img.height)
+            thumb = ImageOps.fit(img, (edge, edge), Image.LANCZOS)
+            buffer = io.BytesIO()
+            thumb.save(buffer, format="JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+            variants[name] = (buffer.getvalue(), "image/jpeg")
+
+    return variants
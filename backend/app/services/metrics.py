@@ -0,0 +1,207 @@
+"""
+In-process metrics with Prometheus text exposition.
+
+Request latency, response size and per-request DB usage are recorded by
+init_app(); every query run through app.db connections is timed by
+record_query(). GET /metrics renders everything, plus pool gauges, in the
+Prometheus text format (no client library needed).
+"""
+import bisect
+import contextvars
+import threading
+import time
+from os import getenv
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+INF_BUCKET = 'le="+Inf"'
+
+SLOW_QUERY_MS = float(getenv('SLOW_QUERY_MS', '0'))
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, *labelvalues):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labelvalues, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, labelvalues)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labelvalues):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labelvalues, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    le = f'le="{_number(bound)}"'
+                    lines.append(f"{self.name}_bucket{_labels(self.labelnames, labelvalues, le)} {cumulative}")
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labelvalues, INF_BUCKET)} {count}")
+                lines.append(f"{self.name}_sum{_labels(self.labelnames, labelvalues)} {_number(total)}")
+                lines.append(f"{self.name}_count{_labels(self.labelnames, labelvalues)} {count}")
+        return lines
+
+
+ROUTE_LABELS = ("blueprint", "route", "method")
+
+request_duration = Histogram(
+    "http_request_duration_seconds", "Time spent handling a request.",
+    ROUTE_LABELS + ("status",))
+response_size = Histogram(
+    "http_response_size_bytes", "Response body size (streamed responses are not counted).",
+    ROUTE_LABELS, SIZE_BUCKETS)
+request_queries = Histogram(
+    "http_request_db_queries", "Database queries issued while handling a request.",
+    ROUTE_LABELS, QUERY_COUNT_BUCKETS)
+request_db_time = Histogram(
+    "http_request_db_seconds", "Time spent in database queries while handling a request.",
+    ROUTE_LABELS)
+queries_total = Counter("db_queries_total", "Database queries executed, including background work.")
+query_seconds_total = Counter("db_query_seconds_total", "Time spent executing database queries.")
+slow_queries_total = Counter("db_slow_queries_total", "Queries slower than SLOW_QUERY_MS.")
+password_hash_seconds = Histogram(
+    "password_hash_seconds", "Time for a password hash or check, including time queued for a hashing process.",
+    ("operation",))
+password_hash_rejected = Counter(
+    "password_hash_rejected_total", "Password hashes refused (503) because too many were pending or one timed out.",
+    ("operation",))
+rate_limit_rejected = Counter(
+    "rate_limit_rejected_total", "API requests refused (429) because the client's token bucket was empty.",
+    ("blueprint", "route"))
+
+METRICS = [request_duration, response_size, request_queries, request_db_time,
+           queries_total, query_seconds_total, slow_queries_total,
+           password_hash_seconds, password_hash_rejected, rate_limit_rejected]
+
+# [query count, query seconds] for the request running in this context.
+_request_db = contextvars.ContextVar("request_db", default=None)
+
+
+def record_query(query, params, seconds):
+    """Called by app.db for every cursor execute / executemany / copy."""
+    queries_total.inc()
+    query_seconds_total.inc(seconds)
+
+    current = _request_db.get()
+    if current is not None:
+        current[0] += 1
+        current[1] += seconds
+
+    if SLOW_QUERY_MS and seconds * 1000 >= SLOW_QUERY_MS:
+        slow_queries_total.inc()
+        sql = query.decode() if isinstance(query, bytes) else str(query)
+        print(f"Slow query ({seconds * 1000:.1f} ms): {' '.join(sql.split())} params={params!r}")
+
+
+def render(extra_lines=()):
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    lines.extend(extra_lines)
+    return "\n".join(lines) + "\n"
+
+
+def _gauges(prefix, stats, help_text):
+    lines = []
+    for key, value in sorted(stats.items()):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        name = f"{prefix}_{key}"
+        lines.extend([f"# HELP {name} {help_text} ({key}).", f"# TYPE {name} gauge", f"{name} {_number(value)}"])
+    return lines
+
+
+def init_app(app):
+    """Registers the timing hooks and the /metrics endpoint on app."""
+    from flask import Response, g, request
+    from app.db import get_pool_stats
+    from app.services.password_hashing import password_hasher
+    from app.services.rate_limit import limiter
+
+    @app.before_request
+    def start_request_timer():
+        g.metrics_started = time.perf_counter()
+        g.metrics_db = [0, 0.0]
+        g.metrics_db_token = _request_db.set(g.metrics_db)
+
+    @app.after_request
+    def record_request(response):
+        started = g.pop("metrics_started", None)
+        if started is None:
+            return response
+
+        rule = request.url_rule.rule if request.url_rule else "<unmatched>"
+        labels = (request.blueprint or "", rule, request.method)
+        request_duration.observe(time.perf_counter() - started, *labels, str(response.status_code))
+
+        if not response.is_streamed:
+            response_size.observe(response.calculate_content_length() or 0, *labels)
+
+        db = g.pop("metrics_db", [0, 0.0])
+        request_queries.observe(db[0], *labels)
+        request_db_time.observe(db[1], *labels)
+        return response
+
+    @app.teardown_request
+    def reset_request_db(exc):
+        token = g.pop("metrics_db_token", None)
+        if token is not None:
+            _request_db.reset(token)
+
+    @app.route("/metrics")
+    def metrics():
+        gauge_lines = _gauges("db_pool", get_pool_stats(), "Connection pool statistic")
+        gauge_lines += _gauges("password_hasher", password_hasher.stats(), "Password hashing pool statistic")
+        gauge_lines += _gauges("rate_limit", limiter.stats(), "Rate limiter statistic")
+        return Response(render(gauge_lines), mimetype="text/plain; version=0.0.4")
@@ -0,0 +1,140 @@
+"""
+Password hashing off the request threads.
+
+werkzeug's scrypt/pbkdf2 hashes are deliberately slow (~100 ms of CPU
+each), and they hold the GIL, so a burst of logins on the request threads
+stalls every other request in the process. PasswordHasher runs them on a
+small process pool instead and admits at most max_pending hashes at a time
+(queued plus running); beyond that, or when a hash waits longer than
+timeout, it raises HashingBusy, which create_app turns into a 503 with
+Retry-After so clients back off instead of piling up.
+
+verify() also reports when a stored hash was made with older parameters
+than PASSWORD_HASH_METHOD, and returns a fresh hash computed in the same
+worker call, so Users.authenticate can upgrade it on a successful login.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from os import getenv
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+# Full method string, so stored hashes can be compared against it as-is.
+PASSWORD_HASH_METHOD = getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+
+
+class HashingBusy(Exception):
+    """Too many password hashes pending; the request should be retried later."""
+
+
+def _hash(password, method):
+    return generate_password_hash(password, method)
+
+
+def _verify(stored, password, method):
+    if not check_password_hash(stored, password):
+        return False, None
+    if stored.split('$', 1)[0] != method:
+        return True, generate_password_hash(password, method)
+    return True, None
+
+
+class PasswordHasher:
+    def __init__(self, workers=2, max_pending=8, timeout=5.0, method=PASSWORD_HASH_METHOD):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.method = method
+        self._executor = None
+        self._pid = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def start(self):
+        """
+        Starts the worker processes now. Call it while the process is still
+        single-threaded (create_app, serve.py's post_fork): the workers are
+        forked, and forking next to running request threads can copy a lock
+        one of them holds.
+        """
+        with self._lock:
+            executor = self._get_executor()
+        # ProcessPoolExecutor forks its workers on the first submit.
+        executor.submit(int).result()
+
+    def _get_executor(self):
+        # Like the DB pool, worker processes belong to the process that started them (see serve.py).
+        if self._executor is None or self._pid != os.getpid():
+            self._executor = ProcessPoolExecutor(self.workers)
+            self._pid = os.getpid()
+            self._pending = 0
+        return self._executor
+
+    def _release(self, future):
+        with self._lock:
+            self._pending -= 1
+
+    def _run(self, operation, fn, *args):
+        from app.services.metrics import password_hash_rejected, password_hash_seconds
+
+        with self._lock:
+            executor = self._get_executor()
+            if self._pending >= self.max_pending:
+                password_hash_rejected.inc(1, operation)
+                raise HashingBusy(f"{self._pending} password hashes already pending")
+            self._pending += 1
+
+        started = time.perf_counter()
+        # The slot is freed when the work actually finishes, not when the caller gives up on it.
+        future = executor.submit(fn, *args)
+        future.add_done_callback(self._release)
+        try:
+            result = future.result(timeout=self.timeout)
+        except TimeoutError:
+            password_hash_rejected.inc(1, operation)
+            raise HashingBusy(f"Password hash not finished after {self.timeout}s")
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); start a fresh pool on the next call.
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            raise HashingBusy("Password hashing pool restarted")
+        password_hash_seconds.observe(time.perf_counter() - started, operation)
+        return result
+
+    def hash(self, password):
+        return self._run('hash', _hash, password, self.method)
+
+    def verify(self, stored, password):
+        """
+        Returns (matches, upgraded_hash). upgraded_hash is set only when the
+        password matches and stored was made with other parameters than
+        self.method.
+        """
+        if not stored or password is None:
+            return False, None
+        return self._run('verify', _verify, stored, password, self.method)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+            }
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    workers=int(getenv('HASH_WORKERS', '2')),
+    max_pending=int(getenv('HASH_MAX_PENDING', '8')),
+    timeout=float(getenv('HASH_TIMEOUT', '5')),
+)
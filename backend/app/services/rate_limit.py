@@ -0,0 +1,192 @@
+"""
+Per-client token-bucket rate limiting for the API.
+
+Every client (the logged-in user, otherwise the remote address) has a
+bucket of RATE_LIMIT_BURST tokens refilled at RATE_LIMIT_RATE tokens per
+second. Each API request spends its route's cost: 1 by default, more for
+routes that make PostgreSQL do more work. Set the cost with the rate_cost()
+decorator, either as a number or as a function of the request:
+
+    @student_bp.route('/export', methods=['GET'])
+    @rate_cost(FULL_TABLE_COST)
+    def export_students(): ...
+
+A request the bucket cannot pay for is answered 429 with Retry-After set
+to when it would be affordable, without reaching the view; rejected
+requests cost nothing. Rejections are counted in /metrics
+(rate_limit_rejected_total).
+
+Buckets live in process memory, so with several workers each one allows
+the full rate; set CACHE_REDIS_URL to share them through Redis, like the
+caches. If Redis is unreachable requests are let
+through rather than failing. RATE_LIMIT_RATE=0 turns limiting off (the
+load tests do this, since they measure capacity, not the limiter).
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+from os import getenv
+
+from app.services.cache import redis
+
+RATE_LIMIT_RATE = float(getenv('RATE_LIMIT_RATE', '10'))
+RATE_LIMIT_BURST = float(getenv('RATE_LIMIT_BURST', '60'))
+
+DEFAULT_COST = 1
+LIST_COST = 2
+AUTH_COST = 5
+# Unpaginated lists, exports and imports: a full scan of student_table.
+FULL_TABLE_COST = int(getenv('RATE_LIMIT_FULL_TABLE_COST', '30'))
+
+
+def rate_cost(cost):
+    """Sets the tokens a view spends per request: a number, or a function of the request returning one."""
+    def decorator(view):
+        view.rate_cost = cost
+        return view
+    return decorator
+
+
+class LocalBucketStore:
+    """
+    Per-process buckets, least recently used first. A bucket idle for
+    burst / rate seconds is full again, so evicting the oldest ones past
+    maxsize loses nothing in practice.
+    """
+
+    def __init__(self, maxsize=100000):
+        self.maxsize = maxsize
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, cost, rate, burst):
+        """Spends cost tokens if the bucket has them. Returns (allowed, seconds until it would)."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            if tokens >= cost:
+                tokens -= cost
+                allowed, wait = True, 0.0
+            else:
+                allowed, wait = False, (cost - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        return allowed, wait
+
+    def stats(self):
+        with self._lock:
+            return {"backend": "memory", "buckets": len(self._buckets), "maxsize": self.maxsize}
+
+
+# Refill and spend in one step on the server, using Redis' clock so workers on different hosts agree.
+TAKE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or burst
+local updated = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return {allowed, tostring(wait)}
+"""
+
+
+class RedisBucketStore:
+    """Buckets shared by every worker through Redis."""
+
+    def __init__(self, client, namespace="rate_limit"):
+        self.client = client
+        self.namespace = namespace
+        self._take = client.register_script(TAKE_SCRIPT)
+
+    def take(self, key, cost, rate, burst):
+        allowed, wait = self._take(keys=[f"{self.namespace}:{key}"], args=[rate, burst, cost])
+        return bool(allowed), float(wait)
+
+    def stats(self):
+        return {"backend": "redis"}
+
+
+def create_bucket_store():
+    redis_url = getenv('CACHE_REDIS_URL')
+    if redis_url and redis is not None:
+        return RedisBucketStore(redis.Redis.from_url(redis_url))
+    return LocalBucketStore()
+
+
+class RateLimiter:
+    def __init__(self, store, rate=RATE_LIMIT_RATE, burst=RATE_LIMIT_BURST):
+        self.store = store
+        self.rate = rate
+        self.burst = burst
+
+    @property
+    def enabled(self):
+        return self.rate > 0
+
+    def hit(self, key, cost):
+        """Returns (allowed, retry_after_seconds) for spending cost tokens from key's bucket."""
+        # A route dearer than the whole bucket would otherwise never be allowed.
+        cost = min(cost, self.burst)
+        try:
+            return self.store.take(key, cost, self.rate, self.burst)
+        except Exception as e:
+            print(f"Rate limiter store failed, letting the request through: {e}")
+            return True, 0.0
+
+    def stats(self):
+        return self.store.stats()
+
+
+limiter = RateLimiter(create_bucket_store())
+
+
+def client_key():
+    """The logged-in user, otherwise the remote address (behind a proxy, configure ProxyFix so this is the client's)."""
+    from flask import request
+    from flask_login import current_user
+
+    if current_user.is_authenticated:
+        return f"user:{current_user.id}"
+    return f"ip:{request.remote_addr}"
+
+
+def init_app(app):
+    """Charges every blueprint (API) request against its client's bucket before the view runs."""
+    from flask import jsonify, request
+    from app.services.metrics import rate_limit_rejected
+
+    @app.before_request
+    def limit_request():
+        if not limiter.enabled or request.blueprint is None or request.method == 'OPTIONS':
+            return None
+
+        cost = getattr(app.view_functions.get(request.endpoint), 'rate_cost', DEFAULT_COST)
+        if callable(cost):
+            cost = cost(request)
+
+        allowed, retry_after = limiter.hit(client_key(), cost)
+        if allowed:
+            return None
+
+        rate_limit_rejected.inc(1, request.blueprint, request.url_rule.rule)
+        response = jsonify({"error": "Too many requests, please slow down"})
+        response.status_code = 429
+        response.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+        return response
@@ -0,0 +1,77 @@
+import threading
+import time
+from os import getenv
+
+from app.services.table_versions import table_versions
+
+REFERENCE_CACHE_TTL = float(getenv('REFERENCE_CACHE_TTL', '300'))
+
+
+class ReferenceTable:
+    """
+    Snapshot of the codes in a small lookup table (programs), for
+    validating many rows at once (student imports).
+
+    The snapshot is reloaded when the table's version counter moves. The
+    counters are held in memory and refreshed by NOTIFY (see
+    table_versions), so a lookup with an unchanged table costs no database
+    round trip, and a write from any worker or seeder is seen on the next
+    one. The ttl is a backstop in case a notification is missed.
+
+    benchmarks/reference_benchmark.py measures the round trips saved.
+    """
+
+    def __init__(self, table, loader, ttl=REFERENCE_CACHE_TTL):
+        self.table = table
+        self.loader = loader
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._version = None
+        self._loaded_at = 0.0
+        self._codes = frozenset()
+        self._loads = 0
+        self._hits = 0
+
+    def _current_version(self):
+        try:
+            return table_versions.get([self.table])[0][0]
+        except Exception as e:
+            print(f"Could not read table version for {self.table}: {e}")
+            return None
+
+    def _snapshot(self):
+        version = self._current_version()
+        with self._lock:
+            fresh = (
+                version is not None
+                and version == self._version
+                and time.monotonic() - self._loaded_at < self.ttl
+            )
+            if fresh:
+                self._hits += 1
+                return self._codes
+
+            self._codes = frozenset(self.loader())
+            self._version = version
+            self._loaded_at = time.monotonic()
+            self._loads += 1
+            return self._codes
+
+    def codes(self):
+        return self._snapshot()
+
+    def preload(self):
+        self._snapshot()
+
+    def invalidate(self):
+        with self._lock:
+            self._version = None
+
+    def stats(self):
+        with self._lock:
+            return {
+                "rows": len(self._codes),
+                "version": self._version,
+                "loads": self._loads,
+                "hits": self._hits,
+            }
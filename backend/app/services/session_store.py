@@ -0,0 +1,237 @@
+import secrets
+import threading
+import time
+from os import getenv
+
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+from app.db import get_db_connection
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+class ServerSideSession(CallbackDict, SessionMixin):
+    def __init__(self, initial=None, sid=None, new=False, expires_at=None):
+        def on_update(self):
+            self.modified = True
+
+        CallbackDict.__init__(self, initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.expires_at = expires_at
+        self.modified = False
+
+
+class PostgresSessionStore:
+    """Sessions in session_table (see migrations/0004_session_table.up.sql)."""
+
+    def load(self, sid):
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute("""
+                    SELECT data, EXTRACT(EPOCH FROM expires_at)
+                    FROM session_table
+                    WHERE session_id = %s AND expires_at > NOW()
+                """, (sid,))
+                row = cur.fetchone()
+            finally:
+                cur.close()
+        return (row[0], float(row[1])) if row else None
+
+    def save(self, sid, data, expires_at):
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute("""
+                    INSERT INTO session_table (session_id, data, expires_at)
+                    VALUES (%s, %s, TO_TIMESTAMP(%s))
+                    ON CONFLICT (session_id)
+                    DO UPDATE SET data = EXCLUDED.data, expires_at = EXCLUDED.expires_at
+                """, (sid, data, expires_at))
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                raise e
+            finally:
+                cur.close()
+
+    def delete(self, sid):
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute("DELETE FROM session_table WHERE session_id = %s", (sid,))
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                raise e
+            finally:
+                cur.close()
+
+    def purge_expired(self, batch_size=1000):
+        """Deletes expired sessions in batches so no single statement holds locks for long."""
+        total = 0
+        while True:
+            with get_db_connection() as conn:
+                cur = conn.cursor()
+                try:
+                    cur.execute("""
+                        DELETE FROM session_table
+                        WHERE session_id IN (
+                            SELECT session_id FROM session_table
+                            WHERE expires_at <= NOW()
+                            LIMIT %s
+                            FOR UPDATE SKIP LOCKED
+                        )
+                    """, (batch_size,))
+                    deleted = cur.rowcount
+                    conn.commit()
+                except Exception as e:
+                    conn.rollback()
+                    raise e
+                finally:
+                    cur.close()
+
+            total += deleted
+            if deleted < batch_size:
+                return total
+
+
+class RedisSessionStore:
+    """Sessions in a Redis-compatible server; expiry is handled by key TTLs."""
+
+    def __init__(self, client, prefix='session:'):
+        self.client = client
+        self.prefix = prefix
+
+    def load(self, sid):
+        pipe = self.client.pipeline()
+        pipe.get(self.prefix + sid)
+        pipe.pttl(self.prefix + sid)
+        data, ttl_ms = pipe.execute()
+        if data is None or ttl_ms is None or ttl_ms < 0:
+            return None
+        if isinstance(data, bytes):
+            data = data.decode()
+        return data, time.time() + ttl_ms / 1000.0
+
+    def save(self, sid, data, expires_at):
+        ttl_ms = max(1, int((expires_at - time.time()) * 1000))
+        self.client.set(self.prefix + sid, data, px=ttl_ms)
+
+    def delete(self, sid):
+        self.client.delete(self.prefix + sid)
+
+    def purge_expired(self, batch_size=1000):
+        return 0
+
+
+class StoreSessionInterface(SessionInterface):
+    """
+    Server-side sessions keyed by a random cookie value.
+
+    A session is only written back when it changed, or when less than
+    refresh_fraction of its lifetime remains; unchanged requests cost a
+    single read. Expired rows are purged in the background at most once
+    every purge_interval seconds per process.
+    """
+
+    serializer = TaggedJSONSerializer()
+
+    def __init__(self, store, refresh_fraction=0.5, purge_interval=300, purge_batch_size=1000):
+        self.store = store
+        self.refresh_fraction = refresh_fraction
+        self.purge_interval = purge_interval
+        self.purge_batch_size = purge_batch_size
+        self._last_purge = time.monotonic()
+        self._purge_lock = threading.Lock()
+        self.writes = 0
+        self.skipped_writes = 0
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            record = self.store.load(sid)
+            if record:
+                data, expires_at = record
+                try:
+                    return ServerSideSession(self.serializer.loads(data), sid=sid, expires_at=expires_at)
+                except ValueError:
+                    pass
+        return ServerSideSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if not session:
+            if session.modified and not session.new:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        lifetime = app.permanent_session_lifetime.total_seconds()
+        now = time.time()
+        stale = session.expires_at is None or session.expires_at - now < lifetime * self.refresh_fraction
+
+        if session.modified or session.new or stale:
+            self.store.save(session.sid, self.serializer.dumps(dict(session)), now + lifetime)
+            self.writes += 1
+            response.set_cookie(
+                name,
+                session.sid,
+                expires=self.get_expiration_time(app, session),
+                httponly=self.get_cookie_httponly(app),
+                domain=domain,
+                path=path,
+                secure=self.get_cookie_secure(app),
+                samesite=self.get_cookie_samesite(app),
+            )
+        else:
+            self.skipped_writes += 1
+
+        self._maybe_purge()
+
+    def _maybe_purge(self):
+        if time.monotonic() - self._last_purge < self.purge_interval:
+            return
+        if not self._purge_lock.acquire(blocking=False):
+            return
+        self._last_purge = time.monotonic()
+
+        def run():
+            try:
+                self.store.purge_expired(self.purge_batch_size)
+            except Exception as e:
+                print(f"Session purge failed: {e}")
+            finally:
+                self._purge_lock.release()
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def stats(self):
+        return {"writes": self.writes, "skipped_writes": self.skipped_writes}
+
+
+def create_session_interface(backend):
+    if backend == 'postgres':
+        store = PostgresSessionStore()
+    elif backend == 'redis':
+        redis_url = getenv('SESSION_REDIS_URL') or getenv('CACHE_REDIS_URL')
+        if redis is None or not redis_url:
+            raise ValueError("SESSION_BACKEND=redis requires the redis package and SESSION_REDIS_URL")
+        store = RedisSessionStore(redis.Redis.from_url(redis_url))
+    else:
+        raise ValueError(f"Unknown SESSION_BACKEND '{backend}'")
+
+    return StoreSessionInterface(
+        store,
+        refresh_fraction=float(getenv('SESSION_REFRESH_FRACTION', '0.5')),
+        purge_interval=float(getenv('SESSION_PURGE_INTERVAL', '300')),
+    )
@@ -0,0 +1,174 @@
+"""
+The built frontend (Vite's output in dist/), served from a manifest that is
+built once at startup instead of probing the filesystem per request.
+
+AssetManifest walks the build directory and records every file with its
+type, validator and any precompressed .br / .gz sibling. Requests are then
+a dict lookup:
+
+- Fingerprinted files (Vite's assets/name-<hash>.js) never change under the
+  same name, so they are sent with a one-year immutable Cache-Control.
+- Everything else (favicon, vite.svg, ...) is revalidated by ETag.
+- index.html is held in memory, with its precompressed variants, and is
+  the fallback for client-side routes.
+
+A precompressed sibling is sent as-is when the client accepts its encoding,
+so the on-the-fly compression in app.services.compression never runs for
+those files. Write the siblings after a frontend build with:
+
+    cd frontend && npm run build
+    cd ../backend && python precompress.py
+
+The manifest only knows about files that existed at startup; restart after
+deploying a new build (with serve.py that means USR2, since the app is
+preloaded in the master and HUP keeps it).
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from os import getenv
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from app.services.compression import COMPRESS_MIN_BYTES, choose_encoding, is_compressible
+
+STATIC_DIR = getenv('STATIC_DIR', os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'dist'))
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# Vite's default asset names: assets/<name>-<8+ char base64url hash>.<ext>
+FINGERPRINTED = re.compile(r"-[\w-]{8,}\.\w+$")
+
+# Preference order when the client weighs encodings equally.
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+
+class Asset:
+    __slots__ = ("path", "mimetype", "etag", "immutable", "variants")
+
+    def __init__(self, path, mimetype, etag, immutable, variants):
+        self.path = path
+        self.mimetype = mimetype
+        self.etag = etag
+        self.immutable = immutable
+        # encoding -> path of the precompressed sibling
+        self.variants = variants
+
+
+class AssetManifest:
+    def __init__(self, root=STATIC_DIR):
+        self.root = root
+        self.assets = {}
+        self.index = None
+        self.index_etag = None
+        self.index_variants = {}
+        self.build()
+
+    def build(self):
+        assets = {}
+        if os.path.isdir(self.root):
+            for directory, _, filenames in os.walk(self.root):
+                present = set(filenames)
+                for filename in filenames:
+                    if filename.endswith(tuple(suffix for _, suffix in PRECOMPRESSED)):
+                        continue
+                    path = os.path.join(directory, filename)
+                    name = os.path.relpath(path, self.root).replace(os.sep, "/")
+                    stat = os.stat(path)
+                    variants = {
+                        encoding: path + suffix
+                        for encoding, suffix in PRECOMPRESSED
+                        if filename + suffix in present
+                    }
+                    assets[name] = Asset(
+                        path,
+                        mimetypes.guess_type(filename)[0] or "application/octet-stream",
+                        f"{stat.st_mtime_ns:x}-{stat.st_size:x}",
+                        name.startswith("assets/") and FINGERPRINTED.search(filename) is not None,
+                        variants,
+                    )
+        self.assets = assets
+
+        index = assets.pop("index.html", None)
+        if index is None:
+            self.index, self.index_etag, self.index_variants = None, None, {}
+            return
+        with open(index.path, "rb") as f:
+            self.index = f.read()
+        self.index_etag = hashlib.sha1(self.index).hexdigest()
+        variants = {}
+        for encoding, path in index.variants.items():
+            with open(path, "rb") as f:
+                variants[encoding] = f.read()
+        self.index_variants = variants
+
+    def get(self, name):
+        return self.assets.get(name)
+
+    def send(self, asset, request):
+        """Response for a manifest entry, preferring a precompressed sibling the client accepts."""
+        from flask import send_file
+
+        encoding = choose_encoding(request.accept_encodings, tuple(asset.variants)) if asset.variants else None
+        path = asset.variants[encoding] if encoding else asset.path
+        response = send_file(
+            path,
+            mimetype=asset.mimetype,
+            etag=f"{asset.etag}-{encoding}" if encoding else asset.etag,
+            conditional=True,
+        )
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        if asset.variants:
+            response.vary.add("Accept-Encoding")
+        response.headers["Cache-Control"] = IMMUTABLE if asset.immutable else REVALIDATE
+        return response
+
+    def send_index(self, request):
+        """index.html from memory, revalidated on every load so new builds are picked up."""
+        from flask import Response
+
+        encoding = choose_encoding(request.accept_encodings, tuple(self.index_variants)) if self.index_variants else None
+        response = Response(self.index_variants[encoding] if encoding else self.index, mimetype="text/html")
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+            response.vary.add("Accept-Encoding")
+        response.set_etag(f"{self.index_etag}-{encoding}" if encoding else self.index_etag)
+        response.headers["Cache-Control"] = REVALIDATE
+        return response.make_conditional(request)
+
+
+def precompress(root=STATIC_DIR):
+    """
+    Writes .gz (and, with brotli installed, .br) siblings at maximum
+    compression for every compressible file in root. Returns the number
+    of files written.
+    """
+    written = 0
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            if filename.endswith(tuple(suffix for _, suffix in PRECOMPRESSED)):
+                continue
+            if not is_compressible(mimetypes.guess_type(filename)[0]):
+                continue
+            path = os.path.join(directory, filename)
+            with open(path, "rb") as f:
+                data = f.read()
+            if len(data) < COMPRESS_MIN_BYTES:
+                continue
+            outputs = [(".gz", gzip.compress(data, 9, mtime=0))]
+            if brotli is not None:
+                outputs.append((".br", brotli.compress(data, quality=11)))
+            for suffix, compressed in outputs:
+                # Not worth a sibling if it barely shrinks.
+                if len(compressed) < len(data) * 0.9:
+                    with open(path + suffix, "wb") as f:
+                        f.write(compressed)
+                    written += 1
+    return written
@@ -0,0 +1,77 @@
+import io
+import os
+import re
+import uuid
+from os import getenv
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class CloudinaryStorage:
+    def __init__(self, folder="student_sis/avatars"):
+        self.folder = folder
+
+    def upload(self, data, filename, content_type=None):
+        import cloudinary.uploader
+
+        result = cloudinary.uploader.upload(io.BytesIO(data), folder=self.folder)
+        url = result.get("secure_url")
+        if not url:
+            raise RuntimeError("Cloudinary did not return a URL")
+        return url
+
+    def delete(self, url):
+        import cloudinary.uploader
+
+        # .../image/upload/v1712345678/student_sis/avatars/abc.jpg -> student_sis/avatars/abc
+        path = url.split("/upload/", 1)[1]
+        if re.match(r"v\d+/", path):
+            path = path.split("/", 1)[1]
+        cloudinary.uploader.destroy(os.path.splitext(path)[0])
+
+
+class LocalDiskStorage:
+    """Writes uploads under root and serves them from base_url (see create_app)."""
+
+    def __init__(self, root, base_url="/uploads/"):
+        self.root = root
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+        os.makedirs(root, exist_ok=True)
+
+    def upload(self, data, filename, content_type=None):
+        extension = os.path.splitext(filename or "")[1].lower()
+        name = f"{uuid.uuid4().hex}{extension}"
+        with open(os.path.join(self.root, name), "wb") as f:
+            f.write(data)
+        return self.base_url + name
+
+    def delete(self, url):
+        if not url.startswith(self.base_url):
+            return
+        path = os.path.join(self.root, os.path.basename(url[len(self.base_url):]))
+        if os.path.exists(path):
+            os.remove(path)
+
+
+_storage = None
+
+
+def get_storage():
+    """Returns the configured avatar store: AVATAR_STORAGE=cloudinary (default) or local."""
+    global _storage
+    if _storage is None:
+        if getenv('AVATAR_STORAGE', 'cloudinary') == 'local':
+            _storage = LocalDiskStorage(
+                getenv('AVATAR_LOCAL_DIR', os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'uploads')),
+                getenv('AVATAR_LOCAL_BASE_URL', '/uploads/'),
+            )
+        else:
+            _storage = CloudinaryStorage()
+    return _storage
+
+
+def set_storage(storage):
+    global _storage
+    _storage = storage
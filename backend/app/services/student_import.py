@@ -0,0 +1,356 @@
+"""
+Bulk student import.
+
+Rows are read as a stream (CSV, NDJSON or a JSON array), validated in
+batches against the current set of program codes, COPY'd into a temporary
+staging table and merged into student_table with one INSERT ... SELECT per
+batch. Every rejected row is reported with its 1-based row number.
+
+Also usable from the command line (run from backend/):
+
+    python -m app.services.student_import students.csv --mode upsert
+"""
+import argparse
+import csv
+import io
+import json
+import time
+from os import getenv
+
+import psycopg2
+
+from app.db import get_db_connection
+from app.models.constraints import constraint_error
+from app.models.program_model import program_reference
+from app.models.student_search import GENDERS, YEARS
+
+COLUMNS = ('student_id', 'firstname', 'lastname', 'program_code', 'year', 'gender')
+REQUIRED = ('student_id', 'firstname', 'lastname', 'program_code', 'year', 'gender')
+MAX_LENGTHS = {'student_id': 20, 'firstname': 50, 'lastname': 50, 'program_code': 10}
+
+MODES = ('insert', 'upsert')
+FORMATS = ('csv', 'json', 'ndjson')
+
+IMPORT_BATCH_SIZE = int(getenv('IMPORT_BATCH_SIZE', '5000'))
+IMPORT_MAX_ERRORS = int(getenv('IMPORT_MAX_ERRORS', '1000'))
+# Characters read at a time from a JSON array import.
+JSON_CHUNK_SIZE = 64 * 1024
+
+STAGING_TABLE = """
+    CREATE TEMP TABLE IF NOT EXISTS student_import_staging (
+        row_number INTEGER NOT NULL,
+        student_id VARCHAR(20) NOT NULL,
+        firstname VARCHAR(50) NOT NULL,
+        lastname VARCHAR(50) NOT NULL,
+        program_code VARCHAR(10) NOT NULL,
+        year INTEGER NOT NULL,
+        gender VARCHAR(10) NOT NULL
+    ) ON COMMIT DELETE ROWS
+"""
+
+MERGE_SQL = {
+    'insert': """
+        INSERT INTO student_table (student_id, firstname, lastname, program_code, year, gender)
+        SELECT student_id, firstname, lastname, program_code, year, gender
+        FROM student_import_staging
+        ON CONFLICT (student_id) DO NOTHING
+        RETURNING student_id, TRUE
+    """,
+    'upsert': """
+        INSERT INTO student_table (student_id, firstname, lastname, program_code, year, gender)
+        SELECT student_id, firstname, lastname, program_code, year, gender
+        FROM student_import_staging
+        ON CONFLICT (student_id) DO UPDATE
+        SET firstname = EXCLUDED.firstname,
+            lastname = EXCLUDED.lastname,
+            program_code = EXCLUDED.program_code,
+            year = EXCLUDED.year,
+            gender = EXCLUDED.gender
+        RETURNING student_id, (xmax = 0)
+    """,
+}
+
+
+class InvalidImport(ValueError):
+    pass
+
+
+def detect_format(filename=None, content_type=None):
+    content_type = (content_type or '').split(';')[0].strip().lower()
+    name = (filename or '').lower()
+    if content_type == 'application/x-ndjson' or name.endswith(('.ndjson', '.jsonl')):
+        return 'ndjson'
+    if content_type == 'application/json' or name.endswith('.json'):
+        return 'json'
+    return 'csv'
+
+
+def read_rows(stream, fmt='csv'):
+    """Yields one dict per input row from a binary or text stream."""
+    if fmt not in FORMATS:
+        raise InvalidImport(f"Unsupported format '{fmt}'")
+
+    text = stream if isinstance(stream, io.TextIOBase) else io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+    if fmt == 'csv':
+        reader = csv.DictReader(text)
+        missing = [c for c in REQUIRED if c not in (reader.fieldnames or [])]
+        if missing:
+            raise InvalidImport(f"CSV header is missing columns: {', '.join(missing)}")
+        yield from reader
+    elif fmt == 'ndjson':
+        for line in text:
+            if line.strip():
+                yield _parse_json_line(line)
+    else:
+        yield from _read_json_array(text)
+
+
+def _read_json_array(text, chunk_size=None):
+    """
+    Yields the elements of a top-level JSON array, decoding one element at a
+    time from chunk_size-character reads, so memory holds a chunk and the
+    element being decoded rather than the whole upload.
+
+    A syntax error after the first element cannot be resynchronised, so it
+    ends the import as one row error; the rows before it are still imported
+    and reported, as with NDJSON.
+    """
+    chunk_size = chunk_size or JSON_CHUNK_SIZE
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = '', 0, False
+
+    def fill():
+        nonlocal buffer, pos, eof
+        chunk = text.read(chunk_size)
+        if not chunk:
+            eof = True
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+    def next_char():
+        """The next non-whitespace character (not consumed), or '' at the end of input."""
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos].isspace():
+                pos += 1
+            if pos < len(buffer) or eof:
+                return buffer[pos:pos + 1]
+            fill()
+
+    if next_char() != '[':
+        raise InvalidImport("JSON import must be an array of student objects")
+    pos += 1
+
+    if next_char() == ']':
+        pos += 1
+    else:
+        while True:
+            next_char()
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+                # A value ending at the edge of the buffer may be a number cut short by the read.
+                if end == len(buffer) and not eof:
+                    raise ValueError("value may continue in the next chunk")
+            except ValueError as e:
+                if not eof:
+                    fill()
+                    continue
+                yield {'__error__': f"Invalid JSON: {e}"}
+                return
+            pos = end
+            yield value
+
+            separator = next_char()
+            pos += 1
+            if separator == ']':
+                break
+            if separator != ',':
+                yield {'__error__': "Invalid JSON: expected ',' or ']' after an array element"}
+                return
+
+    if next_char():
+        yield {'__error__': "Invalid JSON: unexpected data after the array"}
+
+
+def _parse_json_line(line):
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return {'__error__': f"Invalid JSON: {e}"}
+
+
+def validate_row(row, program_codes):
+    """Returns (clean_tuple, None) or (None, error_message)."""
+    if not isinstance(row, dict):
+        return None, "Row must be an object"
+    if '__error__' in row:
+        return None, row['__error__']
+
+    values = {}
+    for column in COLUMNS:
+        value = row.get(column)
+        values[column] = str(value).strip() if value is not None else ''
+
+    missing = [c for c in REQUIRED if not values[c]]
+    if missing:
+        return None, f"Missing required fields: {', '.join(missing)}"
+
+    for column, max_length in MAX_LENGTHS.items():
+        if len(values[column]) > max_length:
+            return None, f"{column} is longer than {max_length} characters"
+
+    if values['program_code'] not in program_codes:
+        return None, f"Program code '{values['program_code']}' does not exist"
+
+    try:
+        year = int(values['year'])
+    except ValueError:
+        return None, f"Invalid year '{values['year']}'"
+    if year not in YEARS:
+        return None, f"Year must be between {YEARS[0]} and {YEARS[-1]}"
+
+    gender = values['gender'].capitalize()
+    if gender not in GENDERS:
+        return None, f"Gender must be one of {', '.join(GENDERS)}"
+
+    return (values['student_id'], values['firstname'], values['lastname'], values['program_code'], year, gender), None
+
+
+def _copy_buffer(batch):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row_number, values in batch:
+        writer.writerow((row_number,) + values)
+    buffer.seek(0)
+    return buffer
+
+
+class StudentImporter:
+    """
+    Streams rows into student_table in batches of batch_size.
+
+    mode='insert' reports existing student IDs as errors; mode='upsert'
+    overwrites them. Each batch is its own transaction, so a failure in one
+    batch (for example a program deleted mid-import) does not roll back the
+    batches already merged.
+    """
+
+    def __init__(self, mode='insert', batch_size=IMPORT_BATCH_SIZE, max_errors=IMPORT_MAX_ERRORS):
+        if mode not in MODES:
+            raise InvalidImport(f"Unsupported mode '{mode}', expected one of {', '.join(MODES)}")
+        self.mode = mode
+        self.batch_size = max(1, batch_size)
+        self.max_errors = max_errors
+        self.report = {
+            "mode": mode,
+            "total": 0,
+            "inserted": 0,
+            "updated": 0,
+            "failed": 0,
+            "errors": [],
+            "errors_truncated": False,
+        }
+
+    def _error(self, row_number, student_id, message):
+        self.report["failed"] += 1
+        if len(self.report["errors"]) < self.max_errors:
+            self.report["errors"].append({"row": row_number, "student_id": student_id, "error": message})
+        else:
+            self.report["errors_truncated"] = True
+
+    def run(self, rows):
+        started = time.perf_counter()
+        program_codes = program_reference.codes()
+        seen = set()
+        batch = []
+
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute(STAGING_TABLE)
+                conn.commit()
+
+                for row_number, row in enumerate(rows, start=1):
+                    self.report["total"] += 1
+                    values, error = validate_row(row, program_codes)
+                    student_id = values[0] if values else (row.get('student_id') if isinstance(row, dict) else None)
+
+                    if error:
+                        self._error(row_number, student_id, error)
+                        continue
+                    if student_id in seen:
+                        self._error(row_number, student_id, "Duplicate student ID in import")
+                        continue
+
+                    seen.add(student_id)
+                    batch.append((row_number, values))
+                    if len(batch) >= self.batch_size:
+                        self._merge(conn, cur, batch)
+                        batch = []
+
+                if batch:
+                    self._merge(conn, cur, batch)
+            finally:
+                cur.close()
+
+        self.report["seconds"] = round(time.perf_counter() - started, 3)
+        return self.report
+
+    def _merge(self, conn, cur, batch):
+        try:
+            cur.copy_expert(
+                "COPY student_import_staging (row_number, student_id, firstname, lastname, program_code, year, gender) "
+                "FROM STDIN WITH (FORMAT csv)",
+                _copy_buffer(batch)
+            )
+            cur.execute(MERGE_SQL[self.mode])
+            merged = {student_id: inserted for student_id, inserted in cur.fetchall()}
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            # e.g. a program deleted since the codes were read; the FK names the cause.
+            message = constraint_error(e).message if isinstance(e, psycopg2.IntegrityError) else e
+            for row_number, values in batch:
+                self._error(row_number, values[0], f"Batch failed: {message}")
+            return
+
+        for row_number, values in batch:
+            inserted = merged.get(values[0])
+            if inserted is None:
+                self._error(row_number, values[0], "Student ID already exists")
+            elif inserted:
+                self.report["inserted"] += 1
+            else:
+                self.report["updated"] += 1
+
+
+def import_students(stream, fmt='csv', mode='insert', batch_size=IMPORT_BATCH_SIZE, max_errors=IMPORT_MAX_ERRORS):
+    importer = StudentImporter(mode, batch_size, max_errors)
+    return importer.run(read_rows(stream, fmt))
+
+
+def main():
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Bulk-import students from CSV, JSON or NDJSON.")
+    parser.add_argument("file")
+    parser.add_argument("--format", choices=FORMATS, help="defaults to the file extension")
+    parser.add_argument("--mode", choices=MODES, default="insert")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    parser.add_argument("--max-errors", type=int, default=IMPORT_MAX_ERRORS)
+    args = parser.parse_args()
+
+    with open(args.file, "rb") as f:
+        report = import_students(f, args.format or detect_format(args.file), args.mode, args.batch_size, args.max_errors)
+
+    for error in report["errors"]:
+        print(f"row {error['row']} ({error['student_id']}): {error['error']}")
+    print(f"{report['total']} rows: {report['inserted']} inserted, {report['updated']} updated, "
+          f"{report['failed']} failed in {report['seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+import os
+import select
+import threading
+import time
+from email.utils import formatdate
+from functools import wraps
+from os import getenv
+
+from flask import request, make_response
+
+# Without a working LISTEN connection, how long a snapshot of the counters is trusted.
+TABLE_VERSION_MAX_AGE = float(getenv('TABLE_VERSION_MAX_AGE', '1'))
+
+VERSIONS_QUERY = "SELECT table_name, version, EXTRACT(EPOCH FROM modified_at) FROM table_versions"
+
+
+class PostgresVersionStore:
+    """
+    Table version counters kept in PostgreSQL (migrations 0009 and 0010).
+    Triggers on the tracked tables bump them in the writing transaction and
+    NOTIFY table_versions on commit, so every worker sees the same versions,
+    including after writes that bypass the models.
+
+    Each process holds a snapshot of the counters in memory, so answering a
+    conditional GET costs no database I/O. A listener thread with its own
+    connection reloads the snapshot on every notification; while it is not
+    connected, the snapshot is reloaded once it is older than max_age.
+    bump() drops the snapshot so this process's own writes show at once.
+    """
+
+    def __init__(self, channel="table_versions", max_age=TABLE_VERSION_MAX_AGE, reconnect_delay=5.0):
+        self.channel = channel
+        self.max_age = max_age
+        self.reconnect_delay = reconnect_delay
+        self._lock = threading.Lock()
+        self._versions = {}
+        self._loaded_at = None
+        self._listening = False
+        self._loads = 0
+        self._pid = None
+        self._thread = None
+        self._stop = None
+
+    def bump(self, *tables):
+        with self._lock:
+            self._loaded_at = None
+
+    def get(self, tables):
+        self._ensure_listener()
+        with self._lock:
+            fresh = self._loaded_at is not None and (
+                self._listening or time.monotonic() - self._loaded_at < self.max_age
+            )
+            versions = self._versions
+        if not fresh or any(table not in versions for table in tables):
+            versions = self._reload()
+
+        missing = [table for table in tables if table not in versions]
+        if missing:
+            raise LookupError(f"No version tracked for {missing}; is migration 0009 applied?")
+        return [versions[table] for table in tables]
+
+    def _reload(self, conn=None):
+        from app.db import get_db_connection
+
+        if conn is None:
+            with get_db_connection() as pooled:
+                return self._reload(pooled)
+
+        cur = conn.cursor()
+        try:
+            cur.execute(VERSIONS_QUERY)
+            rows = cur.fetchall()
+        finally:
+            cur.close()
+        with self._lock:
+            versions = dict(self._versions)
+            for name, version, modified in rows:
+                # A reload that raced a newer one must not move a counter backwards.
+                if name not in versions or int(versions[name][0]) <= version:
+                    versions[name] = (str(version), float(modified))
+            self._versions = versions
+            self._loaded_at = time.monotonic()
+            self._loads += 1
+            return versions
+
+    def _ensure_listener(self):
+        # Like the DB pool, the listener belongs to the process that started it (see serve.py).
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._listening = False
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._listen, args=(self._stop,), name="table-versions", daemon=True)
+            self._thread.start()
+
+    def _listen(self, stop):
+        from psycopg2 import extensions
+        from app.db import connect
+
+        while not stop.is_set():
+            conn = None
+            try:
+                conn = connect()
+                conn.set_isolation_level(extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                cur = conn.cursor()
+                cur.execute(f"LISTEN {self.channel}")
+                cur.close()
+                # Listening before loading, so no commit falls between the two.
+                self._reload(conn)
+                with self._lock:
+                    self._listening = True
+                while not stop.is_set():
+                    if not select.select([conn], [], [], 1.0)[0]:
+                        continue
+                    conn.poll()
+                    if conn.notifies:
+                        conn.notifies.clear()
+                        self._reload(conn)
+            except Exception as e:
+                if not stop.is_set():
+                    print(f"Table version listener failed, retrying in {self.reconnect_delay}s: {e}")
+            finally:
+                with self._lock:
+                    self._listening = False
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+            stop.wait(self.reconnect_delay)
+
+    def close(self):
+        """Stops this process's listener; serve.py calls it before forking and when a worker exits."""
+        with self._lock:
+            stop, thread, owned = self._stop, self._thread, self._pid == os.getpid()
+            self._pid = None
+            self._listening = False
+            self._loaded_at = None
+        if stop is not None and owned:
+            stop.set()
+            thread.join(timeout=5)
+
+    def stats(self):
+        with self._lock:
+            return {"backend": "postgres", "listening": self._listening, "loads": self._loads}
+
+
+table_versions = PostgresVersionStore()
+
+
+def bump(*tables):
+    """Marks tables as changed; call after the write has been committed."""
+    try:
+        table_versions.bump(*tables)
+    except Exception as e:
+        print(f"Could not bump table version for {tables}: {e}")
+
+
+def conditional(*tables):
+    """
+    Adds ETag / Last-Modified validators derived from the version counters
+    of tables, and answers a matching If-None-Match or If-Modified-Since
+    with 304 before the view (and the database) is touched.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                versions = table_versions.get(tables)
+            except Exception as e:
+                print(f"Could not read table versions for {tables}: {e}")
+                return view(*args, **kwargs)
+
+            etag = "-".join(version for version, _ in versions)
+            last_modified = int(max(modified for _, modified in versions))
+
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains_weak(etag)
+            else:
+                since = request.if_modified_since
+                not_modified = since is not None and since.timestamp() >= last_modified
+
+            if not_modified:
+                response = make_response("", 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            response.headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+            response.headers["Cache-Control"] = "no-cache"
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,192 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from os import getenv
+
+from app.models.upload_job_model import UploadJobModel
+from app.services.image_processing import make_thumbnails, InvalidImage
+from app.services.storage import get_storage
+
+# A child of the Flask app's logger ("app"), so it shares its handlers.
+logger = logging.getLogger(__name__)
+
+
+class UploadQueue:
+    """
+    Runs avatar uploads on a background thread pool.
+
+    submit() records a pending job in upload_job_table and returns its id
+    straight away; the worker resizes the image into its thumbnail
+    variants, uploads each one to the configured storage with exponential
+    backoff between attempts, then writes the URLs onto the target record
+    through the handler registered for its target_type. Handlers are
+    called as handler(target_id, url, variant_urls).
+
+    The uploaded bytes are also stored on the job row until it finishes.
+    If the process dies first (a restart, a recycled serve.py worker), the
+    job stops being updated; every recover_interval seconds each process
+    claims jobs untouched for stale_after seconds and runs them again.
+    shutdown() lets queued jobs finish, so a graceful stop loses nothing.
+    """
+
+    def __init__(self, max_workers=4, max_attempts=3, backoff=1.0, stale_after=300.0, recover_interval=60.0):
+        self.max_workers = max_workers
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.stale_after = stale_after
+        self.recover_interval = recover_interval
+        self._handlers = {}
+        self._executor = None
+        self._recovery = None
+        self._lock = threading.Lock()
+
+    def register(self, target_type, handler):
+        self._handlers[target_type] = handler
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="avatar-upload")
+            return self._executor
+
+    def submit(self, target_type, target_id, data, filename, content_type=None):
+        if target_type not in self._handlers:
+            raise ValueError(f"No upload handler registered for '{target_type}'")
+
+        job_id = UploadJobModel.create(target_type, target_id, data, filename, content_type)
+        self._get_executor().submit(self._run, job_id, target_type, target_id, data, filename, content_type)
+        return job_id
+
+    def start(self):
+        """Starts this process's recovery thread (call it in each serve.py worker, like the hashing pool)."""
+        with self._lock:
+            if self._recovery is not None or self.recover_interval <= 0:
+                return
+            stop = threading.Event()
+            thread = threading.Thread(target=self._recover_loop, args=(stop,), name="avatar-upload-recovery", daemon=True)
+            self._recovery = (stop, thread)
+        thread.start()
+
+    def _recover_loop(self, stop):
+        while True:
+            try:
+                self.recover()
+            except Exception:
+                logger.exception("Could not recover stale upload jobs")
+            if stop.wait(self.recover_interval):
+                return
+
+    def recover(self):
+        """Runs again every job whose process died, or fails it when that is pointless. Returns the number claimed."""
+        jobs = UploadJobModel.claim_stale(self.stale_after)
+        for job in jobs:
+            if job["payload"] is None:
+                self._fail(job["id"], "Upload was lost when the server restarted; please upload again")
+            elif job["attempts"] >= self.max_attempts:
+                self._fail(job["id"], f"Gave up after {job['attempts']} attempts")
+            elif job["target_type"] not in self._handlers:
+                self._fail(job["id"], f"No upload handler registered for '{job['target_type']}'")
+            else:
+                logger.warning("Resuming upload job %s left unfinished by another process", job["id"])
+                self._get_executor().submit(
+                    self._run, job["id"], job["target_type"], job["target_id"],
+                    job["payload"], job["filename"], job["content_type"], job["attempts"]
+                )
+        return len(jobs)
+
+    def _run(self, job_id, target_type, target_id, data, filename, content_type, attempts=0):
+        # Runs on the executor, where an escaping exception would only land in
+        # an unread Future and leave the job 'pending' until recovered.
+        try:
+            self._process(job_id, target_type, target_id, data, filename, content_type, attempts)
+        except Exception as e:
+            logger.exception("Upload job %s failed", job_id)
+            self._fail(job_id, e)
+
+    def _process(self, job_id, target_type, target_id, data, filename, content_type, attempts=0):
+        try:
+            variants = make_thumbnails(data)
+        except InvalidImage as e:
+            self._fail(job_id, e)
+            return
+
+        urls = {}
+        # Counted across a resumed job's earlier runs too.
+        attempts = [attempts]
+        try:
+            # Variants already stored are kept across attempts, so a retry only uploads what is missing.
+            self._retry(job_id, attempts, lambda: self._store_variants(variants, filename, content_type, urls))
+            url = urls.get('lg') or urls.get('original')
+            variant_urls = urls if 'original' not in urls else None
+            self._retry(job_id, attempts, lambda: self._handlers[target_type](target_id, url, variant_urls))
+        except Exception as e:
+            # LookupError (the record was deleted) is not retried; nothing will ever point at these files.
+            self._discard(urls)
+            self._fail(job_id, e)
+            return
+
+        UploadJobModel.update_status(job_id, 'done', url=url)
+
+    def _retry(self, job_id, attempts, step):
+        """Runs step with exponential backoff, up to max_attempts for the whole job; LookupError is final."""
+        while True:
+            attempts[0] += 1
+            UploadJobModel.update_status(job_id, 'processing', attempts=attempts[0])
+            try:
+                return step()
+            except LookupError:
+                raise
+            except Exception as e:
+                if attempts[0] >= self.max_attempts:
+                    raise
+                logger.warning("Upload job %s attempt %s failed: %s", job_id, attempts[0], e)
+                time.sleep(self.backoff * (2 ** (attempts[0] - 1)))
+
+    def _fail(self, job_id, error):
+        try:
+            UploadJobModel.update_status(job_id, 'failed', error=str(error))
+        except Exception:
+            logger.exception("Could not record failure for upload job %s", job_id)
+
+    def _store_variants(self, variants, filename, content_type, urls):
+        storage = get_storage()
+        stem = os.path.splitext(os.path.basename(filename or "avatar"))[0]
+        for name, (variant, variant_type) in variants.items():
+            if name in urls:
+                continue
+            if name == 'original':
+                urls[name] = storage.upload(variant, filename, content_type)
+            else:
+                urls[name] = storage.upload(variant, f"{stem}_{name}.jpg", variant_type)
+        return urls
+
+    def _discard(self, urls):
+        storage = get_storage()
+        for url in urls.values():
+            try:
+                storage.delete(url)
+            except Exception:
+                logger.exception("Could not delete orphaned avatar %s", url)
+
+    def shutdown(self, wait=True):
+        """Stops recovery and, with wait, lets every queued job finish first."""
+        with self._lock:
+            recovery, self._recovery = self._recovery, None
+            executor, self._executor = self._executor, None
+        if recovery is not None:
+            stop, thread = recovery
+            stop.set()
+            thread.join(timeout=5)
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+upload_queue = UploadQueue(
+    max_workers=int(getenv('UPLOAD_WORKERS', '4')),
+    max_attempts=int(getenv('UPLOAD_MAX_ATTEMPTS', '3')),
+    backoff=float(getenv('UPLOAD_BACKOFF', '1.0')),
+    stale_after=float(getenv('UPLOAD_STALE_AFTER', '300')),
+    recover_interval=float(getenv('UPLOAD_RECOVER_INTERVAL', '60')),
+)
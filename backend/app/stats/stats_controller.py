@@ -1,17 +1,28 @@
 from flask import Blueprint, jsonify
-from app.models.student_model import StudentModel
-from app.models.college_model import CollegeModel
-from app.models.program_model import ProgramModel
+from app.models.stats_model import StatsModel
+from app.models.program_model import program_reference
+from app.db import get_pool_stats
+from app.services.cache import get_cache_stats
+from app.services.table_versions import table_versions
 
 stats_bp = Blueprint('stats', __name__, url_prefix='/stats')
 
 @stats_bp.route('/', methods=['GET'])
 def get_dashboard_stats():
     try:
-        return jsonify({
-            "total_students": StudentModel.get_count(),
-            "total_colleges": CollegeModel.get_count(),
-            "total_programs": ProgramModel.get_count()
-        }), 200
+        return jsonify(StatsModel.get_dashboard()), 200
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+@stats_bp.route('/pool', methods=['GET'])
+def get_pool_metrics():
+    return jsonify(get_pool_stats()), 200
+
+@stats_bp.route('/cache', methods=['GET'])
+def get_cache_metrics():
+    stats = get_cache_stats()
+    stats["reference"] = {
+        "program_table": program_reference.stats()
+    }
+    stats["table_versions"] = table_versions.stats()
+    return jsonify(stats), 200
\ No newline at end of file
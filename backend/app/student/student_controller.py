@@ -1,21 +1,57 @@
-from flask import Blueprint, jsonify, request
-from app.models.student_model import StudentModel
-from app.models.program_model import ProgramModel
-from app.services.cloudinary_service import upload_image
+import csv
+import io
+import json
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from app.models.student_model import StudentModel, InvalidBulkRequest, BULK_FIELDS
+from app.models.rows import STUDENT_ROW
+from app.models.constraints import ConstraintViolation
+from app.models.pagination import InvalidCursor
+from app.models.upload_job_model import UploadJobModel
+from app.services.upload_queue import upload_queue
+from app.services.image_processing import validate_image, InvalidImage
+from app.services.student_import import import_students, detect_format, InvalidImport
+from app.services.serialization import json_array_chunks
+from app.services.rate_limit import rate_cost, LIST_COST, FULL_TABLE_COST
 
 student_bp = Blueprint('student', __name__, url_prefix='/student')
 
+def list_cost(req):
+    # Without page/cursor and limit the whole table is streamed.
+    if req.args.get('limit') is None or (req.args.get('page') is None and req.args.get('cursor') is None):
+        return FULL_TABLE_COST
+    return LIST_COST
+
 @student_bp.route('/', methods=['GET'])
+@rate_cost(list_cost)
 def get_students():
     page = request.args.get('page', type=int)
     limit = request.args.get('limit', type=int)
     sort_by = request.args.get('sort_by', 'student_id')
     sort_order = request.args.get('sort_order', 'asc')
     search = request.args.get('search', '')
+    total_mode = request.args.get('total', 'exact')
+    fields = [f for f in request.args.get('fields', '').split(',') if f]
+    cursor = request.args.get('cursor')
+
+    filters = parse_student_filters(request.args)
+
+    if cursor is not None and limit is not None:
+        return get_cursor_student_handler(limit, sort_by, sort_order, search, filters, cursor)
+
+    if page is not None and limit is not None:
+        return get_paginated_student_handler(page, limit, sort_by, sort_order, search, filters, total_mode, fields)
+
+    # The whole table: stream it as one JSON array instead of building every row first.
+    try:
+        rows = StudentModel.stream(sort_by, sort_order, search, filters, columns=STUDENT_ROW.columns)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    return Response(stream_with_context(json_array_chunks(STUDENT_ROW, rows)), mimetype='application/json')
 
-    program_filter = request.args.get('program', '')
-    year_filter = request.args.get('year', '')
-    gender_filter = request.args.get('gender', '')
+def parse_student_filters(args):
+    program_filter = args.get('program', '')
+    year_filter = args.get('year', '')
+    gender_filter = args.get('gender', '')
 
     filters = {}
     
@@ -28,31 +64,96 @@ def get_students():
     if gender_filter:
         filters['gender'] = gender_filter.split(',')
 
-    if page is not None and limit is not None:
-        return get_paginated_student_handler(page, limit, sort_by, sort_order, search, filters)
-
-    try:
-        students = StudentModel.get_all()
-        return jsonify(students)
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    return filters
 
-def get_paginated_student_handler(page, limit, sort_by, sort_order, search, filters):
+def get_paginated_student_handler(page, limit, sort_by, sort_order, search, filters, total_mode='exact', fields=None):
     try:
         page = max(1, page)
         limit = max(1, limit)
 
-        pagination_data = StudentModel.by_pagination(page, limit, sort_by, sort_order, search, filters)
+        pagination_data = StudentModel.by_pagination(page, limit, sort_by, sort_order, search, filters, total_mode, fields)
         
         return jsonify(pagination_data), 200
     except Exception as e:
         print(f"Error fetching paginated students: {e}")
         return jsonify({"error": str(e)}), 500
 
+def get_cursor_student_handler(limit, sort_by, sort_order, search, filters, cursor):
+    try:
+        limit = max(1, limit)
+        pagination_data = StudentModel.by_cursor(limit, sort_by, sort_order, search, filters, cursor)
+        return jsonify(pagination_data), 200
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(f"Error fetching students by cursor: {e}")
+        return jsonify({"error": str(e)}), 500
+
+EXPORT_CHUNK_ROWS = 500
+
+@student_bp.route('/export', methods=['GET'])
+@student_bp.route('/export.<string:fmt>', methods=['GET'])
+@rate_cost(FULL_TABLE_COST)
+def export_students(fmt=None):
+    """
+    Streams every student matching the list's search/filter/sort parameters
+    as CSV (default) or NDJSON, without building the result in memory.
+    Columns are StudentModel.EXPORT_COLUMNS, the same fields the API returns.
+    """
+    fmt = fmt or request.args.get('format', 'csv')
+    if fmt not in ('csv', 'ndjson'):
+        return jsonify({"error": "format must be csv or ndjson"}), 400
+
+    try:
+        rows = StudentModel.stream(
+            request.args.get('sort_by', 'student_id'),
+            request.args.get('sort_order', 'asc'),
+            request.args.get('search', ''),
+            parse_student_filters(request.args),
+        )
+    except Exception as e:
+        print(f"Export Error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+    if fmt == 'csv':
+        body, mimetype = _csv_chunks(rows), 'text/csv'
+    else:
+        body, mimetype = _ndjson_chunks(rows), 'application/x-ndjson'
+
+    return Response(
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename=students.{fmt}"}
+    )
+
+def _csv_chunks(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(StudentModel.EXPORT_COLUMNS)
+    for i, row in enumerate(rows, start=1):
+        # pfp_urls is a JSON object; keep it as JSON text in its cell.
+        writer.writerow([json.dumps(value) if isinstance(value, dict) else value for value in row])
+        if i % EXPORT_CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+def _ndjson_chunks(rows):
+    chunk = []
+    for row in rows:
+        chunk.append(json.dumps(dict(zip(StudentModel.EXPORT_COLUMNS, row))))
+        if len(chunk) == EXPORT_CHUNK_ROWS:
+            yield "\n".join(chunk) + "\n"
+            chunk = []
+    if chunk:
+        yield "\n".join(chunk) + "\n"
+
 @student_bp.route('/<string:student_id>', methods=['GET'])
 def get_student(student_id):
     student = StudentModel.get_by_id(student_id)
     if student:
+        student['avatar_upload'] = UploadJobModel.get_pending('student', student['id'])
         return jsonify(student)
     return jsonify({"error": "Student not found"}), 404
 
@@ -64,80 +165,204 @@ def add_student():
     if not data.get('student_id') or not data.get('firstname') or not data.get('lastname'):
         return jsonify({"error": "Missing required fields"}), 400
 
-    if StudentModel.get_by_id(data.get('student_id')):
-        return jsonify({"error": "Student ID already exists"}), 409
-
-    if not ProgramModel.get_by_code(data.get('program_code')):
-         return jsonify({"error": "Program code does not exist"}), 400
-
-    pfp_url = None
+    avatar = None
     if file:
+        avatar = file.read()
         try:
-            print(f"Uploading file: {file.filename}") 
-            pfp_url = upload_image(file) 
-        except Exception as e:
-            print(f"Upload failed: {e}")
+            validate_image(avatar)
+        except InvalidImage as e:
+            return jsonify({"error": str(e)}), 400
+
+    try:
+        year = int(data['year']) if data.get('year') else None
+    except ValueError:
+        return jsonify({"error": "Year must be a number"}), 400
 
     try:
         new_student = StudentModel.add(
             data['student_id'],
             data['firstname'],
             data['lastname'],
-            data['program_code'],
-            int(data['year']),
-            data['gender'],
-            pfp_url 
+            data.get('program_code'),
+            year,
+            data.get('gender'),
+            None
         )
+        if file:
+            new_student['avatar_upload'] = queue_avatar_upload(new_student['id'], file, avatar)
         return jsonify(new_student), 201
+    except ConstraintViolation as e:
+        return jsonify({"error": e.message}), e.status
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@student_bp.route('/import', methods=['POST'])
+@rate_cost(FULL_TABLE_COST)
+def import_student_file():
+    """
+    Bulk import from a multipart 'file' upload or a raw CSV / JSON / NDJSON
+    body. ?mode=upsert overwrites existing students instead of reporting them.
+    """
+    file = request.files.get('file')
+    if file:
+        stream, fmt = file.stream, detect_format(file.filename, file.mimetype)
+    else:
+        stream, fmt = request.stream, detect_format(content_type=request.content_type)
+
+    fmt = request.args.get('format', fmt)
+    mode = request.args.get('mode', 'insert')
+
+    try:
+        report = import_students(stream, fmt, mode)
+        return jsonify(report), 200
+    except InvalidImport as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(f"Import Error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+def parse_bulk_selection(data):
+    """
+    The students a bulk request targets: {"ids": [...]} or the list's
+    {"search": ..., "filters": {"program": [...], "year": [...], "gender": [...]}}.
+    Filter values may also be comma-separated strings, as in the query string.
+    """
+    if data.get('ids') is not None:
+        if not isinstance(data['ids'], list):
+            raise InvalidBulkRequest("ids must be a list of student IDs")
+        return {"ids": data['ids']}
+
+    filters = data.get('filters') or {}
+    if not isinstance(filters, dict):
+        raise InvalidBulkRequest("filters must be an object")
+    args = {key: ",".join(map(str, value)) if isinstance(value, list) else str(value) for key, value in filters.items()}
+    return {"search": data.get('search', ''), "filters": parse_student_filters(args)}
+
+def bulk_cost(req):
+    # A filter selection can touch the whole table; an ID list costs by its length.
+    data = req.get_json(silent=True)
+    ids = data.get('ids') if isinstance(data, dict) else None
+    if isinstance(ids, list):
+        return min(FULL_TABLE_COST, LIST_COST + len(ids) // 100)
+    return FULL_TABLE_COST
+
+def run_bulk(operation):
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Expected a JSON object"}), 400
+
+    try:
+        return jsonify(operation(parse_bulk_selection(data), data)), 200
+    except InvalidBulkRequest as e:
+        return jsonify({"error": str(e)}), 400
+    except ConstraintViolation as e:
+        return jsonify({"error": e.message}), e.status
     except Exception as e:
+        print(f"Bulk Error: {e}")
         return jsonify({"error": str(e)}), 500
 
+def parse_bulk_changes(changes):
+    """
+    "changes" for a bulk update: an object of BULK_FIELDS, year a whole
+    number and the rest non-empty strings. Ranges and codes are left to the
+    table's constraints.
+    """
+    if not isinstance(changes, dict):
+        raise InvalidBulkRequest("changes must be an object")
+    unknown = [field for field in changes if field not in BULK_FIELDS]
+    if unknown:
+        raise InvalidBulkRequest(f"Cannot bulk update {', '.join(unknown)}; allowed: {', '.join(BULK_FIELDS)}")
+    for field, value in changes.items():
+        if value is None:
+            continue
+        if field == 'year':
+            if not isinstance(value, int) or isinstance(value, bool):
+                raise InvalidBulkRequest("year must be a whole number")
+        elif not isinstance(value, str) or not value.strip():
+            raise InvalidBulkRequest(f"{field} must be a non-empty string")
+    return changes
+
+@student_bp.route('/bulk/update', methods=['POST'])
+@rate_cost(bulk_cost)
+def bulk_update_students():
+    """Body: a selection plus "changes": {field: value}. All-or-nothing: one bad value fails the whole batch."""
+    return run_bulk(lambda selection, data: StudentModel.bulk_update(selection, parse_bulk_changes(data.get('changes'))))
+
+@student_bp.route('/bulk/promote', methods=['POST'])
+@rate_cost(bulk_cost)
+def bulk_promote_students():
+    """Body: a selection plus optional "by" (default 1; negative holds students back)."""
+    def promote(selection, data):
+        by = data.get('by', 1)
+        if not isinstance(by, int) or isinstance(by, bool) or by == 0:
+            raise InvalidBulkRequest("by must be a non-zero whole number of years")
+        return StudentModel.promote(selection, by)
+    return run_bulk(promote)
+
+@student_bp.route('/bulk/move', methods=['POST'])
+@rate_cost(bulk_cost)
+def bulk_move_students():
+    """Body: a selection plus "program_code"."""
+    def move(selection, data):
+        if not data.get('program_code'):
+            raise InvalidBulkRequest("program_code is required")
+        return StudentModel.move_program(selection, data['program_code'])
+    return run_bulk(move)
+
+@student_bp.route('/bulk/delete', methods=['POST'])
+@rate_cost(bulk_cost)
+def bulk_delete_students():
+    return run_bulk(lambda selection, data: StudentModel.bulk_delete(selection))
 
 @student_bp.route('/<string:student_id>', methods=['PUT'])
 def update_student(student_id):
     data = request.form
     file = request.files.get('avatar')
     
-    current_student = StudentModel.get_by_id(student_id)
-    if not current_student:
-        return jsonify({"error": "Student not found"}), 404
-
-    new_id = data.get('student_id', current_student['student_id'])
-    if new_id != current_student['student_id'] and StudentModel.get_by_id(new_id):
-        return jsonify({"error": f"Student ID '{new_id}' already exists"}), 409
-
-    if 'program_code' in data:
-         new_program = data['program_code']
-         if not ProgramModel.get_by_code(new_program):
-             return jsonify({"error": f"Program code '{new_program}' does not exist"}), 400
-
-    pfp_url = current_student.get('pfp_url') 
-    
+    avatar = None
     if file:
-        print(f"Uploading new avatar for {student_id}...")
+        avatar = file.read()
         try:
-            uploaded_url = upload_image(file)
-            if uploaded_url:
-                pfp_url = uploaded_url 
-        except Exception as e:
-            print(f"Upload failed: {e}")
+            validate_image(avatar)
+        except InvalidImage as e:
+            return jsonify({"error": str(e)}), 400
+
+    try:
+        year = int(data['year']) if data.get('year') else None
+    except ValueError:
+        return jsonify({"error": "Year must be a number"}), 400
 
     try:
         updated_student = StudentModel.update(
-            student_id,                                            
-            data.get('student_id', current_student['student_id']), 
-            data.get('firstname', current_student['firstname']),
-            data.get('lastname', current_student['lastname']),
-            data.get('program_code', current_student['program_code']),
-            int(data.get('year', current_student['year'])),
-            data.get('gender', current_student['gender']),
-            pfp_url 
+            student_id,
+            data.get('student_id'),
+            data.get('firstname'),
+            data.get('lastname'),
+            data.get('program_code'),
+            year,
+            data.get('gender')
         )
+        if not updated_student:
+            return jsonify({"error": "Student not found"}), 404
+        if file:
+            updated_student['avatar_upload'] = queue_avatar_upload(updated_student['id'], file, avatar)
         return jsonify(updated_student), 200
+    except ConstraintViolation as e:
+        return jsonify({"error": e.message}), e.status
     except Exception as e:
         print(f"Update Error: {e}")
         return jsonify({"error": str(e)}), 500
 
+def queue_avatar_upload(id, file, data):
+    """Hands the avatar to the background upload queue; the record keeps its current pfp_url until the job finishes."""
+    try:
+        job_id = upload_queue.submit('student', id, data, file.filename, file.mimetype)
+        return {"job_id": job_id, "status": "pending"}
+    except Exception as e:
+        print(f"Could not queue avatar upload: {e}")
+        return {"job_id": None, "status": "failed"}
+
 @student_bp.route('/<string:student_id>', methods=['DELETE'])
 def delete_student(student_id):
     try:
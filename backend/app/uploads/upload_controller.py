@@ -0,0 +1,14 @@
+from flask import Blueprint, jsonify
+from app.models.upload_job_model import UploadJobModel
+
+upload_bp = Blueprint('uploads', __name__, url_prefix='/uploads')
+
+@upload_bp.route('/<int:job_id>', methods=['GET'])
+def get_upload_status(job_id):
+    try:
+        job = UploadJobModel.get_by_id(job_id)
+        if job:
+            return jsonify(job), 200
+        return jsonify({"error": "Upload job not found"}), 404
+    except Exception as e:
+        return jsonify({"error": f"Database error: {e}"}), 500
@@ -1,20 +1,25 @@
 from flask import Blueprint, jsonify, request
 from flask_login import login_user, logout_user, login_required, current_user
 from app.models.user_model import Users
+from app.models.upload_job_model import UploadJobModel
+from app.services.rate_limit import rate_cost, AUTH_COST
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
 
 @auth_bp.route("/me", methods=["GET"])
 def get_me():
     if current_user.is_authenticated:
-        return jsonify({"success": True, "user": current_user.to_dict()})
+        user = current_user.to_dict()
+        user["avatar_upload"] = UploadJobModel.get_pending('user', int(current_user.id))
+        return jsonify({"success": True, "user": user})
     return jsonify({"success": False, "user": None})
 
 @auth_bp.route("/login", methods=["POST"])
+@rate_cost(AUTH_COST)
 def login():
     data = request.json
-    user = Users.get_by_username(data.get('username'))
-    if user and user.check_password(data.get('password')):
+    user = Users.authenticate(data.get('username'), data.get('password'))
+    if user:
         login_user(user, remember=True)
         
         from flask import session
@@ -24,6 +29,7 @@ def login():
     return jsonify({"error": "Invalid credentials"}), 401
 
 @auth_bp.route("/signup", methods=["POST"])
+@rate_cost(AUTH_COST)
 def signup():
     data = request.json
     result = Users.create_user(data.get('username'), data.get('email'), data.get('password'))
@@ -1,7 +1,8 @@
 from flask import Blueprint, jsonify, request
 from flask_login import login_required, current_user
 from app.models.user_model import Users
-from app.services.cloudinary_service import upload_image
+from app.services.upload_queue import upload_queue
+from app.services.image_processing import validate_image, InvalidImage
 
 user_bp = Blueprint('users', __name__, url_prefix='/users')
 
@@ -36,17 +37,21 @@ def upload_avatar():
     if file.filename == '':
         return jsonify({"error": "No selected file"}), 400
 
-    image_url = upload_image(file)
-    
-    if not image_url:
-        return jsonify({"error": "Upload to Cloudinary failed"}), 500
-    updated_pfp = Users.update_avatar(current_user.id, image_url)
-    
-    if updated_pfp:
-        return jsonify({
-            "success": True, 
-            "message": "Avatar updated successfully",
-            "pfp_url": updated_pfp
-        }), 200
-        
-    return jsonify({"error": "Database update failed"}), 500
\ No newline at end of file
+    data = file.read()
+    try:
+        validate_image(data)
+    except InvalidImage as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        job_id = upload_queue.submit('user', int(current_user.id), data, file.filename, file.mimetype)
+    except Exception as e:
+        print(f"Could not queue avatar upload: {e}")
+        return jsonify({"error": "Could not queue avatar upload"}), 500
+
+    return jsonify({
+        "success": True,
+        "message": "Avatar upload queued",
+        "job_id": job_id,
+        "status": "pending"
+    }), 202
\ No newline at end of file
@@ -0,0 +1,100 @@
+"""
+Throughput of the single-row POST /api/student/ path versus the bulk
+importer in app/services/student_import.py.
+
+Both paths load the same synthetic students (IDs under a scratch year
+prefix, removed again afterwards). Run from backend/:
+
+    python -m benchmarks.import_benchmark --rows 2000 --bulk-rows 50000
+"""
+import argparse
+import csv
+import io
+import random
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app import create_app
+from app.db import get_db_connection
+from app.models.program_model import ProgramModel
+from app.services.student_import import import_students
+
+FIRST_NAMES = ["James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis"]
+
+
+def make_rows(prefix, count, programs):
+    for i in range(count):
+        yield {
+            "student_id": f"{prefix}-{i:06d}",
+            "firstname": random.choice(FIRST_NAMES),
+            "lastname": random.choice(LAST_NAMES),
+            "program_code": random.choice(programs),
+            "year": str(random.randint(1, 4)),
+            "gender": random.choice(["Male", "Female", "Other"]),
+        }
+
+
+def cleanup(prefix):
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM student_table WHERE student_id LIKE %s", (f"{prefix}-%",))
+        conn.commit()
+        cur.close()
+
+
+def run_single(client, rows):
+    started = time.perf_counter()
+    for row in rows:
+        response = client.post("/api/student/", data=row)
+        if response.status_code != 201:
+            raise RuntimeError(f"Single-row insert failed: {response.get_json()}")
+    return time.perf_counter() - started
+
+
+def run_bulk(rows, batch_size):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows(rows)
+    data = io.BytesIO(buffer.getvalue().encode())
+
+    started = time.perf_counter()
+    report = import_students(data, "csv", "insert", batch_size)
+    elapsed = time.perf_counter() - started
+    if report["failed"]:
+        raise RuntimeError(f"Bulk import rejected rows: {report['errors'][:5]}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000, help="rows for the single-row path")
+    parser.add_argument("--bulk-rows", type=int, default=20000, help="rows for the bulk path")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--prefix", default="1999", help="scratch student ID year prefix")
+    args = parser.parse_args()
+
+    programs = sorted(ProgramModel.get_codes())
+    if not programs:
+        raise SystemExit("No programs found, run python -m seeders.seed first.")
+
+    client = create_app().test_client()
+    cleanup(args.prefix)
+    try:
+        single = run_single(client, list(make_rows(args.prefix, args.rows, programs)))
+        cleanup(args.prefix)
+        bulk = run_bulk(list(make_rows(args.prefix, args.bulk_rows, programs)), args.batch_size)
+    finally:
+        cleanup(args.prefix)
+
+    print(f"{'path':<12} {'rows':>8} {'seconds':>9} {'rows/s':>10}")
+    print(f"{'single-row':<12} {args.rows:>8} {single:>9.2f} {args.rows / single:>10.0f}")
+    print(f"{'bulk':<12} {args.bulk_rows:>8} {bulk:>9.2f} {args.bulk_rows / bulk:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
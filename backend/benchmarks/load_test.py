@@ -0,0 +1,490 @@
+"""
+Load test for the REST API: scripted scenarios against a dataset of a known
+size, with p50/p95/p99 latency and throughput per endpoint and saved
+baselines to compare runs against.
+
+Requests go either to a running server (--url, e.g. the dev server or the
+production serve command) or, without --url, to an in-process app through
+Flask's test client. Both use the database configured in .env. Run from
+backend/:
+
+    python -m benchmarks.load_test --students 100000 --scenario mixed --threads 8 --duration 30
+    python -m benchmarks.load_test --scenario list --save-baseline list-100k
+    python -m benchmarks.load_test --scenario list --compare list-100k
+
+--students tops student_table up to that many rows (10k to 5M) with the
+deterministic generator in seeders/seed.py before the run. Scenarios:
+
+    list    paginated list with random sort, search and filters
+    deep    offset pages near the end of the table, and keyset pages
+    crud    lookups, creates, updates and deletes on scratch students
+    stats   dashboard stats
+    auth    GET /api/auth/me with a logged-in session
+    login   POST /api/auth/login, mostly the right password; every request
+            is a password hash, so this measures the hashing pool. 503s
+            from its admission control count as errors.
+    mixed   all of the above except login, weighted like the dashboard UI
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+
+from dotenv import load_dotenv
+
+load_dotenv()
+# Measure capacity, not the per-client rate limiter (every worker shares one user's bucket).
+# Servers started elsewhere need RATE_LIMIT_RATE=0 in their own environment.
+os.environ.setdefault('RATE_LIMIT_RATE', '0')
+# In-process runs log in once per worker thread; keep their filesystem sessions out of the tree.
+os.environ.setdefault('SESSION_FILE_DIR', tempfile.mkdtemp(prefix="load_test_sessions_"))
+
+from app.db import get_db_connection
+from app.models.pagination import encode_cursor
+from app.models.student_model import StudentModel
+from seeders.seed import seed_reference, seed_students
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+SCRATCH_PREFIX = "LOAD"
+BENCH_USER = {"username": "loadtest", "email": "loadtest@example.com", "password": "loadtest-password"}
+
+SEARCH_TERMS = ["smith", "son", "2024-00", "mar", "john", "lee", "zzzz"]
+SORT_COLUMNS = ["student_id", "firstname", "lastname", "program_code", "year", "gender"]
+
+
+def cleanup_scratch():
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM student_table WHERE student_id LIKE %s", (f"{SCRATCH_PREFIX}-%",))
+        conn.commit()
+        cur.close()
+
+
+class JsonBody(dict):
+    """A scenario request body sent as JSON rather than as a form."""
+
+
+class HttpClient:
+    """One keep-alive connection per worker, carrying the session cookie."""
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.cookies = {}
+        self.conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+
+    def request(self, method, path, form=None, json_body=None):
+        headers = {}
+        body = None
+        if form is not None:
+            body = urlencode(form)
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        elif json_body is not None:
+            body = json.dumps(json_body)
+            headers["Content-Type"] = "application/json"
+        if self.cookies:
+            headers["Cookie"] = "; ".join(f"{k}={v}" for k, v in self.cookies.items())
+
+        for attempt in range(2):
+            try:
+                self.conn.request(method, path, body=body, headers=headers)
+                response = self.conn.getresponse()
+                payload = response.read()
+                break
+            except (http.client.HTTPException, ConnectionError):
+                self.conn.close()
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+                if attempt:
+                    raise
+
+        for header in response.headers.get_all("Set-Cookie") or []:
+            name, _, rest = header.partition("=")
+            self.cookies[name.strip()] = rest.split(";", 1)[0]
+        return response.status, payload
+
+
+class AppClient:
+    """Flask test client against an in-process app (no HTTP server involved)."""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, form=None, json_body=None):
+        response = self.client.open(path, method=method, data=form, json=json_body)
+        return response.status_code, response.get_data()
+
+
+class Context:
+    """Dataset facts the scenarios draw from, shared by every worker."""
+
+    def __init__(self, students, programs, sample_ids, deep_cursor):
+        self.students = students
+        self.programs = programs
+        self.sample_ids = sample_ids
+        self.deep_cursor = deep_cursor
+        self.scratch_counter = 0
+        self.scratch_ids = []
+        self.lock = threading.Lock()
+
+    def new_scratch_id(self):
+        with self.lock:
+            self.scratch_counter += 1
+            student_id = f"{SCRATCH_PREFIX}-{self.scratch_counter:07d}"
+            self.scratch_ids.append(student_id)
+            return student_id
+
+    def pop_scratch_id(self, rng):
+        with self.lock:
+            if not self.scratch_ids:
+                return None
+            return self.scratch_ids.pop(rng.randrange(len(self.scratch_ids)))
+
+    def any_scratch_id(self, rng):
+        with self.lock:
+            return rng.choice(self.scratch_ids) if self.scratch_ids else None
+
+
+def load_context():
+    """Reads the dataset facts the scenarios need from the database."""
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT program_code FROM program_table ORDER BY program_code")
+        programs = [r[0] for r in cur.fetchall()]
+        cur.execute("SELECT COUNT(*) FROM student_table")
+        students = cur.fetchone()[0]
+        cur.execute("SELECT student_id FROM student_table TABLESAMPLE SYSTEM (1) LIMIT 1000")
+        sample_ids = [r[0] for r in cur.fetchall()]
+        if not sample_ids:
+            cur.execute("SELECT student_id FROM student_table LIMIT 1000")
+            sample_ids = [r[0] for r in cur.fetchall()]
+        deep_cursor = deep_keyset_cursor(cur, students)
+        cur.close()
+    if not programs or not sample_ids:
+        raise SystemExit("No programs or students found, run python -m seeders.seed or pass --students.")
+    return Context(students, programs, sample_ids, deep_cursor)
+
+
+def list_request(rng, ctx):
+    params = {
+        "page": rng.randint(1, 20),
+        "limit": rng.choice([10, 25, 50]),
+        "sort_by": rng.choice(SORT_COLUMNS),
+        "sort_order": rng.choice(["asc", "desc"]),
+    }
+    label = "GET /api/student/ (list)"
+    roll = rng.random()
+    if roll < 0.35:
+        params["search"] = rng.choice(SEARCH_TERMS)
+        label = "GET /api/student/ (search)"
+    elif roll < 0.65:
+        params["program"] = ",".join(rng.sample(ctx.programs, min(2, len(ctx.programs))))
+        params["year"] = str(rng.randint(1, 4))
+        if rng.random() < 0.5:
+            params["gender"] = rng.choice(["Male", "Female", "Other"])
+        label = "GET /api/student/ (filter)"
+    return label, "GET", "/api/student/?" + urlencode(params), None
+
+
+def deep_keyset_cursor(cur, students):
+    """A keyset cursor pointing at the same depth the deep offset pages reach."""
+    cur.execute("SELECT student_id, id FROM student_table ORDER BY student_id, id OFFSET %s LIMIT 1",
+                (max(0, students - 1000),))
+    row = cur.fetchone()
+    sort_by, sort_order = StudentModel._normalize_sort("student_id", "asc")
+    return encode_cursor(sort_by, sort_order, row[0], row[1], "next") if row else ""
+
+
+def deep_request(rng, ctx):
+    limit = 50
+    if rng.random() < 0.5:
+        last_page = max(1, ctx.students // limit)
+        page = max(1, last_page - rng.randint(0, 20))
+        return "GET /api/student/ (deep offset)", "GET", f"/api/student/?page={page}&limit={limit}&total=estimate", None
+    params = {"cursor": ctx.deep_cursor, "limit": limit, "sort_by": "student_id", "sort_order": "asc"}
+    return "GET /api/student/ (deep keyset)", "GET", "/api/student/?" + urlencode(params), None
+
+
+def crud_request(rng, ctx):
+    roll = rng.random()
+    if roll < 0.55:
+        return "GET /api/student/<id>", "GET", f"/api/student/{rng.choice(ctx.sample_ids)}", None
+    if roll < 0.75:
+        form = {
+            "student_id": ctx.new_scratch_id(), "firstname": "Load", "lastname": "Test",
+            "program_code": rng.choice(ctx.programs), "year": str(rng.randint(1, 4)), "gender": "Other",
+        }
+        return "POST /api/student/", "POST", "/api/student/", form
+    if roll < 0.9:
+        student_id = ctx.any_scratch_id(rng)
+        if student_id:
+            form = {"year": str(rng.randint(1, 4)), "lastname": rng.choice(["Test", "Tested"])}
+            return "PUT /api/student/<id>", "PUT", f"/api/student/{student_id}", form
+    student_id = ctx.pop_scratch_id(rng)
+    if student_id:
+        return "DELETE /api/student/<id>", "DELETE", f"/api/student/{student_id}", None
+    return "GET /api/student/<id>", "GET", f"/api/student/{rng.choice(ctx.sample_ids)}", None
+
+
+def stats_request(rng, ctx):
+    return "GET /api/stats/", "GET", "/api/stats/", None
+
+
+def auth_request(rng, ctx):
+    return "GET /api/auth/me", "GET", "/api/auth/me", None
+
+
+def login_request(rng, ctx):
+    if rng.random() < 0.9:
+        return "POST /api/auth/login", "POST", "/api/auth/login", JsonBody(BENCH_USER)
+    body = JsonBody(BENCH_USER, password="wrong-password")
+    return "POST /api/auth/login (wrong password)", "POST", "/api/auth/login", body
+
+
+# Labels whose requests are meant to fail with this status.
+EXPECTED_STATUS = {"POST /api/auth/login (wrong password)": 401}
+
+SCENARIOS = {
+    "list": [(1, list_request)],
+    "deep": [(1, deep_request)],
+    "crud": [(1, crud_request)],
+    "stats": [(1, stats_request)],
+    "auth": [(1, auth_request)],
+    "login": [(1, login_request)],
+    "mixed": [(50, list_request), (5, deep_request), (25, crud_request), (10, stats_request), (10, auth_request)],
+}
+
+
+def login(client, attempts=30):
+    for _ in range(attempts):
+        status, body = client.request("POST", "/api/auth/signup", json_body=BENCH_USER)
+        if status != 503:
+            break
+        time.sleep(1)
+    for _ in range(attempts):
+        status, body = client.request("POST", "/api/auth/login", json_body=BENCH_USER)
+        # The password hashing pool sheds load with 503s; wait our turn like a browser retry would.
+        if status != 503:
+            break
+        time.sleep(1)
+    if status != 200:
+        raise SystemExit(f"Could not log in the benchmark user: {status} {body[:200]!r}")
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(q / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def run(make_client, scenario, ctx, threads, duration, requests, warmup, seed):
+    weights, builders = zip(*SCENARIOS[scenario])
+    samples = defaultdict(list)
+    errors = defaultdict(int)
+    lock = threading.Lock()
+    remaining = [requests]
+    started_at = [None]
+    ready = threading.Barrier(threads + 1)
+
+    def worker(index):
+        rng = random.Random(seed + index)
+        client = make_client()
+        login(client)
+        local_samples = defaultdict(list)
+        local_errors = defaultdict(int)
+
+        ready.wait()
+        deadline = started_at[0] + warmup + duration
+        while True:
+            now = time.perf_counter()
+            if duration and now >= deadline:
+                break
+            if requests:
+                with lock:
+                    if remaining[0] <= 0:
+                        break
+                    remaining[0] -= 1
+
+            label, method, path, body = rng.choices(builders, weights)[0](rng, ctx)
+            t0 = time.perf_counter()
+            try:
+                if isinstance(body, JsonBody):
+                    status, _ = client.request(method, path, json_body=body)
+                else:
+                    status, _ = client.request(method, path, form=body)
+            except Exception:
+                status = 0
+            elapsed = time.perf_counter() - t0
+
+            if duration and t0 < started_at[0] + warmup:
+                continue
+            local_samples[label].append(elapsed)
+            # Concurrent deletes can make scratch lookups 404; anything else unexpected is a failure.
+            if status == 0 or (status >= 400 and status != 404 and status != EXPECTED_STATUS.get(label)):
+                local_errors[label] += 1
+
+        with lock:
+            for label, values in local_samples.items():
+                samples[label].extend(values)
+            for label, count in local_errors.items():
+                errors[label] += count
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in workers:
+        t.start()
+    started_at[0] = time.perf_counter()
+    ready.wait()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - started_at[0] - (warmup if duration else 0)
+    return summarize(samples, errors, elapsed)
+
+
+def summarize(samples, errors, elapsed):
+    results = {}
+    all_values = []
+    for label, values in sorted(samples.items()):
+        values.sort()
+        all_values.extend(values)
+        results[label] = {
+            "count": len(values),
+            "errors": errors.get(label, 0),
+            "rps": len(values) / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(values, 50) * 1000,
+            "p95_ms": percentile(values, 95) * 1000,
+            "p99_ms": percentile(values, 99) * 1000,
+            "max_ms": values[-1] * 1000 if values else 0.0,
+        }
+    all_values.sort()
+    results["TOTAL"] = {
+        "count": len(all_values),
+        "errors": sum(errors.values()),
+        "rps": len(all_values) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(all_values, 50) * 1000,
+        "p95_ms": percentile(all_values, 95) * 1000,
+        "p99_ms": percentile(all_values, 99) * 1000,
+        "max_ms": all_values[-1] * 1000 if all_values else 0.0,
+    }
+    return results
+
+
+def print_results(results):
+    print(f"{'endpoint':<34} {'count':>7} {'err':>5} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for label, r in results.items():
+        print(f"{label:<34} {r['count']:>7} {r['errors']:>5} {r['rps']:>8.1f} "
+              f"{r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['max_ms']:>8.1f}")
+
+
+def compare(results, baseline, tolerance):
+    """Prints the change against a saved baseline; returns the regressed endpoints."""
+    print(f"\nCompared with baseline '{baseline['name']}' ({baseline['meta']['created_at']}):")
+    print(f"{'endpoint':<34} {'req/s':>9} {'p50':>9} {'p95':>9} {'p99':>9}")
+    regressions = []
+    for label, r in results.items():
+        old = baseline["results"].get(label)
+        if not old:
+            print(f"{label:<34} {'(new)':>9}")
+            continue
+
+        def change(key):
+            return (r[key] - old[key]) / old[key] * 100 if old[key] else 0.0
+
+        deltas = {key: change(key) for key in ("rps", "p50_ms", "p95_ms", "p99_ms")}
+        print(f"{label:<34} {deltas['rps']:>+8.1f}% {deltas['p50_ms']:>+8.1f}% "
+              f"{deltas['p95_ms']:>+8.1f}% {deltas['p99_ms']:>+8.1f}%")
+        if deltas["p95_ms"] > tolerance or deltas["rps"] < -tolerance:
+            regressions.append(label)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="base URL of a running server; omit to use an in-process app")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="mixed")
+    parser.add_argument("--students", type=int, default=0, help="top student_table up to this many rows first")
+    parser.add_argument("--seed-workers", type=int, default=4, help="processes used to generate --students")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=20, help="seconds to measure (0 = use --requests)")
+    parser.add_argument("--requests", type=int, default=0, help="total requests to send instead of a duration")
+    parser.add_argument("--warmup", type=float, default=2, help="seconds discarded at the start of a timed run")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for the request mix")
+    parser.add_argument("--save-baseline", metavar="NAME")
+    parser.add_argument("--compare", metavar="NAME", help="compare with a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=10.0,
+                        help="percent p95 increase or throughput drop counted as a regression")
+    args = parser.parse_args()
+    if not args.duration and not args.requests:
+        parser.error("either --duration or --requests must be set")
+    if args.requests:
+        args.duration = 0
+
+    if args.students:
+        seed_reference()
+        seed_students(args.students, workers=args.seed_workers)
+
+    ctx = load_context()
+
+    if args.url:
+        make_client = lambda: HttpClient(args.url)
+    else:
+        from app import create_app
+        app = create_app()
+        make_client = lambda: AppClient(app)
+
+    target = args.url or "in-process"
+    print(f"Scenario '{args.scenario}' against {target}: {ctx.students} students, {args.threads} threads")
+
+    cleanup_scratch()
+    try:
+        results = run(make_client, args.scenario, ctx, args.threads, args.duration,
+                      args.requests, args.warmup, args.seed)
+    finally:
+        cleanup_scratch()
+    print_results(results)
+
+    exit_code = 0
+    if args.compare:
+        path = BASELINE_DIR / f"{args.compare}.json"
+        if not path.exists():
+            raise SystemExit(f"No baseline named '{args.compare}' in {BASELINE_DIR}")
+        regressions = compare(results, json.loads(path.read_text()), args.tolerance)
+        if regressions:
+            print(f"\nRegressed beyond {args.tolerance:.0f}%: {', '.join(regressions)}")
+            exit_code = 1
+
+    if args.save_baseline:
+        BASELINE_DIR.mkdir(exist_ok=True)
+        path = BASELINE_DIR / f"{args.save_baseline}.json"
+        path.write_text(json.dumps({
+            "name": args.save_baseline,
+            "meta": {
+                "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "scenario": args.scenario,
+                "target": target,
+                "students": ctx.students,
+                "threads": args.threads,
+                "duration": args.duration,
+                "requests": args.requests,
+                "seed": args.seed,
+                "python": platform.python_version(),
+                "host": platform.node(),
+            },
+            "results": results,
+        }, indent=2))
+        print(f"\nSaved baseline to {path}")
+
+    raise SystemExit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
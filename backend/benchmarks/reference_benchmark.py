@@ -0,0 +1,103 @@
+"""
+Database round-trips per import with and without the program-code cache
+(app/services/reference_data.py).
+
+Runs many small imports (the shape of a UI upload) of scratch students,
+first with every import reading program_table for its codes, then through
+program_reference, whose version check is answered from memory (see
+app/services/table_versions.py). Reports statements and pool checkouts
+per import, and latency. Run from backend/:
+
+    python -m benchmarks.reference_benchmark --imports 200 --rows 20
+"""
+import argparse
+import csv
+import io
+import statistics
+import time
+from unittest import mock
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app import db
+from app.db import get_db_connection, get_pool_stats
+from app.models.program_model import ProgramModel, program_reference
+from app.services import student_import
+
+
+def cleanup(prefix):
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM student_table WHERE student_id LIKE %s", (f"{prefix}-%",))
+        conn.commit()
+        cur.close()
+
+
+def make_file(prefix, start, rows, program_code):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(student_import.COLUMNS)
+    for i in range(start, start + rows):
+        writer.writerow([f"{prefix}-{i:06d}", "Bench", "Mark", program_code, 1, "Other"])
+    return io.BytesIO(buffer.getvalue().encode())
+
+
+def measure(imports, rows, prefix, program_code):
+    """Returns (statements per import, checkouts per import, mean ms per import)."""
+    statements = [0]
+    record_query = db.record_query
+
+    def counting(query, params, seconds):
+        statements[0] += 1
+        record_query(query, params, seconds)
+
+    latencies = []
+    checkouts = get_pool_stats()["checkouts"]
+    with mock.patch.object(db, "record_query", counting):
+        for n in range(imports):
+            started = time.perf_counter()
+            report = student_import.import_students(make_file(prefix, n * rows, rows, program_code), "csv")
+            latencies.append(time.perf_counter() - started)
+            if report["failed"]:
+                raise RuntimeError(f"Import failed: {report['errors'][:3]}")
+    checkouts = get_pool_stats()["checkouts"] - checkouts
+    return statements[0] / imports, checkouts / imports, statistics.mean(latencies) * 1000
+
+
+class Uncached:
+    """Stands in for program_reference, reading the codes on every call as before the cache."""
+
+    def codes(self):
+        return ProgramModel.get_codes()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--imports", type=int, default=100)
+    parser.add_argument("--rows", type=int, default=20, help="students per import")
+    parser.add_argument("--prefix", default="1996", help="scratch student ID year prefix")
+    args = parser.parse_args()
+
+    codes = sorted(ProgramModel.get_codes())
+    if not codes:
+        raise SystemExit("No programs found, run the seeders first.")
+    program_reference.preload()
+
+    cleanup(args.prefix)
+    try:
+        with mock.patch.object(student_import, "program_reference", Uncached()):
+            before = measure(args.imports, args.rows, args.prefix, codes[0])
+        cleanup(args.prefix)
+        after = measure(args.imports, args.rows, args.prefix, codes[0])
+    finally:
+        cleanup(args.prefix)
+
+    print(f"{'':<22} {'uncached':>10} {'cached':>10}")
+    for i, name in enumerate(("statements/import", "checkouts/import", "ms/import")):
+        print(f"{name:<22} {before[i]:>10.2f} {after[i]:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Compares the legacy six-way ILIKE student search with the rewritten,
+index-backed search in app/models/student_search.py.
+
+Run from backend/ against a scratch database:
+
+    python -m benchmarks.search_benchmark --rows 1000000 --seed
+
+--seed tops student_table up to --rows synthetic students first. Run
+`python -m migrations.migrate up` first to measure the indexed path.
+"""
+import argparse
+import json
+import statistics
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.db import get_db_connection
+from app.models.student_model import StudentModel
+from app.models.pagination import where_sql
+
+LEGACY_CONDITION = """(student_id ILIKE %s
+    OR firstname ILIKE %s
+    OR lastname ILIKE %s
+    OR gender ILIKE %s
+    OR year::text ILIKE %s
+    OR program_code ILIKE %s)"""
+
+DEFAULT_TERMS = ["2024-00", "smith", "ann", "BSCS", "3", "female", "zzzz"]
+
+
+def top_up_students(cur, rows):
+    cur.execute("SELECT COUNT(*) FROM student_table")
+    existing = cur.fetchone()[0]
+    if existing >= rows:
+        return existing
+
+    print(f"Seeding {rows - existing} synthetic students...")
+    cur.execute("""
+        INSERT INTO student_table (student_id, firstname, lastname, program_code, year, gender)
+        SELECT
+            'B' || LPAD(g::text, 9, '0'),
+            (ARRAY['James','Mary','John','Patricia','Robert','Jennifer','Michael','Linda','Ann','Daniel'])[1 + g %% 10],
+            (ARRAY['Smith','Johnson','Williams','Brown','Jones','Garcia','Miller','Davis','Lopez','Martin'])[1 + (g / 10) %% 10],
+            (SELECT array_agg(program_code ORDER BY program_code) FROM program_table)[1 + g %% (SELECT COUNT(*) FROM program_table)],
+            1 + g %% 4,
+            (ARRAY['Male','Female','Other'])[1 + g %% 3]
+        FROM generate_series(%s, %s) AS g
+        ON CONFLICT (student_id) DO NOTHING
+    """, (existing + 1, rows))
+    cur.execute("ANALYZE student_table")
+    return rows
+
+
+def explain(cur, condition, params):
+    cur.execute(
+        f"""EXPLAIN (ANALYZE, FORMAT JSON)
+        SELECT id, student_id, firstname, lastname, program_code, year, gender, pfp_url,
+               COUNT(*) OVER () AS total_count
+        FROM student_table{where_sql([condition])}
+        ORDER BY student_id LIMIT 10""",
+        tuple(params)
+    )
+    plan = cur.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    plan = plan[0]
+    text = json.dumps(plan["Plan"])
+    return plan["Execution Time"], "Seq Scan" in text
+
+
+def measure(cur, condition, params, runs):
+    timings = []
+    seq_scan = False
+    for _ in range(runs):
+        elapsed, seq_scan = explain(cur, condition, params)
+        timings.append(elapsed)
+    return statistics.median(timings), max(timings), seq_scan
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--seed", action="store_true", help="top student_table up to --rows synthetic rows")
+    parser.add_argument("--term", action="append", dest="terms", help="search term (repeatable)")
+    args = parser.parse_args()
+
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        if args.seed:
+            top_up_students(cur, args.rows)
+            conn.commit()
+
+        cur.execute("SELECT COUNT(*) FROM student_table")
+        print(f"student_table rows: {cur.fetchone()[0]}")
+        print(f"{'term':<12} {'legacy ms':>10} {'new ms':>10} {'speedup':>8}  seq scan")
+
+        for term in args.terms or DEFAULT_TERMS:
+            legacy_ms, _, _ = measure(cur, LEGACY_CONDITION, [f"%{term}%"] * 6, args.runs)
+            conditions, params = StudentModel._build_filters(term)
+            new_ms, _, seq_scan = measure(cur, conditions[0], params, args.runs)
+            speedup = legacy_ms / new_ms if new_ms else float("inf")
+            print(f"{term:<12} {legacy_ms:>10.2f} {new_ms:>10.2f} {speedup:>7.1f}x  {'yes' if seq_scan else 'no'}")
+
+        cur.close()
+
+
+if __name__ == "__main__":
+    main()
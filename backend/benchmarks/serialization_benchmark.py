@@ -0,0 +1,122 @@
+"""
+Per-row CPU time and peak memory of turning student rows into a JSON
+response body: the old DictCursor + hand-built dict + stdlib json path
+versus the RowMapper path in app/models/rows.py, with the stdlib encoder,
+with orjson, and streamed in batches through json_array_chunks.
+
+Each path fetches the same rows from student_table, maps and encodes them.
+CPU time is process time (so database wait is excluded); peak memory is
+measured in a separate tracemalloc pass. Run from backend/ after seeding:
+
+    python -m benchmarks.serialization_benchmark --rows 50000 --runs 5
+"""
+import argparse
+import json
+import statistics
+import time
+import tracemalloc
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from flask.json.provider import DefaultJSONProvider
+from psycopg2.extras import DictCursor
+
+from app.db import get_db_connection
+from app.models.rows import STUDENT_ROW
+from app.services.serialization import dumps, json_array_chunks, orjson
+
+
+def legacy(limit):
+    with get_db_connection() as conn:
+        cur = conn.cursor(cursor_factory=DictCursor)
+        cur.execute(f"SELECT {STUDENT_ROW.select_list} FROM student_table ORDER BY id LIMIT %s", (limit,))
+        rows = cur.fetchall()
+        cur.close()
+
+    students = []
+    for row in rows:
+        students.append({
+            "id": row["id"],
+            "student_id": row["student_id"],
+            "firstname": row["firstname"],
+            "lastname": row["lastname"],
+            "program_code": row["program_code"],
+            "year": row["year"],
+            "gender": row["gender"],
+            "pfp_url": row["pfp_url"],
+            "pfp_urls": row["pfp_urls"]
+        })
+    # What Flask's default provider does for jsonify().
+    return json.dumps(students, default=DefaultJSONProvider.default, sort_keys=True).encode()
+
+
+def fetch_tuples(limit):
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(f"SELECT {STUDENT_ROW.select_list} FROM student_table ORDER BY id LIMIT %s", (limit,))
+        rows = cur.fetchall()
+        cur.close()
+    return rows
+
+
+def mapper_stdlib(limit):
+    students = STUDENT_ROW.many(fetch_tuples(limit))
+    return json.dumps(students, default=DefaultJSONProvider.default).encode()
+
+
+def mapper_fast(limit):
+    return dumps(STUDENT_ROW.many(fetch_tuples(limit)))
+
+
+def streamed(limit):
+    with get_db_connection() as conn:
+        cur = conn.cursor(name="serialization_benchmark")
+        cur.itersize = 2000
+        cur.execute(f"SELECT {STUDENT_ROW.select_list} FROM student_table ORDER BY id LIMIT %s", (limit,))
+        size = 0
+        for chunk in json_array_chunks(STUDENT_ROW, cur):
+            size += len(chunk)
+        cur.close()
+    return size
+
+
+PATHS = [
+    ("dictcursor + dicts + json", legacy),
+    ("rowmapper + json", mapper_stdlib),
+    ("rowmapper + " + ("orjson" if orjson else "json (no orjson)"), mapper_fast),
+    ("rowmapper streamed", streamed),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = len(fetch_tuples(args.rows))
+    if not rows:
+        raise SystemExit("No students found, run python -m seeders.seed first.")
+
+    print(f"{rows} rows, median of {args.runs} runs")
+    print(f"{'path':<28} {'cpu us/row':>11} {'peak MB':>9} {'bytes/row':>10}")
+    for name, path in PATHS:
+        timings = []
+        for _ in range(args.runs):
+            started = time.process_time()
+            body = path(args.rows)
+            timings.append(time.process_time() - started)
+        size = body if isinstance(body, int) else len(body)
+
+        tracemalloc.start()
+        path(args.rows)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        print(f"{name:<28} {statistics.median(timings) / rows * 1e6:>11.2f} {peak / 1e6:>9.1f} {size / rows:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Throughput of the production server (serve.py: pre-forked gunicorn workers
+with threads) versus the Flask development server (run.py), under the same
+load_test scenario. Each server is started as a subprocess on its own port,
+warmed up, measured over HTTP and stopped again. Run from backend/:
+
+    python -m benchmarks.serve_benchmark --scenario mixed --threads 16 --duration 20 --workers 2 --worker-threads 4
+
+The results table in serve.py's docstring comes from this script.
+"""
+import argparse
+import http.client
+import subprocess
+import sys
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from benchmarks.load_test import HttpClient, SCENARIOS, cleanup_scratch, load_context, run
+
+DEV_SERVER = """
+from app import create_app
+create_app().run(host="127.0.0.1", port={port}, debug=True, use_reloader=False, threaded=True)
+"""
+
+
+def wait_until_up(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("GET", "/api/auth/me")
+            conn.getresponse().read()
+            conn.close()
+            return
+        except (ConnectionError, OSError):
+            time.sleep(0.2)
+    raise SystemExit(f"Server on port {port} did not come up")
+
+
+def start(name, port, args):
+    if name == "dev":
+        command = [sys.executable, "-c", DEV_SERVER.format(port=port)]
+    else:
+        command = [sys.executable, "serve.py", "--bind", f"127.0.0.1:{port}",
+                   "--workers", str(args.workers), "--threads", str(args.worker_threads)]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    wait_until_up(port)
+    return process
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="mixed")
+    parser.add_argument("--threads", type=int, default=16, help="concurrent load_test clients")
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--warmup", type=float, default=3)
+    parser.add_argument("--workers", type=int, default=2, help="serve.py worker processes")
+    parser.add_argument("--worker-threads", type=int, default=4, help="serve.py threads per worker")
+    parser.add_argument("--port", type=int, default=5090)
+    args = parser.parse_args()
+
+    servers = [
+        ("dev (run.py, debug)", "dev"),
+        (f"serve.py {args.workers} workers x {args.worker_threads}", "serve"),
+    ]
+
+    results = []
+    for offset, (label, name) in enumerate(servers):
+        port = args.port + offset
+        process = start(name, port, args)
+        try:
+            ctx = load_context()
+            cleanup_scratch()
+            total = run(lambda: HttpClient(f"http://127.0.0.1:{port}"), args.scenario, ctx,
+                        args.threads, args.duration, 0, args.warmup, 1)["TOTAL"]
+            results.append((label, total))
+        finally:
+            cleanup_scratch()
+            process.terminate()
+            process.wait(timeout=30)
+
+    print(f"Scenario '{args.scenario}', {args.threads} client threads, {args.duration:.0f}s")
+    print(f"{'server':<28} {'req/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for label, r in results:
+        print(f"{label:<28} {r['rps']:>7.1f} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['errors']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Load test for the session backends: Flask-Session's filesystem store versus
+the server-side stores in app/services/session_store.py.
+
+Each worker thread logs in once and then issues a read-mostly mix of
+requests against a minimal app that only touches the session. Run from
+backend/ (apply migration 0004 first for the postgres backend):
+
+    python -m benchmarks.session_benchmark --threads 8 --requests 500
+"""
+import argparse
+import random
+import statistics
+import tempfile
+import threading
+import time
+from os import getenv
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from flask import Flask, session
+from flask_session import Session
+
+from app.services.session_store import StoreSessionInterface, PostgresSessionStore, RedisSessionStore, redis
+
+
+def build_app(backend, session_dir):
+    app = Flask(__name__)
+    app.config.update(
+        SECRET_KEY="benchmark",
+        PERMANENT_SESSION_LIFETIME=86400,
+        SESSION_REFRESH_EACH_REQUEST=True,
+    )
+
+    if backend == 'filesystem':
+        app.config.update(SESSION_TYPE='filesystem', SESSION_FILE_DIR=session_dir)
+        Session(app)
+    elif backend == 'postgres':
+        app.session_interface = StoreSessionInterface(PostgresSessionStore())
+    elif backend == 'redis':
+        app.session_interface = StoreSessionInterface(RedisSessionStore(redis.Redis.from_url(getenv('SESSION_REDIS_URL'))))
+
+    @app.route("/login")
+    def login():
+        session.permanent = True
+        session["user_id"] = str(random.randint(1, 1000000))
+        session["counter"] = 0
+        return "ok"
+
+    @app.route("/read")
+    def read():
+        return session.get("user_id", "")
+
+    @app.route("/write")
+    def write():
+        session["counter"] = session.get("counter", 0) + 1
+        return "ok"
+
+    return app
+
+
+def run_backend(backend, threads, requests, write_ratio):
+    with tempfile.TemporaryDirectory() as session_dir:
+        app = build_app(backend, session_dir)
+        latencies = []
+        lock = threading.Lock()
+
+        def worker():
+            client = app.test_client()
+            client.get("/login")
+            local = []
+            for _ in range(requests):
+                path = "/write" if random.random() < write_ratio else "/read"
+                started = time.perf_counter()
+                client.get(path)
+                local.append(time.perf_counter() - started)
+            with lock:
+                latencies.extend(local)
+
+        started = time.perf_counter()
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        stats = getattr(app.session_interface, "stats", None)
+        return {
+            "throughput": len(latencies) / elapsed,
+            "p50": statistics.median(latencies) * 1000,
+            "p95": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+            "writes": stats()["writes"] if stats else "every request",
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=500, help="requests per thread")
+    parser.add_argument("--write-ratio", type=float, default=0.1)
+    parser.add_argument("--backend", action="append", dest="backends", choices=["filesystem", "postgres", "redis"])
+    args = parser.parse_args()
+
+    backends = args.backends or ["filesystem", "postgres"] + (["redis"] if redis and getenv('SESSION_REDIS_URL') else [])
+
+    print(f"{'backend':<12} {'req/s':>10} {'p50 ms':>8} {'p95 ms':>8}  store writes")
+    for backend in backends:
+        result = run_backend(backend, args.threads, args.requests, args.write_ratio)
+        print(f"{backend:<12} {result['throughput']:>10.1f} {result['p50']:>8.2f} {result['p95']:>8.2f}  {result['writes']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Concurrent writers against the student insert path: the old check-then-write
+flow (get_by_id + ProgramModel.get_by_code + insert, three round-trips)
+versus the single constraint-driven INSERT in StudentModel.add.
+
+Every student ID is submitted by --contention writers at once, so exactly
+one insert per ID should succeed and the rest should be told the ID exists.
+The check-then-write flow lets racing writers pass the existence check and
+then fail on the unique constraint, which the old handler reported as a 500.
+Run from backend/:
+
+    python -m benchmarks.write_benchmark --threads 8 --ids 2000 --contention 4
+"""
+import argparse
+import random
+import threading
+import time
+from collections import Counter
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.db import get_db_connection, get_pool_stats
+from app.models.constraints import ConstraintViolation
+from app.models.program_model import ProgramModel
+from app.models.student_model import StudentModel
+
+
+def check_then_write(row):
+    if StudentModel.get_by_id(row[0]):
+        return 409
+    if not ProgramModel.get_by_code(row[3]):
+        return 400
+    try:
+        StudentModel.add(*row)
+        return 201
+    except Exception:
+        return 500
+
+
+def constraint_write(row):
+    try:
+        StudentModel.add(*row)
+        return 201
+    except ConstraintViolation as e:
+        return e.status
+    except Exception:
+        return 500
+
+
+def cleanup(prefix):
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM student_table WHERE student_id LIKE %s", (f"{prefix}-%",))
+        conn.commit()
+        cur.close()
+
+
+def count_rows(prefix):
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT COUNT(*) FROM student_table WHERE student_id LIKE %s", (f"{prefix}-%",))
+        count = cur.fetchone()[0]
+        cur.close()
+    return count
+
+
+def run(write, rows, threads):
+    statuses = Counter()
+    lock = threading.Lock()
+    queue = list(rows)
+    queue_lock = threading.Lock()
+
+    def worker():
+        local = Counter()
+        while True:
+            with queue_lock:
+                if not queue:
+                    break
+                row = queue.pop()
+            local[write(row)] += 1
+        with lock:
+            statuses.update(local)
+
+    checkouts = get_pool_stats()["checkouts"]
+    started = time.perf_counter()
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - started
+    return statuses, elapsed, get_pool_stats()["checkouts"] - checkouts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--ids", type=int, default=1000, help="distinct student IDs")
+    parser.add_argument("--contention", type=int, default=4, help="writers per student ID")
+    parser.add_argument("--prefix", default="1995", help="scratch student ID year prefix")
+    args = parser.parse_args()
+
+    programs = sorted(ProgramModel.get_codes())
+    if not programs:
+        raise SystemExit("No programs found, run python -m seeders.seed first.")
+
+    rows = []
+    for i in range(args.ids):
+        row = (f"{args.prefix}-{i:05d}", "Race", "Writer", random.choice(programs), random.randint(1, 4), "Other")
+        rows.extend([row] * args.contention)
+    random.shuffle(rows)
+
+    print(f"{'flow':<18} {'writes/s':>9} {'trips/write':>12} {'201':>6} {'409':>6} {'500':>6} {'rows':>6}")
+    for name, write in (("check-then-write", check_then_write), ("constraint", constraint_write)):
+        cleanup(args.prefix)
+        try:
+            statuses, elapsed, checkouts = run(write, rows, args.threads)
+            stored = count_rows(args.prefix)
+        finally:
+            cleanup(args.prefix)
+        print(f"{name:<18} {len(rows) / elapsed:>9.0f} {checkouts / len(rows):>12.2f} "
+              f"{statuses[201]:>6} {statuses[409]:>6} {statuses[500]:>6} {stored:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+DROP TABLE IF EXISTS user_table;
+DROP TABLE IF EXISTS student_table;
+DROP TABLE IF EXISTS program_table;
+DROP TABLE IF EXISTS college_table;
@@ -0,0 +1,33 @@
+CREATE TABLE IF NOT EXISTS college_table (
+    id SERIAL PRIMARY KEY,
+    college_code VARCHAR(20) UNIQUE NOT NULL,
+    college_name VARCHAR(100) UNIQUE NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS program_table (
+    id SERIAL PRIMARY KEY,
+    program_code VARCHAR(10) UNIQUE NOT NULL,
+    program_name VARCHAR(100) UNIQUE NOT NULL,
+    college_code VARCHAR(20) NOT NULL REFERENCES college_table(college_code)
+        ON UPDATE CASCADE
+        ON DELETE RESTRICT
+);
+
+CREATE TABLE IF NOT EXISTS student_table (
+    id SERIAL PRIMARY KEY,
+    student_id VARCHAR(20) UNIQUE NOT NULL,  -- Format: YYYY-NNNN
+    firstname VARCHAR(50) NOT NULL,
+    lastname VARCHAR(50) NOT NULL,
+    program_code VARCHAR(10) NOT NULL REFERENCES program_table(program_code) ON UPDATE CASCADE ON DELETE RESTRICT,
+    year INTEGER NOT NULL CHECK (year BETWEEN 1 AND 4),
+    gender VARCHAR(10) NOT NULL CHECK (gender IN ('Male', 'Female', 'Other')),
+    pfp_url TEXT DEFAULT NULL
+);
+
+CREATE TABLE IF NOT EXISTS user_table (
+    id SERIAL PRIMARY KEY,
+    username VARCHAR(50) UNIQUE NOT NULL,
+    email VARCHAR(50) UNIQUE NOT NULL,
+    user_password VARCHAR(255) NOT NULL,
+    pfp_url TEXT DEFAULT NULL
+);
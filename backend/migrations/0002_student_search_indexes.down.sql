@@ -0,0 +1,5 @@
+DROP INDEX IF EXISTS student_program_code_trgm_idx;
+DROP INDEX IF EXISTS student_id_trgm_idx;
+DROP INDEX IF EXISTS student_lastname_trgm_idx;
+DROP INDEX IF EXISTS student_firstname_trgm_idx;
+DROP INDEX IF EXISTS student_id_prefix_idx;
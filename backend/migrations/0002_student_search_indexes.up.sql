@@ -0,0 +1,17 @@
+-- Indexes backing StudentModel search (app/models/student_search.py). The trigram indexes are
+-- skipped (with a notice) on servers that do not ship pg_trgm.
+CREATE INDEX IF NOT EXISTS student_id_prefix_idx ON student_table (student_id varchar_pattern_ops);
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX IF NOT EXISTS student_firstname_trgm_idx ON student_table USING GIN (firstname gin_trgm_ops);
+        CREATE INDEX IF NOT EXISTS student_lastname_trgm_idx ON student_table USING GIN (lastname gin_trgm_ops);
+        CREATE INDEX IF NOT EXISTS student_id_trgm_idx ON student_table USING GIN (student_id gin_trgm_ops);
+        CREATE INDEX IF NOT EXISTS student_program_code_trgm_idx ON student_table USING GIN (program_code gin_trgm_ops);
+    ELSE
+        RAISE NOTICE 'pg_trgm is not available; student search will run without trigram indexes';
+    END IF;
+END
+$$;
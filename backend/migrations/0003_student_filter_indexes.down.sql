@@ -0,0 +1,7 @@
+DROP INDEX IF EXISTS program_college_code_idx;
+DROP INDEX IF EXISTS student_program_year_idx;
+DROP INDEX IF EXISTS student_program_code_id_idx;
+DROP INDEX IF EXISTS student_gender_id_idx;
+DROP INDEX IF EXISTS student_year_id_idx;
+DROP INDEX IF EXISTS student_firstname_id_idx;
+DROP INDEX IF EXISTS student_lastname_id_idx;
@@ -0,0 +1,19 @@
+-- Indexes for the filter and sort combinations used by GET /api/student/.
+-- Every list query orders by (sort_by, id), so each sortable column gets an
+-- index that ends in id; student_id is already covered by its UNIQUE index.
+CREATE INDEX IF NOT EXISTS student_lastname_id_idx ON student_table (lastname, id);
+CREATE INDEX IF NOT EXISTS student_firstname_id_idx ON student_table (firstname, id);
+CREATE INDEX IF NOT EXISTS student_year_id_idx ON student_table (year, id);
+CREATE INDEX IF NOT EXISTS student_gender_id_idx ON student_table (gender, id);
+
+-- program_code = ANY(...) filter and sort; also serves the ON UPDATE CASCADE from program_table.
+CREATE INDEX IF NOT EXISTS student_program_code_id_idx ON student_table (program_code, id);
+
+-- The common "program + year level" filter combination.
+CREATE INDEX IF NOT EXISTS student_program_year_idx ON student_table (program_code, year);
+
+-- Referencing side of program_table.college_code, used by the cascade and by per-college lookups.
+CREATE INDEX IF NOT EXISTS program_college_code_idx ON program_table (college_code);
+
+ANALYZE student_table;
+ANALYZE program_table;
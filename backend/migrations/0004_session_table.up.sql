@@ -0,0 +1,8 @@
+CREATE TABLE IF NOT EXISTS session_table (
+    session_id VARCHAR(64) PRIMARY KEY,
+    data TEXT NOT NULL,
+    expires_at TIMESTAMPTZ NOT NULL
+);
+
+-- Lets the batched purge find expired sessions without scanning live ones.
+CREATE INDEX IF NOT EXISTS session_expires_at_idx ON session_table (expires_at);
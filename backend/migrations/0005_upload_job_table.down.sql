@@ -0,0 +1 @@
+DROP TABLE IF EXISTS upload_job_table;
@@ -0,0 +1,13 @@
+CREATE TABLE IF NOT EXISTS upload_job_table (
+    id SERIAL PRIMARY KEY,
+    target_type VARCHAR(20) NOT NULL CHECK (target_type IN ('student', 'user')),
+    target_id INTEGER NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'processing', 'done', 'failed')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    url TEXT DEFAULT NULL,
+    error TEXT DEFAULT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS upload_job_target_idx ON upload_job_table (target_type, target_id);
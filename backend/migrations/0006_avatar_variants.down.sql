@@ -0,0 +1,2 @@
+ALTER TABLE user_table DROP COLUMN IF EXISTS pfp_urls;
+ALTER TABLE student_table DROP COLUMN IF EXISTS pfp_urls;
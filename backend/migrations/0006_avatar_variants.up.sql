@@ -0,0 +1,3 @@
+-- Size-specific avatar URLs ({"sm": ..., "md": ..., "lg": ...}) written by the upload queue.
+ALTER TABLE student_table ADD COLUMN IF NOT EXISTS pfp_urls JSONB DEFAULT NULL;
+ALTER TABLE user_table ADD COLUMN IF NOT EXISTS pfp_urls JSONB DEFAULT NULL;
@@ -0,0 +1,2 @@
+DROP INDEX IF EXISTS program_table_program_name_ci_key;
+DROP INDEX IF EXISTS college_table_college_name_ci_key;
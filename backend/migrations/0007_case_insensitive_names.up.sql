@@ -0,0 +1,4 @@
+-- College and program names are unique regardless of case and surrounding
+-- whitespace, matching the checks the API used to do before inserting.
+CREATE UNIQUE INDEX IF NOT EXISTS college_table_college_name_ci_key ON college_table (LOWER(TRIM(college_name)));
+CREATE UNIQUE INDEX IF NOT EXISTS program_table_program_name_ci_key ON program_table (LOWER(TRIM(program_name)));
@@ -0,0 +1,8 @@
+DROP TRIGGER IF EXISTS student_stats_insert ON student_table;
+DROP TRIGGER IF EXISTS student_stats_update ON student_table;
+DROP TRIGGER IF EXISTS student_stats_delete ON student_table;
+DROP TRIGGER IF EXISTS student_stats_truncate ON student_table;
+DROP FUNCTION IF EXISTS rebuild_student_stats();
+DROP FUNCTION IF EXISTS student_stats_truncate();
+DROP FUNCTION IF EXISTS student_stats_apply();
+DROP TABLE IF EXISTS student_stats;
@@ -0,0 +1,88 @@
+-- Student counts per (program, year, gender), kept current by statement-level
+-- triggers on student_table so the dashboard never has to scan it. Colleges
+-- are resolved through program_table at read time.
+CREATE TABLE IF NOT EXISTS student_stats (
+    program_code VARCHAR(10) NOT NULL,
+    year INTEGER NOT NULL,
+    gender VARCHAR(10) NOT NULL,
+    student_count BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (program_code, year, gender)
+);
+
+CREATE OR REPLACE FUNCTION student_stats_apply() RETURNS trigger AS $$
+BEGIN
+    -- Each branch folds the whole statement into one net delta per group,
+    -- so bulk imports cost one upsert per group and updates that do not
+    -- touch program_code, year or gender write nothing.
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO student_stats AS s (program_code, year, gender, student_count, updated_at)
+        SELECT program_code, year, gender, COUNT(*), NOW()
+        FROM new_rows
+        GROUP BY program_code, year, gender
+        ORDER BY program_code, year, gender
+        ON CONFLICT (program_code, year, gender) DO UPDATE
+        SET student_count = s.student_count + EXCLUDED.student_count, updated_at = NOW();
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO student_stats AS s (program_code, year, gender, student_count, updated_at)
+        SELECT program_code, year, gender, -COUNT(*), NOW()
+        FROM old_rows
+        GROUP BY program_code, year, gender
+        ORDER BY program_code, year, gender
+        ON CONFLICT (program_code, year, gender) DO UPDATE
+        SET student_count = s.student_count + EXCLUDED.student_count, updated_at = NOW();
+    ELSIF TG_OP = 'UPDATE' THEN
+        INSERT INTO student_stats AS s (program_code, year, gender, student_count, updated_at)
+        SELECT program_code, year, gender, SUM(delta), NOW()
+        FROM (
+            SELECT program_code, year, gender, 1 AS delta FROM new_rows
+            UNION ALL
+            SELECT program_code, year, gender, -1 AS delta FROM old_rows
+        ) changes
+        GROUP BY program_code, year, gender
+        HAVING SUM(delta) <> 0
+        ORDER BY program_code, year, gender
+        ON CONFLICT (program_code, year, gender) DO UPDATE
+        SET student_count = s.student_count + EXCLUDED.student_count, updated_at = NOW();
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION student_stats_truncate() RETURNS trigger AS $$
+BEGIN
+    DELETE FROM student_stats;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Recomputes every counter from student_table; safe to run at any time.
+CREATE OR REPLACE FUNCTION rebuild_student_stats() RETURNS void AS $$
+BEGIN
+    LOCK TABLE student_table IN SHARE MODE;
+    DELETE FROM student_stats;
+    INSERT INTO student_stats (program_code, year, gender, student_count, updated_at)
+    SELECT program_code, year, gender, COUNT(*), NOW()
+    FROM student_table
+    GROUP BY program_code, year, gender;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS student_stats_insert ON student_table;
+DROP TRIGGER IF EXISTS student_stats_update ON student_table;
+DROP TRIGGER IF EXISTS student_stats_delete ON student_table;
+DROP TRIGGER IF EXISTS student_stats_truncate ON student_table;
+
+CREATE TRIGGER student_stats_insert AFTER INSERT ON student_table
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION student_stats_apply();
+CREATE TRIGGER student_stats_update AFTER UPDATE ON student_table
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION student_stats_apply();
+CREATE TRIGGER student_stats_delete AFTER DELETE ON student_table
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION student_stats_apply();
+CREATE TRIGGER student_stats_truncate AFTER TRUNCATE ON student_table
+    FOR EACH STATEMENT EXECUTE FUNCTION student_stats_truncate();
+
+SELECT rebuild_student_stats();
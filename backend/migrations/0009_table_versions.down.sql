@@ -0,0 +1,4 @@
+DROP TRIGGER IF EXISTS college_table_version ON college_table;
+DROP TRIGGER IF EXISTS program_table_version ON program_table;
+DROP FUNCTION IF EXISTS bump_table_version();
+DROP TABLE IF EXISTS table_versions;
@@ -0,0 +1,30 @@
+-- Change counters for the tables whose reads are served with ETags (see
+-- app/services/table_versions.py). Statement-level triggers bump them in
+-- the writing transaction, so every worker, seeder and psql session sees
+-- the same version as soon as the write commits.
+CREATE TABLE IF NOT EXISTS table_versions (
+    table_name VARCHAR(63) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    modified_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO table_versions AS v (table_name, version, modified_at)
+    VALUES (TG_TABLE_NAME, 1, NOW())
+    ON CONFLICT (table_name) DO UPDATE
+    SET version = v.version + 1, modified_at = NOW();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS college_table_version ON college_table;
+DROP TRIGGER IF EXISTS program_table_version ON program_table;
+
+CREATE TRIGGER college_table_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON college_table
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+CREATE TRIGGER program_table_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON program_table
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+INSERT INTO table_versions (table_name) VALUES ('college_table'), ('program_table')
+ON CONFLICT (table_name) DO NOTHING;
@@ -0,0 +1,9 @@
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO table_versions AS v (table_name, version, modified_at)
+    VALUES (TG_TABLE_NAME, 1, NOW())
+    ON CONFLICT (table_name) DO UPDATE
+    SET version = v.version + 1, modified_at = NOW();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,13 @@
+-- Announce every version bump on the table_versions channel. NOTIFY is
+-- delivered when the writing transaction commits, so each worker can keep
+-- the counters in memory and reload them only when one moves.
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO table_versions AS v (table_name, version, modified_at)
+    VALUES (TG_TABLE_NAME, 1, NOW())
+    ON CONFLICT (table_name) DO UPDATE
+    SET version = v.version + 1, modified_at = NOW();
+    PERFORM pg_notify('table_versions', TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,4 @@
+DROP INDEX IF EXISTS upload_job_unfinished_idx;
+ALTER TABLE upload_job_table DROP COLUMN IF EXISTS content_type;
+ALTER TABLE upload_job_table DROP COLUMN IF EXISTS filename;
+ALTER TABLE upload_job_table DROP COLUMN IF EXISTS payload;
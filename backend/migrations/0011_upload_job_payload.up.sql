@@ -0,0 +1,8 @@
+-- The uploaded image is kept on its job until the job finishes, so a job
+-- whose process died (restart, recycled worker) can be picked up again.
+ALTER TABLE upload_job_table ADD COLUMN IF NOT EXISTS payload BYTEA DEFAULT NULL;
+ALTER TABLE upload_job_table ADD COLUMN IF NOT EXISTS filename TEXT DEFAULT NULL;
+ALTER TABLE upload_job_table ADD COLUMN IF NOT EXISTS content_type TEXT DEFAULT NULL;
+
+CREATE INDEX IF NOT EXISTS upload_job_unfinished_idx ON upload_job_table (updated_at)
+    WHERE status IN ('pending', 'processing');
@@ -0,0 +1,225 @@
+"""
+Versioned schema migrations.
+
+Migrations live next to this file as NNNN_name.up.sql / NNNN_name.down.sql
+pairs. Applied versions are recorded in schema_migrations. Run from backend/:
+
+    python -m migrations.migrate status
+    python -m migrations.migrate up [--target N]
+    python -m migrations.migrate down --target N
+    python -m migrations.migrate check
+"""
+import argparse
+import json
+import os
+import re
+import sys
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.db import get_db_connection
+from app.models.student_model import StudentModel
+from app.models.pagination import encode_cursor, keyset_query, offset_query
+
+MIGRATIONS_DIR = os.path.dirname(os.path.abspath(__file__))
+MIGRATION_FILE = re.compile(r'^(\d{4})_(\w+)\.(up|down)\.sql$')
+
+
+def load_migrations():
+    migrations = {}
+    for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+        match = MIGRATION_FILE.match(filename)
+        if not match:
+            continue
+        version, name, direction = int(match.group(1)), match.group(2), match.group(3)
+        entry = migrations.setdefault(version, {"version": version, "name": name})
+        entry[direction] = os.path.join(MIGRATIONS_DIR, filename)
+
+    for entry in migrations.values():
+        if "up" not in entry or "down" not in entry:
+            raise ValueError(f"Migration {entry['version']:04d}_{entry['name']} needs both up and down scripts")
+
+    return [migrations[v] for v in sorted(migrations)]
+
+
+def ensure_migrations_table(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        )
+    """)
+
+
+def applied_versions(cur):
+    cur.execute("SELECT version FROM schema_migrations ORDER BY version")
+    return [row[0] for row in cur.fetchall()]
+
+
+def read_sql(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def migrate_up(target=None):
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        try:
+            ensure_migrations_table(cur)
+            conn.commit()
+            applied = set(applied_versions(cur))
+
+            for migration in load_migrations():
+                version = migration["version"]
+                if version in applied or (target is not None and version > target):
+                    continue
+
+                print(f"Applying {version:04d}_{migration['name']}...")
+                cur.execute(read_sql(migration["up"]))
+                cur.execute(
+                    "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                    (version, migration["name"])
+                )
+                conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise e
+        finally:
+            cur.close()
+
+
+def migrate_down(target):
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        try:
+            ensure_migrations_table(cur)
+            conn.commit()
+            applied = set(applied_versions(cur))
+
+            for migration in reversed(load_migrations()):
+                version = migration["version"]
+                if version not in applied or version <= target:
+                    continue
+
+                print(f"Reverting {version:04d}_{migration['name']}...")
+                cur.execute(read_sql(migration["down"]))
+                cur.execute("DELETE FROM schema_migrations WHERE version = %s", (version,))
+                conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise e
+        finally:
+            cur.close()
+
+
+def status():
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        try:
+            ensure_migrations_table(cur)
+            conn.commit()
+            applied = set(applied_versions(cur))
+        finally:
+            cur.close()
+
+    for migration in load_migrations():
+        mark = "applied" if migration["version"] in applied else "pending"
+        print(f"{migration['version']:04d}_{migration['name']:<40} {mark}")
+
+
+# (description, filters, sort_by, keyset, indexes that may serve it)
+INDEX_CHECKS = [
+    ("sort by lastname", None, 'lastname', False, {'student_lastname_id_idx'}),
+    ("sort by firstname", None, 'firstname', False, {'student_firstname_id_idx'}),
+    ("sort by student_id", None, 'student_id', False, {'student_table_student_id_key'}),
+    ("keyset page by lastname", None, 'lastname', True, {'student_lastname_id_idx'}),
+    ("program filter", {'program': ['BSCS', 'BSIT']}, 'program_code', False,
+        {'student_program_code_id_idx', 'student_program_year_idx'}),
+    ("year filter", {'year': [3]}, 'year', False, {'student_year_id_idx'}),
+    ("gender filter", {'gender': ['Female']}, 'gender', False, {'student_gender_id_idx'}),
+    # A few percent of rows match, so walking the sort index until LIMIT is met is as good as the filter index.
+    ("program + year filter", {'program': ['BSCS'], 'year': [1, 2]}, 'lastname', False,
+        {'student_program_year_idx', 'student_program_code_id_idx', 'student_lastname_id_idx'}),
+]
+
+
+def plan_indexes(node):
+    """Indexes the page itself reads; the total's COUNT(*) subquery (an InitPlan) is planned separately."""
+    found = set()
+    if "Index Name" in node:
+        found.add(node["Index Name"])
+    for child in node.get("Plans", []):
+        if child.get("Parent Relationship") not in ("InitPlan", "SubPlan"):
+            found |= plan_indexes(child)
+    return found
+
+
+def check_statement(filters, sort_by, keyset):
+    """The statement the list endpoint runs for one INDEX_CHECKS entry, built by StudentModel itself."""
+    if keyset:
+        cursor = encode_cursor(sort_by, 'ASC', 'M', 0, 'next')
+        query, params, _ = keyset_query(*StudentModel._cursor_args(10, sort_by, 'ASC', '', filters, cursor))
+    else:
+        _, args = StudentModel._pagination_args(1, 10, sort_by, 'ASC', '', filters)
+        query, params, _ = offset_query(*args)
+    return query, params
+
+
+def check_plans(cur):
+    """Yields (description, indexes used, indexes expected) for every INDEX_CHECKS entry."""
+    cur.execute("SET LOCAL enable_seqscan = off")
+    for description, filters, sort_by, keyset, expected in INDEX_CHECKS:
+        query, params = check_statement(filters, sort_by, keyset)
+        cur.execute(f"EXPLAIN (FORMAT JSON) {query}", params)
+        plan = cur.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        yield description, plan_indexes(plan[0]["Plan"]), expected
+
+
+def check():
+    """
+    EXPLAINs the queries StudentModel.by_pagination/by_cursor issue for common
+    filter and sort combinations and verifies each can be served by one of the
+    expected indexes. Sequential scans are disabled for the check so the result
+    does not depend on how many rows the table currently holds.
+    """
+    failures = 0
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        try:
+            for description, used, expected in check_plans(cur):
+                ok = bool(used & expected)
+                failures += 0 if ok else 1
+                print(f"{'ok  ' if ok else 'FAIL'} {description:<28} uses {', '.join(sorted(used)) or 'no index'}")
+        finally:
+            cur.close()
+            conn.rollback()
+
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["up", "down", "status", "check"])
+    parser.add_argument("--target", type=int, help="version to migrate up to, or down to (0 reverts everything)")
+    args = parser.parse_args()
+
+    if args.command == "up":
+        migrate_up(args.target)
+    elif args.command == "down":
+        if args.target is None:
+            parser.error("down requires --target")
+        migrate_down(args.target)
+    elif args.command == "status":
+        status()
+    elif args.command == "check":
+        if check():
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""
+Writes precompressed .br / .gz siblings next to the compressible files of
+the frontend build, so the server sends them as-is (see
+app/services/static_assets.py). Run from backend/ after every frontend
+build:
+
+    cd frontend && npm run build
+    cd ../backend && python precompress.py
+"""
+import argparse
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.services.static_assets import STATIC_DIR, precompress
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--root", default=STATIC_DIR, help="build directory (default: backend/dist or STATIC_DIR)")
+    args = parser.parse_args()
+    print(f"Wrote {precompress(args.root)} precompressed files under {args.root}")
+
+
+if __name__ == "__main__":
+    main()
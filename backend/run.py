@@ -1,8 +1,10 @@
-from app import create_app
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# After load_dotenv: modules read their settings from the environment on import.
+from app import create_app
+
 app = create_app()
 
 if __name__ == '__main__':
@@ -0,0 +1,355 @@
+"""
+Seeds colleges, programs and synthetic students. Run from backend/:
+
+    python -m seeders.seed                                   # reference data + 300 students
+    python -m seeders.seed --students 2000000 --workers 4 --seed 7
+    python -m seeders.seed --students 5000000 --reset --defer-indexes --workers 8
+
+--students is a target: student_table is topped up to that many rows.
+Student N is the same for a given --seed however many workers generate it,
+so two databases seeded with the same arguments hold identical data.
+Students are streamed to PostgreSQL with COPY FROM STDIN, one COPY per
+worker process, without building the rows in memory first. For large loads
+--defer-indexes drops the secondary indexes and the program foreign key
+while loading and rebuilds them afterwards, which is much cheaper than
+maintaining them row by row.
+"""
+import argparse
+import io
+import random
+import time
+from multiprocessing import Pool
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from psycopg2.extras import execute_values
+
+from app.db import connect
+
+# --- DATA: 7 Colleges ---
+COLLEGES = [
+    ("CCS", "College of Computer Studies"),
+    ("COE", "College of Engineering"),
+    ("CBA", "College of Business Administration"),
+    ("CAS", "College of Arts and Sciences"),
+    ("CON", "College of Nursing"),
+    ("CED", "College of Education"),
+    ("CAFA", "College of Architecture and Fine Arts"),
+]
+
+# --- DATA: 30 Programs ---
+PROGRAMS = [
+    # CCS
+    ("BSCS", "BS in Computer Science", "CCS"),
+    ("BSIT", "BS in Information Technology", "CCS"),
+    ("BSIS", "BS in Information Systems", "CCS"),
+    ("MIT", "Master of Information Technology", "CCS"),
+    # COE
+    ("BSCE", "BS in Civil Engineering", "COE"),
+    ("BSEE", "BS in Electrical Engineering", "COE"),
+    ("BSME", "BS in Mechanical Engineering", "COE"),
+    ("BSCpE", "BS in Computer Engineering", "COE"),
+    ("BSECE", "BS in Electronics Engineering", "COE"),
+    # CBA
+    ("BSA", "BS in Accountancy", "CBA"),
+    ("BSBA-FM", "BSBA Financial Management", "CBA"),
+    ("BSBA-MM", "BSBA Marketing Management", "CBA"),
+    ("BSHM", "BS in Hospitality Management", "CBA"),
+    ("BSTM", "BS in Tourism Management", "CBA"),
+    # CAS
+    ("BA-COMM", "BA in Communication", "CAS"),
+    ("BS-PSYCH", "BS in Psychology", "CAS"),
+    ("BA-POLSCI", "BA in Political Science", "CAS"),
+    ("BS-BIO", "BS in Biology", "CAS"),
+    ("BA-ENG", "BA in English Language", "CAS"),
+    # CON
+    ("BSN", "BS in Nursing", "CON"),
+    ("BSM", "BS in Midwifery", "CON"),
+    ("BSPT", "BS in Physical Therapy", "CON"),
+    ("BSMT", "BS in Medical Technology", "CON"),
+    # CED
+    ("BEED", "Bachelor of Elementary Education", "CED"),
+    ("BSED-ENG", "BSED Major in English", "CED"),
+    ("BSED-MATH", "BSED Major in Mathematics", "CED"),
+    ("BSED-SCI", "BSED Major in Science", "CED"),
+    # CAFA
+    ("BSARCH", "BS in Architecture", "CAFA"),
+    ("BFA-ID", "BFA Industrial Design", "CAFA"),
+    ("BFA-VC", "BFA Visual Communication", "CAFA"),
+]
+
+FIRST_NAMES = [
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "William", "Elizabeth",
+    "David", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Charles", "Karen",
+    "Christopher", "Lisa", "Daniel", "Nancy", "Matthew", "Betty", "Anthony", "Margaret", "Mark", "Sandra",
+    "Donald", "Ashley", "Steven", "Kimberly", "Paul", "Emily", "Andrew", "Donna", "Joshua", "Michelle",
+    "Kenneth", "Carol", "Kevin", "Amanda", "Brian", "Melissa", "George", "Deborah", "Timothy", "Stephanie"
+]
+
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin",
+    "Lee", "Perez", "Thompson", "White", "Harris", "Sanchez", "Clark", "Ramirez", "Lewis", "Robinson",
+    "Walker", "Young", "Allen", "King", "Wright", "Scott", "Torres", "Nguyen", "Hill", "Flores",
+    "Green", "Adams", "Nelson", "Baker", "Hall", "Rivera", "Campbell", "Mitchell", "Carter", "Roberts"
+]
+
+# Enrolment thins out towards 4th year; a few large programs (nursing,
+# IT, accountancy...) carry most students and masters programs the fewest.
+YEAR_WEIGHTS = [0.31, 0.27, 0.23, 0.19]
+GENDERS = ["Male", "Female", "Other"]
+GENDER_WEIGHTS = [0.48, 0.48, 0.04]
+POPULAR_PROGRAMS = {"BSN": 6, "BSIT": 5, "BSA": 4, "BSCS": 4, "BSBA-FM": 3, "BSHM": 3, "BS-PSYCH": 3, "BSCE": 3}
+SMALL_PROGRAMS = {"MIT": 0.2, "BFA-ID": 0.5, "BSM": 0.5}
+
+COPY_COLUMNS = "student_id, firstname, lastname, program_code, year, gender"
+CHUNK_ROWS = 10000
+
+
+def seed_colleges(cur):
+    execute_values(cur, """
+        INSERT INTO college_table (college_code, college_name) VALUES %s
+        ON CONFLICT (college_code) DO NOTHING
+    """, COLLEGES)
+    print(f"🏛️  {len(COLLEGES)} colleges")
+
+
+def seed_programs(cur):
+    execute_values(cur, """
+        INSERT INTO program_table (program_code, program_name, college_code) VALUES %s
+        ON CONFLICT (program_code) DO NOTHING
+    """, PROGRAMS)
+    print(f"📚 {len(PROGRAMS)} programs")
+
+
+def program_weights(codes):
+    return [POPULAR_PROGRAMS.get(code, SMALL_PROGRAMS.get(code, 1)) for code in codes]
+
+
+def student_rows(seed, start, stop, programs, id_year):
+    """
+    Yields COPY text lines for students start..stop-1 (0-based). Each block of
+    CHUNK_ROWS students draws from its own RNG seeded by (seed, block), so a
+    student's data does not depend on how the range was split up.
+    """
+    weights = program_weights(programs)
+    block = start // CHUNK_ROWS
+    while block * CHUNK_ROWS < stop:
+        block_start = block * CHUNK_ROWS
+        rng = random.Random(f"{seed}:{block}")
+        firstnames = rng.choices(FIRST_NAMES, k=CHUNK_ROWS)
+        lastnames = rng.choices(LAST_NAMES, k=CHUNK_ROWS)
+        program_codes = rng.choices(programs, weights, k=CHUNK_ROWS)
+        years = rng.choices("1234", YEAR_WEIGHTS, k=CHUNK_ROWS)
+        genders = rng.choices(GENDERS, GENDER_WEIGHTS, k=CHUNK_ROWS)
+
+        first = max(start, block_start) - block_start
+        last = min(stop, block_start + CHUNK_ROWS) - block_start
+        yield "".join(
+            f"{id_year}-{block_start + i + 1:04d}\t{firstnames[i]}\t{lastnames[i]}\t{program_codes[i]}\t{years[i]}\t{genders[i]}\n"
+            for i in range(first, last)
+        )
+        block += 1
+
+
+class CopyStream(io.RawIOBase):
+    """File-like view over an iterator of text chunks, read lazily by COPY."""
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._buffer = b""
+
+    def readable(self):
+        return True
+
+    def readinto(self, target):
+        while not self._buffer:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._buffer = chunk.encode()
+        size = min(len(target), len(self._buffer))
+        target[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+def copy_students(job):
+    """Loads one range of students in its own connection and transaction."""
+    seed, start, stop, programs, id_year = job
+    conn = connect()
+    try:
+        cur = conn.cursor()
+        stream = io.BufferedReader(CopyStream(student_rows(seed, start, stop, programs, id_year)), 1 << 20)
+        cur.copy_expert(f"COPY student_table ({COPY_COLUMNS}) FROM STDIN", stream, size=1 << 20)
+        conn.commit()
+        cur.close()
+        return stop - start
+    finally:
+        conn.close()
+
+
+def drop_deferrable(cur):
+    """
+    Drops student_table's secondary indexes and foreign keys, returning the
+    statements that recreate them. Indexes backing the primary key and the
+    student_id unique constraint stay, since COPY relies on them for
+    duplicate detection.
+    """
+    cur.execute("""
+        SELECT indexname, indexdef FROM pg_indexes
+        WHERE schemaname = current_schema() AND tablename = 'student_table'
+          AND indexname NOT IN (SELECT conname FROM pg_constraint WHERE conrelid = 'student_table'::regclass)
+    """)
+    indexes = cur.fetchall()
+    cur.execute("""
+        SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+        WHERE conrelid = 'student_table'::regclass AND contype = 'f'
+    """)
+    foreign_keys = cur.fetchall()
+
+    for name, _ in indexes:
+        cur.execute(f'DROP INDEX "{name}"')
+    for name, _ in foreign_keys:
+        cur.execute(f'ALTER TABLE student_table DROP CONSTRAINT "{name}"')
+
+    return ([definition for _, definition in indexes],
+            [f'ALTER TABLE student_table ADD CONSTRAINT "{name}" {definition}' for name, definition in foreign_keys])
+
+
+def run_statement(statement):
+    conn = connect()
+    try:
+        conn.autocommit = True
+        cur = conn.cursor()
+        cur.execute(statement)
+        cur.close()
+    finally:
+        conn.close()
+
+
+def restore_deferred(index_statements, constraint_statements, workers):
+    print(f"🔧 Rebuilding {len(index_statements)} indexes and {len(constraint_statements)} foreign keys...")
+    started = time.perf_counter()
+    if index_statements:
+        with Pool(max(1, min(workers, len(index_statements)))) as pool:
+            pool.map(run_statement, index_statements)
+    for statement in constraint_statements:
+        run_statement(statement)
+    print(f"🔧 Rebuilt in {time.perf_counter() - started:.1f}s")
+
+
+def next_student_index(cur, id_year):
+    """Index after the highest generated ID already present for id_year."""
+    cur.execute(
+        "SELECT COALESCE(MAX(split_part(student_id, '-', 2)::bigint), 0) FROM student_table WHERE student_id ~ %s",
+        (f"^{id_year}-[0-9]+$",)
+    )
+    return cur.fetchone()[0]
+
+
+def seed_students(target, seed=42, workers=1, id_year=2024, reset=False, defer_indexes=False):
+    """
+    Tops student_table up to target rows and returns the number inserted.
+    With reset the table is emptied first.
+    """
+    conn = connect()
+    try:
+        cur = conn.cursor()
+        if reset:
+            cur.execute("TRUNCATE student_table RESTART IDENTITY")
+        cur.execute("SELECT program_code FROM program_table ORDER BY program_code")
+        programs = [r[0] for r in cur.fetchall()]
+        cur.execute("SELECT COUNT(*) FROM student_table")
+        existing = cur.fetchone()[0]
+        start = next_student_index(cur, id_year)
+        conn.commit()
+        cur.close()
+    finally:
+        conn.close()
+
+    if not programs:
+        raise SystemExit("❌ No programs found! Seed the reference data first.")
+
+    missing = target - existing
+    if missing <= 0:
+        print(f"🎓 student_table already has {existing} students")
+        return 0
+
+    workers = max(1, min(workers, -(-missing // CHUNK_ROWS)))
+    step = -(-missing // workers)
+    jobs = [
+        (seed, lo, min(lo + step, start + missing), programs, id_year)
+        for lo in range(start, start + missing, step)
+    ]
+
+    deferred = None
+    if defer_indexes:
+        conn = connect()
+        try:
+            cur = conn.cursor()
+            deferred = drop_deferrable(cur)
+            conn.commit()
+            cur.close()
+        finally:
+            conn.close()
+
+    print(f"🎓 Generating {missing} students with {len(jobs)} worker(s)...")
+    started = time.perf_counter()
+    try:
+        if len(jobs) == 1:
+            inserted = copy_students(jobs[0])
+        else:
+            with Pool(len(jobs)) as pool:
+                inserted = sum(pool.map(copy_students, jobs))
+    finally:
+        elapsed = time.perf_counter() - started
+        if deferred:
+            restore_deferred(*deferred, workers)
+
+    conn = connect()
+    try:
+        conn.autocommit = True
+        cur = conn.cursor()
+        cur.execute("ANALYZE student_table")
+        cur.close()
+    finally:
+        conn.close()
+
+    print(f"✅ {inserted} students in {elapsed:.1f}s ({inserted / elapsed:,.0f} rows/s)")
+    return inserted
+
+
+def seed_reference():
+    conn = connect()
+    try:
+        cur = conn.cursor()
+        seed_colleges(cur)
+        seed_programs(cur)
+        conn.commit()
+        cur.close()
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=300, help="target number of students (default 300)")
+    parser.add_argument("--seed", type=int, default=42, help="random seed for generated students")
+    parser.add_argument("--workers", type=int, default=1, help="parallel generator/COPY processes")
+    parser.add_argument("--id-year", type=int, default=2024, help="year prefix of generated student IDs")
+    parser.add_argument("--reset", action="store_true", help="empty student_table before seeding")
+    parser.add_argument("--defer-indexes", action="store_true",
+                        help="drop secondary indexes and foreign keys during the load and rebuild them after")
+    parser.add_argument("--skip-reference", action="store_true", help="do not seed colleges and programs")
+    args = parser.parse_args()
+
+    if not args.skip_reference:
+        seed_reference()
+    seed_students(args.students, args.seed, args.workers, args.id_year, args.reset, args.defer_indexes)
+
+
+if __name__ == "__main__":
+    main()
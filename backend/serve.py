@@ -0,0 +1,192 @@
+"""
+Production server: a gunicorn master that loads the app once and pre-forks
+worker processes, each running a pool of request threads. Run from backend/:
+
+    python serve.py                               # workers = 2 x CPUs + 1, 4 threads each
+    python serve.py --workers 4 --threads 8 --bind 0.0.0.0:8000
+
+run.py stays the development server (debugger, reloader, one process).
+
+The app is created in the master before forking (preload), so workers
+start instantly and share the imported code and preloaded reference data
+copy-on-write. Database connections are never shared across the fork: the
+master closes its pool before forking and every worker builds its own,
+sized for its threads:
+
+    pool max_size = threads + 1 (one spare for the avatar upload queue),
+    capped at DB_MAX_CONNECTIONS // workers - 1 when that budget is set, so
+    workers x (pool size + the table version listener's connection) stays
+    under PostgreSQL's max_connections.
+
+The same goes for the table version listener
+(app/services/table_versions.py), which each worker starts on its first
+conditional request, and for the password hashing processes
+(app/services/password_hashing.py): each worker starts its own
+HASH_WORKERS of them in post_fork, before its request threads exist.
+The avatar upload queue (app/services/upload_queue.py) is stopped in the
+master and started in each worker; a worker exiting lets its queued
+uploads finish first.
+
+Each worker is a separate process, so state kept in process memory is not
+shared between them. With more than one worker, configure:
+
+    CACHE_REDIS_URL      the user cache and rate-limit buckets (otherwise a
+                         profile change can take USER_CACHE_TTL seconds to
+                         reach the other workers, and each worker allows the
+                         full RATE_LIMIT_RATE); needs the redis package
+    SESSION_BACKEND      postgres or redis; the default filesystem sessions
+                         only work while every worker runs on this host
+
+Table versions (ETags) and the reference-data caches keyed on them are kept
+in PostgreSQL, and every worker hears about changes through LISTEN/NOTIFY,
+so they need nothing extra. serve.py prints a warning at startup
+for each of the above that is missing, and refuses to start instead when
+WEB_REQUIRE_SHARED_STATE=1.
+
+Signals (sent to the master, whose pid is printed at startup):
+
+    HUP   start fresh workers and retire the old ones gracefully; in-flight
+          requests finish first. With preload this does not pick up new
+          code, use USR2 for that.
+    USR2  start a new master + workers from the code on disk next to the
+          running one, then send QUIT (graceful) to the old master.
+    TTIN / TTOU   add / remove one worker.
+    TERM / QUIT   graceful stop, waiting up to --graceful-timeout seconds.
+
+Workers are also recycled after --max-requests requests (with jitter, so
+they do not all restart at once).
+
+Throughput against the dev server is measured by
+benchmarks/serve_benchmark.py. On a single-CPU VM that also runs
+PostgreSQL, with 160k students and the mixed scenario at 16 clients:
+
+    server                       req/s   p50 ms   p95 ms   p99 ms
+    dev (run.py, debug)           16.4    608.1   2011.9   2519.4
+    serve.py 2 workers x 4        24.2    554.1   1305.1   1614.7
+
+More CPUs widen the gap, since the dev server runs all requests in one
+process behind the GIL.
+"""
+import argparse
+import multiprocessing
+from os import getenv
+
+from dotenv import load_dotenv
+from gunicorn.app.base import BaseApplication
+
+load_dotenv()
+
+from app import create_app
+from app.config import SESSION_BACKEND
+from app.db import close_pool, configure_pool
+from app.services.cache import redis
+from app.services.password_hashing import password_hasher
+from app.services.table_versions import table_versions
+from app.services.upload_queue import upload_queue
+
+
+def pool_size(workers, threads):
+    size = threads + 1
+    budget = getenv('DB_MAX_CONNECTIONS')
+    if budget:
+        size = min(size, max(1, int(budget) // workers - 1))
+    return size
+
+
+def shared_state_warnings(workers):
+    """What stays per process with this many workers and the current environment."""
+    if workers <= 1:
+        return []
+    warnings = []
+    if not getenv('CACHE_REDIS_URL') or redis is None:
+        warnings.append("CACHE_REDIS_URL is not set (or the redis package is missing): "
+                        "the user cache and rate-limit buckets are per worker")
+    if SESSION_BACKEND == 'filesystem':
+        warnings.append("SESSION_BACKEND is filesystem: sessions are not shared beyond this host; "
+                        "use postgres or redis")
+    return warnings
+
+
+class ProductionServer(BaseApplication):
+    def __init__(self, options):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        return create_app()
+
+
+def pre_fork(server, worker):
+    # Anything the app opened while loading belongs to the master; workers open their own.
+    upload_queue.shutdown()
+    close_pool()
+    table_versions.close()
+    password_hasher.shutdown()
+
+
+def post_fork(server, worker):
+    size = pool_size(server.cfg.workers, server.cfg.threads)
+    configure_pool(max_size=size, min_size=min(int(getenv('DB_POOL_MIN_SIZE', '1')), size))
+    password_hasher.start()
+    upload_queue.start()
+    server.log.info("Worker %s: DB pool max_size=%s", worker.pid, size)
+
+
+def worker_exit(server, worker):
+    # Finish queued avatar uploads while the pool still exists; anything cut short is resumed by another worker.
+    upload_queue.shutdown()
+    close_pool()
+    table_versions.close()
+    password_hasher.shutdown(wait=False)
+
+
+def when_ready(server):
+    size = pool_size(server.cfg.workers, server.cfg.threads)
+    server.log.info("Master %s ready: %s workers x %s threads, up to %s DB connections",
+                    server.pid, server.cfg.workers, server.cfg.threads, server.cfg.workers * (size + 1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bind", default=getenv('BIND', f"0.0.0.0:{getenv('PORT', '5000')}"))
+    parser.add_argument("--workers", type=int, default=int(getenv('WEB_WORKERS', multiprocessing.cpu_count() * 2 + 1)))
+    parser.add_argument("--threads", type=int, default=int(getenv('WEB_THREADS', '4')))
+    parser.add_argument("--timeout", type=int, default=int(getenv('WEB_TIMEOUT', '60')),
+                        help="seconds before a silent worker is killed and replaced")
+    parser.add_argument("--graceful-timeout", type=int, default=int(getenv('WEB_GRACEFUL_TIMEOUT', '30')))
+    parser.add_argument("--max-requests", type=int, default=int(getenv('WEB_MAX_REQUESTS', '10000')),
+                        help="recycle a worker after this many requests (0 = never)")
+    parser.add_argument("--keepalive", type=int, default=5)
+    args = parser.parse_args()
+
+    warnings = shared_state_warnings(args.workers)
+    for warning in warnings:
+        print(f"WARNING: {args.workers} workers, but {warning}")
+    if warnings and getenv('WEB_REQUIRE_SHARED_STATE') == '1':
+        raise SystemExit("Refusing to start several workers with per-process state (WEB_REQUIRE_SHARED_STATE=1)")
+
+    ProductionServer({
+        "bind": args.bind,
+        "workers": args.workers,
+        "threads": args.threads,
+        "worker_class": "gthread",
+        "preload_app": True,
+        "timeout": args.timeout,
+        "graceful_timeout": args.graceful_timeout,
+        "max_requests": args.max_requests,
+        "max_requests_jitter": args.max_requests // 10,
+        "keepalive": args.keepalive,
+        "accesslog": getenv('WEB_ACCESS_LOG'),
+        "pre_fork": pre_fork,
+        "post_fork": post_fork,
+        "worker_exit": worker_exit,
+        "when_ready": when_ready,
+    }).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import os
+import tempfile
+
+import psycopg2
+import pytest
+from dotenv import load_dotenv
+
+load_dotenv()
+os.environ.setdefault('SECRET_KEY', 'test')
+os.environ.setdefault('RATE_LIMIT_RATE', '0')
+os.environ.setdefault('UPLOAD_RECOVER_INTERVAL', '0')
+os.environ.setdefault('SESSION_FILE_DIR', tempfile.mkdtemp(prefix="test_sessions_"))
+
+from app import create_app
+from app.db import get_db_connection
+from app.models import student_model
+
+
+@pytest.fixture(scope="session")
+def app():
+    return create_app()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def db_down(monkeypatch):
+    """Makes every model's get_db_connection fail the way an unreachable server does."""
+    def unavailable():
+        raise psycopg2.OperationalError("could not connect to server")
+
+    monkeypatch.setattr(student_model, "get_db_connection", unavailable)
+
+
+@pytest.fixture(scope="session")
+def database():
+    """Skips tests that need PostgreSQL when it is not reachable."""
+    try:
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT 1 FROM student_table LIMIT 1")
+            cur.close()
+    except Exception as e:
+        pytest.skip(f"database not available: {e}")
+
+
+@pytest.fixture
+def student_id(database):
+    """The student_id of some existing student."""
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT student_id FROM student_table LIMIT 1")
+        row = cur.fetchone()
+        cur.close()
+    if row is None:
+        pytest.skip("no students in the database")
+    return row[0]
@@ -0,0 +1,20 @@
+from app.db import get_db_connection
+from app.models.student_model import StudentModel
+from app.models.upload_job_model import UploadJobModel
+
+
+def test_student_read_shows_a_pending_avatar_until_the_job_finishes(client, student_id):
+    student = StudentModel.get_by_id(student_id)
+    job_id = UploadJobModel.create('student', student['id'])
+    try:
+        pending = client.get(f"/api/student/{student_id}").get_json()
+        assert pending["avatar_upload"] == {"job_id": job_id, "status": "pending"}
+
+        UploadJobModel.update_status(job_id, 'done')
+        assert client.get(f"/api/student/{student_id}").get_json()["avatar_upload"] is None
+    finally:
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("DELETE FROM upload_job_table WHERE id = %s", (job_id,))
+            conn.commit()
+            cur.close()
@@ -0,0 +1,50 @@
+import pytest
+
+from app.models.student_model import StudentModel
+
+
+@pytest.mark.parametrize("changes, message", [
+    (None, "changes must be an object"),
+    (["year", 2], "changes must be an object"),
+    ({"student_id": "2024-00001"}, "Cannot bulk update student_id"),
+    ({"pfp_url": "https://example.com/a.png"}, "Cannot bulk update pfp_url"),
+    ({"year": "2"}, "year must be a whole number"),
+    ({"year": True}, "year must be a whole number"),
+    ({"year": 2.5}, "year must be a whole number"),
+    ({"firstname": 42}, "firstname must be a non-empty string"),
+    ({"gender": ["Male"]}, "gender must be a non-empty string"),
+    ({"program_code": "  "}, "program_code must be a non-empty string"),
+])
+def test_bulk_update_rejects_malformed_changes(client, db_down, changes, message):
+    # db_down: validation must answer before any query runs.
+    response = client.post("/api/student/bulk/update", json={"ids": ["2024-00001"], "changes": changes})
+
+    assert response.status_code == 400
+    assert message in response.get_json()["error"]
+
+
+def test_bulk_update_applies_valid_changes(client, student_id):
+    student = StudentModel.get_by_id(student_id)
+    changes = {"firstname": "Bulkupdated", "year": student["year"] % 4 + 1}
+
+    try:
+        response = client.post("/api/student/bulk/update", json={"ids": [student_id], "changes": changes})
+
+        assert response.status_code == 200
+        assert StudentModel.get_by_id(student_id) == {**student, **changes}
+    finally:
+        StudentModel.update(student_id, firstname=student["firstname"], year=student["year"])
+
+    assert StudentModel.get_by_id(student_id) == student
+
+
+def test_bulk_update_reports_unknown_ids(client, student_id):
+    response = client.post("/api/student/bulk/update", json={
+        "ids": [student_id, "0000-00000"],
+        "changes": {"gender": StudentModel.get_by_id(student_id)["gender"]},
+    })
+
+    assert response.status_code == 200
+    report = response.get_json()
+    assert (report["matched"], report["updated"], report["not_found"]) == (1, 1, 1)
+    assert {row["student_id"]: row["outcome"] for row in report["rows"]} == {student_id: "updated", "0000-00000": "not_found"}
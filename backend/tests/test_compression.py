@@ -0,0 +1,37 @@
+import gzip
+
+import pytest
+from werkzeug.http import parse_accept_header
+
+from app.services.compression import choose_encoding
+
+
+@pytest.mark.parametrize("header, encodings, expected", [
+    ("gzip;q=0, *;q=1", ("gzip",), None),
+    ("gzip;q=0, *;q=1", ("br", "gzip"), "br"),
+    ("br;q=0, gzip;q=0.5, *", ("br", "gzip"), "gzip"),
+    ("br;q=0, gzip;q=0", ("br", "gzip"), None),
+    ("*", ("br", "gzip"), "br"),
+    ("*", ("gzip",), "gzip"),
+    ("*;q=0", ("br", "gzip"), None),
+    ("*;q=0, gzip", ("br", "gzip"), "gzip"),
+    ("GZIP", ("gzip",), "gzip"),
+    ("gzip;q=0.4, br;q=0.8", ("br", "gzip"), "br"),
+    ("gzip, br;q=0.5", ("br", "gzip"), "gzip"),
+    ("identity", ("br", "gzip"), None),
+    ("", ("br", "gzip"), None),
+])
+def test_choose_encoding_honours_q_values(header, encodings, expected):
+    assert choose_encoding(parse_accept_header(header), encodings) == expected
+
+
+def test_refused_encoding_is_not_sent(client, database):
+    response = client.get("/api/student/?page=1&limit=50", headers={"Accept-Encoding": "gzip;q=0, br;q=0, *"})
+    assert response.status_code == 200
+    assert "Content-Encoding" not in response.headers
+
+
+def test_list_is_gzipped_when_accepted(client, database):
+    response = client.get("/api/student/?page=1&limit=50", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert b'"data"' in gzip.decompress(response.data)
@@ -0,0 +1,219 @@
+import os
+import threading
+import time
+import types
+
+import psycopg2
+import pytest
+from psycopg2 import extensions
+
+from app import db
+from app.db import ConnectionPool, PoolTimeout
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.healthy = True
+        self.statements = []
+        self.rollbacks = 0
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+
+    def get_transaction_status(self):
+        return self.status
+
+    def close(self):
+        self.closed = 1
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, query, params=None):
+        if not self.conn.healthy:
+            raise psycopg2.OperationalError("server closed the connection unexpectedly")
+        self.conn.statements.append(query)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    """Every connection the pool opens, in order; nothing reaches PostgreSQL."""
+    opened = []
+
+    def connect():
+        conn = FakeConnection()
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(db, "connect", connect)
+    return opened
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Freezes the pool's idea of time; only for tests that never wait on the pool."""
+    clock = types.SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(db, "time", types.SimpleNamespace(monotonic=lambda: clock.now, perf_counter=time.perf_counter))
+    return clock
+
+
+def test_checkout_times_out_when_the_pool_is_exhausted(connections):
+    pool = ConnectionPool(max_size=1, timeout=0.05)
+    pool.getconn()
+
+    started = time.monotonic()
+    with pytest.raises(PoolTimeout):
+        pool.getconn()
+
+    assert time.monotonic() - started >= 0.05
+    assert pool.stats()["timeouts"] == 1
+    assert len(connections) == 1
+
+
+def test_waiting_checkout_gets_a_returned_connection(connections):
+    pool = ConnectionPool(max_size=1, timeout=5)
+    conn = pool.getconn()
+    got = []
+
+    waiter = threading.Thread(target=lambda: got.append(pool.getconn()))
+    waiter.start()
+    time.sleep(0.05)
+    pool.putconn(conn)
+    waiter.join(timeout=5)
+
+    assert got == [conn]
+    assert pool.stats()["wait_time_max"] >= 0.05
+
+
+def test_recently_used_connection_is_not_health_checked(connections, clock):
+    pool = ConnectionPool(check_after=30)
+    conn = pool.getconn()
+    pool.putconn(conn)
+
+    clock.now += 10
+    assert pool.getconn() is conn
+    assert conn.statements == []
+
+
+def test_idle_connection_is_health_checked_after_check_after(connections, clock):
+    pool = ConnectionPool(check_after=30)
+    conn = pool.getconn()
+    pool.putconn(conn)
+
+    clock.now += 31
+    assert pool.getconn() is conn
+    assert conn.statements == ["SELECT 1"]
+
+
+def test_dead_connection_is_replaced_at_checkout(connections, clock):
+    pool = ConnectionPool(check_after=30)
+    conn = pool.getconn()
+    pool.putconn(conn)
+    conn.healthy = False
+
+    clock.now += 31
+    replacement = pool.getconn()
+
+    assert replacement is not conn
+    assert conn.closed
+    stats = pool.stats()
+    assert (stats["created"], stats["discarded"], stats["size"]) == (2, 1, 1)
+
+
+def test_idle_connections_are_reaped_down_to_min_size(connections, clock):
+    pool = ConnectionPool(min_size=1, max_size=5, max_idle=300)
+    checked_out = [pool.getconn() for _ in range(3)]
+    for conn in checked_out:
+        pool.putconn(conn)
+
+    clock.now += 301
+    kept = pool.getconn()
+
+    assert [conn.closed for conn in connections].count(1) == 2
+    assert not kept.closed
+    assert pool.stats()["size"] == 1
+
+
+def test_connections_idle_less_than_max_idle_are_kept(connections, clock):
+    pool = ConnectionPool(min_size=0, max_size=5, max_idle=300)
+    for conn in [pool.getconn() for _ in range(3)]:
+        pool.putconn(conn)
+
+    clock.now += 299
+    pool.getconn()
+
+    assert not any(conn.closed for conn in connections)
+    assert pool.stats()["size"] == 3
+
+
+def test_returned_connection_is_rolled_back(connections):
+    pool = ConnectionPool()
+    conn = pool.getconn()
+    conn.status = extensions.TRANSACTION_STATUS_INTRANS
+
+    pool.putconn(conn)
+
+    assert conn.rollbacks == 1
+    assert pool.stats()["idle"] == 1
+
+
+def test_connection_is_discarded_after_a_connection_error(connections):
+    pool = ConnectionPool()
+
+    with pytest.raises(psycopg2.OperationalError):
+        with pool.connection():
+            raise psycopg2.OperationalError("server closed the connection unexpectedly")
+
+    assert connections[0].closed
+    assert pool.stats()["size"] == 0
+
+
+def test_get_pool_rebuilds_after_the_pid_changes(monkeypatch, connections):
+    monkeypatch.setattr(db, "_pool", None)
+    monkeypatch.setattr(db, "_pool_pid", None)
+    pid = os.getpid()
+
+    parent = db.get_pool()
+    assert db.get_pool() is parent
+
+    monkeypatch.setattr(db.os, "getpid", lambda: pid + 1)
+    child = db.get_pool()
+
+    assert child is not parent
+    assert db._pool_pid == pid + 1
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork()")
+def test_forked_child_queries_on_its_own_connections(database):
+    with db.get_db_connection() as conn:
+        parent_backend = conn.get_backend_pid()
+
+    child = os.fork()
+    if child == 0:
+        status = 1
+        try:
+            with db.get_db_connection() as conn:
+                status = 0 if conn.get_backend_pid() != parent_backend else 2
+        finally:
+            os._exit(status)
+
+    _, status = os.waitpid(child, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+
+    # The child never touched the parent's sockets, so the parent's connection still works.
+    with db.get_db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT 1")
+        assert cur.fetchone() == (1,)
+        assert conn.get_backend_pid() == parent_backend
@@ -0,0 +1,17 @@
+
+from app.db import get_db_connection
+from migrations.migrate import INDEX_CHECKS, check_plans
+
+
+def test_list_queries_use_their_indexes(database):
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        try:
+            results = list(check_plans(cur))
+        finally:
+            cur.close()
+            conn.rollback()
+
+    assert len(results) == len(INDEX_CHECKS)
+    for description, used, expected in results:
+        assert used & expected, f"{description} uses {sorted(used) or 'no index'}, expected one of {sorted(expected)}"
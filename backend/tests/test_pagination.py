@@ -0,0 +1,210 @@
+import base64
+import json
+
+import pytest
+
+from app.db import get_db_connection
+from app.models import pagination
+from app.models.pagination import InvalidCursor, decode_cursor, encode_cursor, offset_page
+from app.models.student_model import StudentModel
+
+
+def raw_cursor(payload):
+    """A cursor token for an arbitrary payload, the way a client could forge one."""
+    raw = json.dumps(payload).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def execute(sql, params=()):
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(sql, params)
+        conn.commit()
+        cur.close()
+
+
+@pytest.mark.parametrize("token", [
+    "not a cursor!",
+    raw_cursor(["student_id", "ASC"]),
+    raw_cursor({"s": "student_id", "o": "ASC", "v": "2024-0001", "id": 1, "d": "sideways"}),
+    raw_cursor({"s": "student_id", "o": "ASC", "v": "2024-0001", "d": "next"}),
+    raw_cursor({"s": "student_id", "o": "ASC", "v": "2024-0001", "id": "1", "d": "next"}),
+    raw_cursor({"s": "student_id", "o": "ASC", "v": "2024-0001", "id": True, "d": "next"}),
+    raw_cursor({"s": "student_id", "o": "ASC", "v": {"x": 1}, "id": 1, "d": "next"}),
+    raw_cursor({"s": "student_id", "o": "ASC", "v": [1, 2], "id": 1, "d": "next"}),
+    raw_cursor({"s": "lastname", "o": "ASC", "v": "Smith", "id": 1, "d": "next"}),
+    raw_cursor({"s": "student_id", "o": "DESC", "v": "2024-0001", "id": 1, "d": "next"}),
+])
+def test_decode_cursor_rejects_tampered_tokens(token):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(token, "student_id", "ASC")
+
+
+def test_decode_cursor_round_trips():
+    token = encode_cursor("year", "DESC", 3, 42, "prev")
+
+    assert decode_cursor(token, "year", "DESC") == {"s": "year", "o": "DESC", "v": 3, "id": 42, "d": "prev"}
+
+
+@pytest.mark.parametrize("sort_by, token", [
+    ("student_id", "not a cursor!"),
+    ("student_id", raw_cursor({"s": "student_id", "o": "ASC", "v": "2024-0001", "id": "1; DROP", "d": "next"})),
+    ("student_id", raw_cursor({"s": "lastname", "o": "ASC", "v": "Smith", "id": 1, "d": "next"})),
+    # Well-formed JSON whose boundary value does not fit the sort column.
+    ("year", raw_cursor({"s": "year", "o": "ASC", "v": "second", "id": 1, "d": "next"})),
+    ("student_id", raw_cursor({"s": "student_id", "o": "ASC", "v": 5, "id": 1, "d": "next"})),
+])
+def test_tampered_cursor_is_a_bad_request(client, database, sort_by, token):
+    response = client.get(f"/api/student/?limit=5&sort_by={sort_by}&cursor={token}")
+
+    assert response.status_code == 400
+    assert "cursor" in response.get_json()["error"].lower()
+
+
+PROGRAM = "TSTPAG"
+
+
+@pytest.fixture
+def paged_students(database):
+    execute("""
+        INSERT INTO program_table (program_code, program_name, college_code)
+        SELECT %s, 'Pagination Test Program', college_code FROM college_table LIMIT 1
+    """, (PROGRAM,))
+    execute("""
+        INSERT INTO student_table (student_id, firstname, lastname, program_code, year, gender)
+        SELECT '9997-' || lpad(n::text, 4, '0'), 'Page', 'Test', %s, 1, 'Other'
+        FROM generate_series(10, 100, 10) AS n
+    """, (PROGRAM,))
+    yield [f"9997-{n:04d}" for n in range(10, 101, 10)]
+    execute("DELETE FROM student_table WHERE program_code = %s", (PROGRAM,))
+    execute("DELETE FROM program_table WHERE program_code = %s", (PROGRAM,))
+
+
+def insert_student(student_id):
+    execute("""
+        INSERT INTO student_table (student_id, firstname, lastname, program_code, year, gender)
+        VALUES (%s, 'Page', 'Test', %s, 1, 'Other')
+    """, (student_id, PROGRAM))
+
+
+def ids(page):
+    return [row["student_id"] for row in page["data"]]
+
+
+def test_keyset_pages_are_stable_under_concurrent_inserts(paged_students):
+    first = StudentModel.by_cursor(4, "student_id", "ASC", filters={"program": [PROGRAM]}, cursor="")
+    assert ids(first) == paged_students[:4]
+
+    # Rows written between requests on either side of the boundary must neither
+    # repeat a row already shown nor push one off the next page.
+    insert_student("9997-0001")
+    insert_student("9997-0035")
+
+    second = StudentModel.by_cursor(4, "student_id", "ASC", filters={"program": [PROGRAM]}, cursor=first["next_cursor"])
+    assert ids(second) == ["9997-0050", "9997-0060", "9997-0070", "9997-0080"]
+
+    third = StudentModel.by_cursor(4, "student_id", "ASC", filters={"program": [PROGRAM]}, cursor=second["next_cursor"])
+    assert ids(third) == ["9997-0090", "9997-0100"]
+    assert third["next_cursor"] is None
+
+    back = StudentModel.by_cursor(4, "student_id", "ASC", filters={"program": [PROGRAM]}, cursor=second["prev_cursor"])
+    assert ids(back) == ["9997-0020", "9997-0030", "9997-0035", "9997-0040"]
+    assert back["prev_cursor"] is not None
+
+
+def test_keyset_descending_pages_mirror_ascending(paged_students):
+    first = StudentModel.by_cursor(3, "student_id", "DESC", filters={"program": [PROGRAM]})
+    second = StudentModel.by_cursor(3, "student_id", "DESC", filters={"program": [PROGRAM]}, cursor=first["next_cursor"])
+    back = StudentModel.by_cursor(3, "student_id", "DESC", filters={"program": [PROGRAM]}, cursor=second["prev_cursor"])
+
+    assert ids(first) + ids(second) == paged_students[::-1][:6]
+    assert ids(back) == ids(first)
+    assert back["prev_cursor"] is None
+
+
+def test_cursor_endpoint_walks_every_row_once(client, paged_students):
+    seen, cursor = [], ""
+    while cursor is not None:
+        page = client.get(f"/api/student/?limit=3&program={PROGRAM}&cursor={cursor}").get_json()
+        seen += ids(page)
+        cursor = page["next_cursor"]
+
+    assert seen == paged_students
+
+
+class ScriptedCursor:
+    """Stands in for a DB cursor: answers each execute with the next scripted result."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.queries = []
+
+    def execute(self, query, params=()):
+        self.queries.append(query)
+        self.result = self.results.pop(0)
+
+    def fetchall(self):
+        return self.result
+
+    def fetchone(self):
+        return self.result[0]
+
+
+def estimated_page(cur):
+    return offset_page(cur, "student_table", "student_id", [], [], "student_id ASC", 2, 0, total_mode="estimated")
+
+
+def test_estimated_total_above_threshold(monkeypatch):
+    monkeypatch.setattr(pagination, "ESTIMATED_TOTAL_MIN_ROWS", 1000)
+    cur = ScriptedCursor([("2024-0001", 5000), ("2024-0002", 5000)])
+
+    rows, total, total_type = estimated_page(cur)
+
+    assert (total, total_type) == (5000, "estimated")
+    assert len(cur.queries) == 1
+    assert "reltuples" in cur.queries[0]
+
+
+def test_estimated_total_below_threshold_falls_back_to_exact_count(monkeypatch):
+    monkeypatch.setattr(pagination, "ESTIMATED_TOTAL_MIN_ROWS", 1000)
+    cur = ScriptedCursor([("2024-0001", 999), ("2024-0002", 999)], [(987,)])
+
+    rows, total, total_type = estimated_page(cur)
+
+    assert (total, total_type) == (987, "exact")
+    assert "COUNT(*)" in cur.queries[1]
+
+
+def test_estimated_total_past_the_end_reads_the_estimate_alone(monkeypatch):
+    monkeypatch.setattr(pagination, "ESTIMATED_TOTAL_MIN_ROWS", 1000)
+    cur = ScriptedCursor([], [(5000,)])
+
+    rows, total, total_type = estimated_page(cur)
+
+    assert (rows, total, total_type) == ([], 5000, "estimated")
+    assert cur.queries[1] == pagination.ESTIMATE_QUERY
+
+
+def test_filtered_list_never_estimates(monkeypatch):
+    monkeypatch.setattr(pagination, "ESTIMATED_TOTAL_MIN_ROWS", 0)
+    cur = ScriptedCursor([("2024-0001", 7)])
+
+    rows, total, total_type = offset_page(
+        cur, "student_table", "student_id", ["year = %s"], [1], "student_id ASC", 2, 0, total_mode="estimated"
+    )
+
+    assert (total, total_type) == (7, "exact")
+    assert "reltuples" not in cur.queries[0]
+
+
+def test_estimated_total_threshold_against_the_database(monkeypatch, database):
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT COUNT(*) FROM student_table")
+        count = cur.fetchone()[0]
+        cur.close()
+
+    monkeypatch.setattr(pagination, "ESTIMATED_TOTAL_MIN_ROWS", count * 10 + 1)
+    page = StudentModel.by_pagination(1, 5, total_mode="estimated")
+
+    assert (page["total"], page["total_type"]) == (count, "exact")
@@ -0,0 +1,123 @@
+import threading
+import time
+
+import pytest
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from app.db import get_db_connection
+from app.services.password_hashing import PASSWORD_HASH_METHOD, HashingBusy, PasswordHasher, password_hasher
+from tests.util import wait_for
+
+
+def occupy(hasher, seconds):
+    """Holds one of hasher's pending slots for about seconds; returns the thread doing it."""
+    thread = threading.Thread(target=hasher._run, args=('hash', time.sleep, seconds))
+    thread.start()
+    return thread
+
+
+def test_hasher_refuses_past_max_pending():
+    hasher = PasswordHasher(workers=1, max_pending=2, timeout=5)
+    try:
+        busy = [occupy(hasher, 0.5) for _ in range(2)]
+        assert wait_for(lambda: hasher.stats()["pending"] == 2)
+
+        with pytest.raises(HashingBusy):
+            hasher.hash("secret")
+
+        for thread in busy:
+            thread.join()
+        assert hasher.stats()["pending"] == 0
+        assert check_password_hash(hasher.hash("secret"), "secret")
+    finally:
+        hasher.shutdown()
+
+
+def test_hasher_gives_up_after_timeout():
+    hasher = PasswordHasher(workers=1, max_pending=2, timeout=0.05)
+    try:
+        with pytest.raises(HashingBusy):
+            hasher._run('hash', time.sleep, 0.5)
+        # The slot stays taken until the worker really finishes.
+        assert hasher.stats()["pending"] == 1
+        assert wait_for(lambda: hasher.stats()["pending"] == 0)
+    finally:
+        hasher.shutdown()
+
+
+def test_verify_returns_an_upgraded_hash_for_old_parameters():
+    hasher = PasswordHasher(workers=1)
+    try:
+        old = generate_password_hash("secret", "pbkdf2:sha256:1000")
+
+        assert hasher.verify(old, "wrong") == (False, None)
+        matches, upgraded = hasher.verify(old, "secret")
+        assert matches
+        assert upgraded.startswith(PASSWORD_HASH_METHOD + "$")
+        assert hasher.verify(upgraded, "secret") == (True, None)
+    finally:
+        hasher.shutdown()
+
+
+USERNAME = "tst_hash_user"
+PASSWORD = "correct horse"
+
+
+def execute(sql, params=()):
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(sql, params)
+        row = cur.fetchone() if cur.description else None
+        conn.commit()
+        cur.close()
+    return row
+
+
+@pytest.fixture
+def pbkdf2_user(database):
+    execute("""
+        INSERT INTO user_table (username, email, user_password) VALUES (%s, %s, %s)
+    """, (USERNAME, f"{USERNAME}@example.com", generate_password_hash(PASSWORD, "pbkdf2:sha256:1000")))
+    yield USERNAME
+    execute("DELETE FROM user_table WHERE username = %s", (USERNAME,))
+
+
+def stored_hash(username):
+    return execute("SELECT user_password FROM user_table WHERE username = %s", (username,))[0]
+
+
+def test_login_upgrades_an_old_hash(client, pbkdf2_user):
+    response = client.post("/api/auth/login", json={"username": pbkdf2_user, "password": PASSWORD})
+
+    assert response.status_code == 200
+    upgraded = stored_hash(pbkdf2_user)
+    assert upgraded.startswith(PASSWORD_HASH_METHOD + "$")
+    assert check_password_hash(upgraded, PASSWORD)
+
+    # The upgraded hash keeps working, and is not rewritten again.
+    assert client.post("/api/auth/login", json={"username": pbkdf2_user, "password": PASSWORD}).status_code == 200
+    assert stored_hash(pbkdf2_user) == upgraded
+
+
+def test_failed_login_leaves_the_old_hash(client, pbkdf2_user):
+    before = stored_hash(pbkdf2_user)
+
+    response = client.post("/api/auth/login", json={"username": pbkdf2_user, "password": "wrong"})
+
+    assert response.status_code == 401
+    assert stored_hash(pbkdf2_user) == before
+
+
+def test_login_answers_503_while_hashing_is_saturated(client, pbkdf2_user, monkeypatch):
+    monkeypatch.setattr(password_hasher, "max_pending", 1)
+    busy = occupy(password_hasher, 0.5)
+    try:
+        assert wait_for(lambda: password_hasher.stats()["pending"] == 1)
+
+        response = client.post("/api/auth/login", json={"username": pbkdf2_user, "password": PASSWORD})
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        assert "error" in response.get_json()
+    finally:
+        busy.join()
@@ -0,0 +1,152 @@
+import types
+
+import pytest
+from flask import request
+
+from app.services import rate_limit
+from app.services.rate_limit import FULL_TABLE_COST, LIST_COST, LocalBucketStore, RateLimiter
+from app.student.student_controller import bulk_cost, list_cost
+
+# conftest sets RATE_LIMIT_RATE=0, so the app-wide limiter is off; these tests build their own.
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", types.SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+def test_a_full_bucket_allows_a_burst_then_refuses(clock):
+    store = LocalBucketStore()
+
+    assert all(store.take("a", 1, 2, 5)[0] for _ in range(5))
+    allowed, wait = store.take("a", 1, 2, 5)
+
+    assert not allowed
+    assert wait == pytest.approx(0.5)
+
+
+def test_bucket_refills_at_rate_up_to_burst(clock):
+    store = LocalBucketStore()
+    for _ in range(5):
+        store.take("a", 1, 2, 5)
+
+    clock.advance(1)
+    assert [store.take("a", 1, 2, 5)[0] for _ in range(3)] == [True, True, False]
+
+    # Idle long enough to refill many times over, but the bucket holds at most burst.
+    clock.advance(3600)
+    assert [store.take("a", 1, 2, 5)[0] for _ in range(6)] == [True] * 5 + [False]
+
+
+def test_buckets_are_per_client(clock):
+    store = LocalBucketStore()
+    for _ in range(5):
+        store.take("a", 1, 2, 5)
+
+    assert store.take("b", 1, 2, 5)[0]
+
+
+def test_cost_is_weighted_and_refusals_are_free(clock):
+    store = LocalBucketStore()
+
+    assert store.take("a", 4, 1, 5) == (True, 0.0)
+    allowed, wait = store.take("a", 4, 1, 5)
+    assert not allowed
+    assert wait == pytest.approx(3)
+
+    # The refused request spent nothing, so three seconds later it fits exactly.
+    clock.advance(3)
+    assert store.take("a", 4, 1, 5)[0]
+
+
+def test_least_recently_used_buckets_are_evicted(clock):
+    store = LocalBucketStore(maxsize=2)
+    store.take("a", 1, 1, 5)
+    store.take("b", 1, 1, 5)
+    store.take("a", 1, 1, 5)
+    store.take("c", 1, 1, 5)
+
+    assert list(store._buckets) == ["a", "c"]
+
+
+def test_cost_above_burst_is_capped(clock):
+    limiter = RateLimiter(LocalBucketStore(), rate=1, burst=5)
+
+    assert limiter.hit("a", FULL_TABLE_COST)[0]
+    assert limiter.hit("a", FULL_TABLE_COST) == (False, pytest.approx(5))
+
+
+def test_store_failure_lets_requests_through():
+    class BrokenStore:
+        def take(self, key, cost, rate, burst):
+            raise ConnectionError("redis is down")
+
+    assert RateLimiter(BrokenStore(), rate=1, burst=5).hit("a", 1) == (True, 0.0)
+
+
+@pytest.mark.parametrize("query, cost", [
+    ("?page=1&limit=20", LIST_COST),
+    ("?cursor=abc&limit=20", LIST_COST),
+    ("?page=1", FULL_TABLE_COST),
+    ("?limit=20", FULL_TABLE_COST),
+    ("", FULL_TABLE_COST),
+])
+def test_list_cost(app, query, cost):
+    with app.test_request_context(f"/api/student/{query}"):
+        assert list_cost(request) == cost
+
+
+@pytest.mark.parametrize("body, cost", [
+    ({"ids": ["2024-0001"]}, LIST_COST),
+    ({"ids": ["x"] * 250}, LIST_COST + 2),
+    ({"ids": ["x"] * 100000}, FULL_TABLE_COST),
+    ({"filters": {"year": [1]}}, FULL_TABLE_COST),
+    (None, FULL_TABLE_COST),
+])
+def test_bulk_cost(app, body, cost):
+    with app.test_request_context("/api/student/bulk/delete", method="POST", json=body):
+        assert bulk_cost(request) == cost
+
+
+@pytest.fixture
+def limited(monkeypatch, clock):
+    limiter = RateLimiter(LocalBucketStore(), rate=1, burst=5)
+    monkeypatch.setattr(rate_limit, "limiter", limiter)
+    return limiter
+
+
+def test_exhausted_bucket_answers_429_with_retry_after(client, db_down, limited, clock):
+    # db_down: allowed requests fail in the view, refused ones never reach it.
+    url = "/api/student/?page=1&limit=5"
+
+    assert client.get(url).status_code != 429
+    assert client.get(url).status_code != 429
+    response = client.get(url)
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+    assert "error" in response.get_json()
+
+    clock.advance(1)
+    assert client.get(url).status_code != 429
+
+
+def test_full_table_requests_drain_the_bucket_at_once(client, db_down, limited, clock):
+    assert client.get("/api/student/export.csv").status_code != 429
+
+    response = client.get("/api/student/?page=1&limit=5")
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "2"
@@ -0,0 +1,73 @@
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from app.models.rows import STUDENT_ROW, RowMapper
+from app.services import serialization
+from app.services.serialization import dumps, json_array_chunks
+
+ROW = ("7", "2024-0007", "Ada", "Lovelace", "BSCS", 2, "Female", None, {"64": "a-64.webp"}, 160000)
+
+
+def test_row_mapper_maps_columns_and_ignores_trailing_extras():
+    assert STUDENT_ROW.one(ROW) == {
+        "id": "7", "student_id": "2024-0007", "firstname": "Ada", "lastname": "Lovelace",
+        "program_code": "BSCS", "year": 2, "gender": "Female", "pfp_url": None, "pfp_urls": {"64": "a-64.webp"},
+    }
+    assert STUDENT_ROW.one(None) is None
+    assert STUDENT_ROW.many([ROW, ROW]) == [STUDENT_ROW.one(ROW)] * 2
+
+
+def test_projection_keeps_table_order_and_ignores_unknown_fields():
+    mapper = STUDENT_ROW.project(["year", "student_id", "password"])
+
+    assert mapper.columns == ("student_id", "year")
+    assert mapper.select_list == "student_id, year"
+    # Projected mappers read rows selected with their own select_list.
+    assert mapper.one(("2024-0007", 2)) == {"student_id": "2024-0007", "year": 2}
+    assert STUDENT_ROW.project([]) is STUDENT_ROW
+    assert STUDENT_ROW.project(["nope"]) is STUDENT_ROW
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def encoder(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(serialization, "orjson", None)
+    elif serialization.orjson is None:
+        pytest.skip("orjson is not installed")
+    return request.param
+
+
+def test_dumps_matches_flask_for_non_native_types(app, encoder):
+    value = {
+        "when": datetime(2024, 5, 6, 7, 8, 9, tzinfo=timezone.utc),
+        "day": date(2024, 5, 6),
+        "amount": Decimal("1.50"),
+        "name": "Zoë",
+    }
+
+    assert json.loads(dumps(value)) == json.loads(app.json.dumps(value)) == {
+        "when": "Mon, 06 May 2024 07:08:09 GMT",
+        "day": "Mon, 06 May 2024 00:00:00 GMT",
+        "amount": "1.50",
+        "name": "Zoë",
+    }
+
+
+@pytest.mark.parametrize("rows, batch_size", [([], 2), ([ROW], 2), ([ROW] * 5, 2), ([ROW] * 4, 2)])
+def test_json_array_chunks_stream_one_valid_array(encoder, rows, batch_size):
+    chunks = list(json_array_chunks(STUDENT_ROW, rows, batch_size))
+
+    assert json.loads(b"".join(chunks)) == STUDENT_ROW.many(rows)
+    # "[", one chunk per batch, "]"
+    assert len(chunks) == 2 + -(-len(rows) // batch_size)
+
+
+def test_list_returns_only_requested_fields(app, client, database):
+    response = client.get("/api/student/?page=1&limit=2&fields=student_id,year")
+
+    page = response.get_json()
+    assert response.status_code == 200
+    assert all(set(row) == {"student_id", "year"} for row in page["data"])
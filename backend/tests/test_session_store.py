@@ -0,0 +1,153 @@
+import time
+from datetime import timedelta
+
+import pytest
+from flask import Flask, session
+
+from app.db import get_db_connection
+from app.services.session_store import PostgresSessionStore, StoreSessionInterface
+
+
+class MemoryStore:
+    def __init__(self):
+        self.records = {}
+        self.saves = 0
+
+    def load(self, sid):
+        record = self.records.get(sid)
+        return record if record and record[1] > time.time() else None
+
+    def save(self, sid, data, expires_at):
+        self.saves += 1
+        self.records[sid] = (data, expires_at)
+
+    def delete(self, sid):
+        self.records.pop(sid, None)
+
+    def purge_expired(self, batch_size=1000):
+        return 0
+
+
+def session_app(store):
+    app = Flask(__name__)
+    app.secret_key = "test"
+    app.permanent_session_lifetime = timedelta(hours=1)
+    app.session_interface = StoreSessionInterface(store, purge_interval=3600)
+
+    @app.route("/set/<value>")
+    def set_value(value):
+        session["value"] = value
+        return "ok"
+
+    @app.route("/get")
+    def get_value():
+        return session.get("value", "")
+
+    @app.route("/clear")
+    def clear():
+        session.clear()
+        return "ok"
+
+    return app
+
+
+def sid(client):
+    cookie = client.get_cookie("session")
+    return cookie.value if cookie else None
+
+
+def test_unchanged_session_is_not_written_back():
+    store = MemoryStore()
+    app = session_app(store)
+    client = app.test_client()
+
+    client.get("/set/a")
+    for _ in range(3):
+        assert client.get("/get").get_data(as_text=True) == "a"
+
+    assert store.saves == 1
+    assert app.session_interface.stats() == {"writes": 1, "skipped_writes": 3}
+
+
+def test_session_close_to_expiry_is_refreshed():
+    store = MemoryStore()
+    app = session_app(store)
+    client = app.test_client()
+    client.get("/set/a")
+
+    data, _ = store.records[sid(client)]
+    store.records[sid(client)] = (data, time.time() + 60)
+    client.get("/get")
+
+    assert store.saves == 2
+    assert store.records[sid(client)][1] > time.time() + 3000
+
+
+def test_empty_session_is_never_stored():
+    store = MemoryStore()
+    client = session_app(store).test_client()
+
+    client.get("/get")
+
+    assert store.records == {}
+    assert sid(client) is None
+
+
+def test_unknown_session_id_starts_a_new_session():
+    store = MemoryStore()
+    client = session_app(store).test_client()
+    client.set_cookie("session", "forged")
+
+    assert client.get("/get").get_data(as_text=True) == ""
+    client.get("/set/b")
+
+    assert sid(client) != "forged"
+    assert "forged" not in store.records
+
+
+def session_row(session_id):
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT data, expires_at > NOW() FROM session_table WHERE session_id = %s", (session_id,))
+        row = cur.fetchone()
+        cur.close()
+    return row
+
+
+def execute(sql, params=()):
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(sql, params)
+        conn.commit()
+        cur.close()
+
+
+@pytest.fixture
+def postgres_client(database):
+    client = session_app(PostgresSessionStore()).test_client()
+    yield client
+    if sid(client):
+        execute("DELETE FROM session_table WHERE session_id = %s", (sid(client),))
+
+
+def test_postgres_session_round_trip(postgres_client):
+    postgres_client.get("/set/hello")
+    session_id = sid(postgres_client)
+
+    data, live = session_row(session_id)
+    assert "hello" in data and live
+    assert postgres_client.get("/get").get_data(as_text=True) == "hello"
+
+    postgres_client.get("/clear")
+    assert session_row(session_id) is None
+
+
+def test_postgres_expired_session_is_not_loaded(postgres_client):
+    postgres_client.get("/set/hello")
+    session_id = sid(postgres_client)
+    execute("UPDATE session_table SET expires_at = NOW() - INTERVAL '1 second' WHERE session_id = %s", (session_id,))
+
+    assert postgres_client.get("/get").get_data(as_text=True) == ""
+
+    assert PostgresSessionStore().purge_expired(batch_size=1) >= 1
+    assert session_row(session_id) is None
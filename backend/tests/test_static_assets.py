@@ -0,0 +1,119 @@
+import gzip
+
+import pytest
+from flask import Flask, request
+
+from app.services.static_assets import IMMUTABLE, REVALIDATE, AssetManifest, precompress
+
+SCRIPT = b"console.log('hello');\n" * 200
+INDEX = b"<!doctype html><html><body><div id='root'></div></body></html>\n" * 20
+
+
+@pytest.fixture
+def build(tmp_path):
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "assets" / "index-Bx3k9QzA.js").write_bytes(SCRIPT)
+    (tmp_path / "favicon.ico").write_bytes(b"\0" * 64)
+    (tmp_path / "index.html").write_bytes(INDEX)
+    precompress(str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def manifest(build):
+    return AssetManifest(str(build))
+
+
+@pytest.fixture
+def flask_app():
+    return Flask(__name__)
+
+
+def send(flask_app, manifest, name, headers=None):
+    with flask_app.test_request_context(f"/{name}", headers=headers or {}):
+        asset = manifest.get(name)
+        response = manifest.send(asset, request)
+        response.direct_passthrough = False
+        return response
+
+
+def send_index(flask_app, manifest, headers=None):
+    with flask_app.test_request_context("/", headers=headers or {}):
+        response = manifest.send_index(request)
+        response.direct_passthrough = False
+        return response
+
+
+def test_manifest_lists_files_once_with_their_precompressed_siblings(build, manifest):
+    script = manifest.get("assets/index-Bx3k9QzA.js")
+
+    assert set(manifest.assets) == {"assets/index-Bx3k9QzA.js", "favicon.ico"}
+    assert set(script.variants) == ({"br", "gzip"} if (build / "assets" / "index-Bx3k9QzA.js.br").exists() else {"gzip"})
+    assert script.immutable
+    assert not manifest.get("favicon.ico").immutable
+    assert manifest.get("favicon.ico").variants == {}
+    assert manifest.index == INDEX
+
+
+def test_fingerprinted_asset_is_cached_forever(flask_app, manifest):
+    response = send(flask_app, manifest, "assets/index-Bx3k9QzA.js")
+
+    assert response.headers["Cache-Control"] == IMMUTABLE
+    assert response.get_data() == SCRIPT
+    assert "Content-Encoding" not in response.headers
+
+
+def test_precompressed_sibling_is_sent_when_accepted(flask_app, manifest):
+    response = send(flask_app, manifest, "assets/index-Bx3k9QzA.js", {"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert response.mimetype in ("text/javascript", "application/javascript")
+    assert gzip.decompress(response.get_data()) == SCRIPT
+
+
+def test_refused_encoding_is_never_sent(flask_app, manifest):
+    response = send(flask_app, manifest, "assets/index-Bx3k9QzA.js", {"Accept-Encoding": "gzip;q=0, br;q=0"})
+
+    assert "Content-Encoding" not in response.headers
+    assert response.get_data() == SCRIPT
+
+
+def test_unfingerprinted_file_is_revalidated_by_etag(flask_app, manifest):
+    first = send(flask_app, manifest, "favicon.ico")
+    assert first.headers["Cache-Control"] == REVALIDATE
+
+    again = send(flask_app, manifest, "favicon.ico", {"If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304
+
+
+def test_each_encoding_has_its_own_etag(flask_app, manifest):
+    plain = send(flask_app, manifest, "assets/index-Bx3k9QzA.js")
+    gzipped = send(flask_app, manifest, "assets/index-Bx3k9QzA.js", {"Accept-Encoding": "gzip"})
+
+    assert plain.headers["ETag"] != gzipped.headers["ETag"]
+    stale = send(flask_app, manifest, "assets/index-Bx3k9QzA.js", {"If-None-Match": plain.headers["ETag"], "Accept-Encoding": "gzip"})
+    assert stale.status_code == 200
+
+
+def test_index_is_served_from_memory_and_revalidated(flask_app, manifest, build):
+    (build / "index.html").write_bytes(b"changed on disk")
+
+    response = send_index(flask_app, manifest, {"Accept-Encoding": "gzip"})
+    assert response.headers["Cache-Control"] == REVALIDATE
+    assert gzip.decompress(response.get_data()) == INDEX
+
+    again = send_index(flask_app, manifest, {"Accept-Encoding": "gzip", "If-None-Match": response.headers["ETag"]})
+    assert again.status_code == 304
+
+
+def test_missing_build_has_no_index(tmp_path):
+    manifest = AssetManifest(str(tmp_path / "dist"))
+
+    assert manifest.index is None
+    assert manifest.assets == {}
+
+
+def test_unknown_api_and_asset_paths_are_404s_not_index(client):
+    assert client.get("/api/nope").status_code == 404
+    assert client.get("/assets/missing-12345678.js").status_code == 404
@@ -0,0 +1,105 @@
+import io
+import json
+
+import pytest
+
+from app.db import get_db_connection
+from app.models.program_model import program_reference
+from app.services import student_import
+from app.services.student_import import InvalidImport, import_students, read_rows
+from tests.util import wait_for
+
+
+def execute(sql, params=()):
+    """Runs sql outside the models, the way a seeder or another worker would."""
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(sql, params)
+        conn.commit()
+        cur.close()
+
+
+PROGRAM = "TSTIMP"
+
+
+@pytest.fixture
+def cleanup(database):
+    yield
+    execute("DELETE FROM student_table WHERE program_code = %s", (PROGRAM,))
+    execute("DELETE FROM program_table WHERE program_code = %s", (PROGRAM,))
+
+
+def test_import_sees_a_program_added_after_the_codes_were_loaded(cleanup):
+    program_reference.preload()
+    execute("""
+        INSERT INTO program_table (program_code, program_name, college_code)
+        SELECT %s, 'Import Test Program', college_code FROM college_table LIMIT 1
+    """, (PROGRAM,))
+
+    # Another writer's change arrives by NOTIFY, a moment after its commit.
+    assert wait_for(lambda: PROGRAM in program_reference.codes())
+
+    csv = f"student_id,firstname,lastname,program_code,year,gender\n9999-00001,Ada,Lovelace,{PROGRAM},1,Female\n"
+    report = import_students(io.BytesIO(csv.encode()), "csv")
+
+    assert report["errors"] == []
+    assert report["inserted"] == 1
+
+
+class CountingReader(io.StringIO):
+    """A text stream that records how much of itself has been read."""
+
+    def __init__(self, text):
+        super().__init__(text)
+        self.consumed = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.consumed += len(chunk)
+        return chunk
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64 * 1024])
+def test_json_array_is_read_element_by_element(monkeypatch, chunk_size):
+    monkeypatch.setattr(student_import, "JSON_CHUNK_SIZE", chunk_size)
+    rows = [{"student_id": "2024-0001", "year": 12345}, {"firstname": "Zoë \\u00e9 [,]"}, 1234567, "s", None, []]
+    text = json.dumps(rows, indent=2)
+
+    assert list(read_rows(io.StringIO(text), "json")) == rows
+
+
+def test_json_array_does_not_read_ahead_of_the_rows(monkeypatch):
+    monkeypatch.setattr(student_import, "JSON_CHUNK_SIZE", 1024)
+    stream = CountingReader(json.dumps([{"student_id": f"2024-{n:05d}"} for n in range(10000)]))
+
+    rows = read_rows(stream, "json")
+    next(rows)
+
+    assert stream.consumed <= 2048
+    assert len(list(rows)) == 9999
+
+
+@pytest.mark.parametrize("text", ["[]", " [ ] \n", "\ufeff[]"])
+def test_empty_json_array(text):
+    assert list(read_rows(io.BytesIO(text.encode()), "json")) == []
+
+
+@pytest.mark.parametrize("text", ['{"student_id": "2024-0001"}', '"rows"', "", "nonsense"])
+def test_json_import_must_be_an_array(text):
+    with pytest.raises(InvalidImport, match="must be an array"):
+        list(read_rows(io.StringIO(text), "json"))
+
+
+@pytest.mark.parametrize("text, good_rows", [
+    ('[{"a": 1}, {"a": 2', 1),
+    ('[{"a": 1} {"a": 2}]', 1),
+    ('[{"a": 1},]', 1),
+    ('[{"a": 1}] trailing', 1),
+    ('[{"a": 1}, {"a": nope}]', 1),
+])
+def test_json_syntax_error_ends_the_import_with_a_row_error(text, good_rows):
+    rows = list(read_rows(io.StringIO(text), "json"))
+
+    assert rows[:good_rows] == [{"a": 1}] * good_rows
+    assert len(rows) == good_rows + 1
+    assert rows[-1]["__error__"].startswith("Invalid JSON")
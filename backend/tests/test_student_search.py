@@ -0,0 +1,110 @@
+import pytest
+
+from app.db import get_db_connection
+from app.models.student_model import StudentModel
+from app.models.student_search import build_student_search
+
+
+def test_student_id_prefix_is_a_plain_prefix_match():
+    condition, params, _, _ = build_student_search(" 2024-00 ")
+
+    assert condition == "(student_id LIKE %s)"
+    assert params == ["2024-00%"]
+
+
+def test_free_text_searches_names_ids_and_programs():
+    condition, params, _, _ = build_student_search("ada")
+
+    for column in ("student_id", "firstname", "lastname", "program_code"):
+        assert f"{column} ILIKE %s" in condition
+    assert params == ["%ada%"] * 4
+
+
+def test_year_and_gender_resolve_to_exact_values():
+    condition, params, _, _ = build_student_search("3")
+    assert "year = ANY(%s)" in condition
+    assert [3] in params
+
+    condition, params, _, _ = build_student_search("MA")
+    assert "gender = ANY(%s)" in condition
+    assert ["Male", "Female"] in params
+
+
+def test_like_wildcards_are_escaped():
+    _, params, _, _ = build_student_search("50%_\\")
+
+    assert params[0] == "%50\\%\\_\\\\%"
+
+
+PROGRAM = "TSTSRC"
+
+
+def execute(sql, params=()):
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(sql, params)
+        conn.commit()
+        cur.close()
+
+
+@pytest.fixture
+def searchable(database):
+    execute("""
+        INSERT INTO program_table (program_code, program_name, college_code)
+        SELECT %s, 'Search Test Program', college_code FROM college_table LIMIT 1
+    """, (PROGRAM,))
+    execute("""
+        INSERT INTO student_table (student_id, firstname, lastname, program_code, year, gender) VALUES
+        ('9996-0001', 'Ada', 'Pretrigramtestx', %s, 1, 'Female'),
+        ('9996-0002', 'Bo', 'Trigramtest', %s, 2, 'Male'),
+        ('9996-0003', 'Cy', 'Trigramtestson', %s, 3, 'Other')
+    """, (PROGRAM, PROGRAM, PROGRAM))
+    yield
+    execute("DELETE FROM student_table WHERE program_code = %s", (PROGRAM,))
+    execute("DELETE FROM program_table WHERE program_code = %s", (PROGRAM,))
+
+
+def search(term, sort_by="student_id", **filters):
+    page = StudentModel.by_pagination(1, 50, sort_by, "ASC", term, {"program": [PROGRAM], **filters})
+    return [row["student_id"] for row in page["data"]]
+
+
+def test_substring_search_matches_inside_names(searchable):
+    assert search("RIGRAMTE") == ["9996-0001", "9996-0002", "9996-0003"]
+    assert search("testson") == ["9996-0003"]
+
+
+def test_student_id_prefix_search(searchable):
+    assert search("9996-000") == ["9996-0001", "9996-0002", "9996-0003"]
+    assert search("9996-0002") == ["9996-0002"]
+    # A prefix, not a substring: the ID's tail alone does not match as a prefix term.
+    assert search("9996-02") == []
+
+
+def test_year_and_gender_terms(searchable):
+    assert search("3") == ["9996-0003"]
+    assert search("female") == ["9996-0001"]
+
+
+def test_wildcards_match_literally(searchable):
+    assert search("%") == []
+    assert search("_") == []
+
+
+def test_relevance_puts_exact_then_prefix_then_substring_hits_first(searchable):
+    assert search("trigramtest", sort_by="relevance") == ["9996-0002", "9996-0003", "9996-0001"]
+
+
+def test_search_is_served_by_the_trigram_index(searchable):
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        if cur.fetchone() is None:
+            pytest.skip("pg_trgm is not installed")
+        condition, params, _, _ = build_student_search("trigramtest")
+        cur.execute("SET LOCAL enable_seqscan = off")
+        cur.execute(f"EXPLAIN SELECT id FROM student_table WHERE {condition}", params)
+        plan = "\n".join(row[0] for row in cur.fetchall())
+        cur.close()
+
+    assert "trgm" in plan
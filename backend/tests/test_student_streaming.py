@@ -0,0 +1,33 @@
+def test_unpaginated_list_reports_db_failure_before_streaming(client, db_down):
+    response = client.get("/api/student/", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 500
+    assert response.is_json
+    assert "error" in response.get_json()
+    assert "Content-Encoding" not in response.headers
+
+
+def test_unpaginated_list_streams_matching_students(client, database):
+    page = client.get("/api/student/?page=1&limit=5&sort_by=student_id").get_json()
+    student_id = page["data"][0]["student_id"]
+
+    response = client.get(f"/api/student/?search={student_id}")
+
+    assert response.status_code == 200
+    assert student_id in [row["student_id"] for row in response.get_json()]
+
+
+def test_export_reports_db_failure_before_download_starts(client, db_down):
+    response = client.get("/api/student/export.csv")
+
+    assert response.status_code == 500
+    assert response.is_json
+    assert "Content-Disposition" not in response.headers
+
+
+def test_export_includes_avatar_columns(client, database):
+    response = client.get("/api/student/export.csv?search=2024-0001")
+
+    assert response.status_code == 200
+    header = response.get_data(as_text=True).splitlines()[0].split(",")
+    assert header[-2:] == ["pfp_url", "pfp_urls"]
@@ -0,0 +1,75 @@
+import pytest
+
+from app import db
+from app.db import get_db_connection, get_pool
+from app.services.table_versions import PostgresVersionStore
+from tests.util import wait_for
+
+
+def rename_college(code, name):
+    """Writes straight to the table, the way a seeder or another worker would."""
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("UPDATE college_table SET college_name = %s WHERE college_code = %s", (name, code))
+        conn.commit()
+        cur.close()
+
+
+@pytest.fixture
+def queries(monkeypatch):
+    """Counts every statement run through a pooled connection."""
+    count = [0]
+    record_query = db.record_query
+
+    def counting(query, params, seconds):
+        count[0] += 1
+        record_query(query, params, seconds)
+
+    monkeypatch.setattr(db, "record_query", counting)
+    return count
+
+
+def test_not_modified_answers_without_touching_the_database(client, database, queries):
+    etag = client.get("/api/colleges/").headers["ETag"]
+    checkouts = get_pool().stats()["checkouts"]
+    queries[0] = 0
+
+    response = client.get("/api/colleges/", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert queries[0] == 0
+    assert get_pool().stats()["checkouts"] == checkouts
+
+
+def test_write_outside_the_models_invalidates_the_etag(client, database):
+    first = client.get("/api/colleges/")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert client.get("/api/colleges/", headers={"If-None-Match": etag}).status_code == 304
+
+    # A no-op rename still counts as a write, so nothing needs restoring.
+    college = first.get_json()[0]
+    rename_college(college["college_code"], college["college_name"])
+
+    assert wait_for(lambda: client.get("/api/colleges/", headers={"If-None-Match": etag}).status_code == 200)
+    assert client.get("/api/colleges/").headers["ETag"] != etag
+
+
+def test_listener_reloads_on_notify(database):
+    # With max_age this long, only a notification can move the snapshot.
+    store = PostgresVersionStore(max_age=3600)
+    try:
+        before = store.get(["college_table"])[0][0]
+        assert wait_for(lambda: store.stats()["listening"])
+
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT college_code, college_name FROM college_table LIMIT 1")
+            code, name = cur.fetchone()
+            cur.close()
+        rename_college(code, name)
+
+        assert wait_for(lambda: store.get(["college_table"])[0][0] != before)
+    finally:
+        store.close()
+    assert not store.stats()["listening"]
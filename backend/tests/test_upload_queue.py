@@ -0,0 +1,159 @@
+import io
+
+import pytest
+
+from app.db import get_db_connection
+from app.models.student_model import StudentModel
+from app.models.upload_job_model import UploadJobModel
+from app.services import upload_queue as upload_queue_module
+from app.services.image_processing import InvalidImage, make_thumbnails
+from app.services.upload_queue import UploadQueue
+
+
+class FakeStorage:
+    def __init__(self):
+        self.uploaded = []
+        self.deleted = []
+
+    def upload(self, data, filename, content_type=None):
+        url = f"/uploads/{len(self.uploaded)}-{filename}"
+        self.uploaded.append(url)
+        return url
+
+    def delete(self, url):
+        self.deleted.append(url)
+
+
+class FakeJobs:
+    def __init__(self):
+        self.statuses = []
+
+    def update_status(self, job_id, status, **fields):
+        self.statuses.append((status, fields))
+
+
+VARIANTS = {"sm": (b"s", "image/jpeg"), "md": (b"m", "image/jpeg"), "lg": (b"l", "image/jpeg")}
+
+
+@pytest.fixture
+def env(monkeypatch):
+    storage, jobs = FakeStorage(), FakeJobs()
+    monkeypatch.setattr(upload_queue_module, "get_storage", lambda: storage)
+    monkeypatch.setattr(upload_queue_module, "UploadJobModel", jobs)
+    monkeypatch.setattr(upload_queue_module, "make_thumbnails", lambda data: VARIANTS)
+    return storage, jobs
+
+
+def run(queue, handler):
+    queue.register("student", handler)
+    queue._run(1, "student", 7, b"image", "me.jpg", "image/jpeg")
+
+
+def test_deleted_target_is_not_retried_and_uploads_are_removed(env):
+    storage, jobs = env
+    calls = []
+
+    def handler(target_id, url, variant_urls):
+        calls.append(target_id)
+        raise LookupError("Student 7 no longer exists")
+
+    run(UploadQueue(max_attempts=3, backoff=0), handler)
+
+    assert len(calls) == 1
+    assert sorted(storage.deleted) == sorted(storage.uploaded)
+    assert jobs.statuses[-1][0] == "failed"
+
+
+def test_handler_retry_does_not_upload_again(env):
+    storage, jobs = env
+    calls = []
+
+    def handler(target_id, url, variant_urls):
+        calls.append(url)
+        if len(calls) == 1:
+            raise RuntimeError("database hiccup")
+
+    run(UploadQueue(max_attempts=3, backoff=0), handler)
+
+    assert len(calls) == 2
+    assert len(storage.uploaded) == len(VARIANTS)
+    assert storage.deleted == []
+    assert jobs.statuses[-1][0] == "done"
+
+
+def test_unexpected_error_marks_job_failed(env, monkeypatch):
+    storage, jobs = env
+
+    def broken(data):
+        raise RuntimeError("decoder crashed")
+
+    monkeypatch.setattr(upload_queue_module, "make_thumbnails", broken)
+    run(UploadQueue(max_attempts=3, backoff=0), lambda *args: None)
+
+    assert jobs.statuses[-1] == ("failed", {"error": "decoder crashed"})
+
+
+def test_truncated_jpeg_is_an_invalid_image():
+    Image = pytest.importorskip("PIL.Image")
+    buffer = io.BytesIO()
+    Image.new("RGB", (256, 256), (200, 30, 30)).save(buffer, format="JPEG")
+
+    with pytest.raises(InvalidImage):
+        make_thumbnails(buffer.getvalue()[:400])
+
+
+def jpeg():
+    Image = pytest.importorskip("PIL.Image")
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 64), (30, 120, 200)).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+def backdate(job_id, status):
+    """Leaves a job the way a process that died mid-upload does: unfinished and no longer updated."""
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "UPDATE upload_job_table SET status = %s, updated_at = NOW() - INTERVAL '1 hour' WHERE id = %s",
+            (status, job_id)
+        )
+        conn.commit()
+        cur.close()
+
+
+@pytest.fixture
+def orphaned_jobs(student_id):
+    target = StudentModel.get_by_id(student_id)["id"]
+    resumable = UploadJobModel.create("student", target, jpeg(), "me.jpg", "image/jpeg")
+    lost = UploadJobModel.create("student", target)
+    backdate(resumable, "processing")
+    backdate(lost, "pending")
+    yield target, resumable, lost
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM upload_job_table WHERE id IN (%s, %s)", (resumable, lost))
+        conn.commit()
+        cur.close()
+
+
+def test_job_outlives_its_process(orphaned_jobs, monkeypatch):
+    target, resumable, lost = orphaned_jobs
+    storage = FakeStorage()
+    monkeypatch.setattr(upload_queue_module, "get_storage", lambda: storage)
+    saved = []
+
+    # A fresh queue stands in for the next process to start.
+    queue = UploadQueue(max_workers=1, backoff=0, stale_after=60, recover_interval=0)
+    queue.register("student", lambda target_id, url, variant_urls: saved.append((target_id, url)))
+    assert queue.recover() >= 2
+    queue.shutdown()
+
+    assert saved == [(target, storage.uploaded[-1])]
+    assert UploadJobModel.get_by_id(resumable)["status"] == "done"
+    assert UploadJobModel.get_by_id(lost)["status"] == "failed"
+    assert UploadJobModel.get_pending("student", target) is None
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT COUNT(*) FROM upload_job_table WHERE id = %s AND payload IS NOT NULL", (resumable,))
+        assert cur.fetchone()[0] == 0
+        cur.close()
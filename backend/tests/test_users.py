@@ -0,0 +1,61 @@
+import pytest
+from werkzeug.security import generate_password_hash
+
+from app.db import get_db_connection
+from app.models.user_model import Users, user_cache
+
+USERNAME = "tst_user_shape"
+PASSWORD = "hunter22"
+
+
+def execute(sql, params=()):
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(sql, params)
+        row = cur.fetchone() if cur.description else None
+        conn.commit()
+        cur.close()
+    return row
+
+
+@pytest.fixture
+def user_id(database):
+    row = execute("""
+        INSERT INTO user_table (username, email, user_password) VALUES (%s, %s, %s) RETURNING id
+    """, (USERNAME, f"{USERNAME}@example.com", generate_password_hash(PASSWORD, "pbkdf2:sha256:1000")))
+    yield str(row[0])
+    Users.invalidate_cache(row[0])
+    execute("DELETE FROM user_table WHERE id = %s", (row[0],))
+
+
+def test_loaded_users_never_carry_the_password_hash(user_id):
+    loaded = Users.get_by_id(user_id)
+
+    assert not any("password" in name for name in vars(loaded))
+
+
+def test_cached_and_loaded_users_have_the_same_shape(user_id):
+    user_cache.delete(user_id)
+
+    from_db = Users.get_cached(user_id)
+    from_cache = Users.get_cached(user_id)
+
+    assert user_cache.get(user_id) is not None
+    assert vars(from_cache) == vars(from_db) == vars(Users.get_by_id(user_id))
+
+
+def test_authenticate(user_id):
+    assert Users.authenticate(USERNAME, PASSWORD).id == user_id
+    assert Users.authenticate(USERNAME, "wrong") is None
+    assert Users.authenticate("tst_no_such_user", PASSWORD) is None
+
+
+def test_login_session_loads_the_user(client, user_id):
+    response = client.post("/api/auth/login", json={"username": USERNAME, "password": PASSWORD})
+    assert response.status_code == 200
+    assert "user_password" not in response.get_json()["user"]
+
+    me = client.get("/api/auth/me").get_json()
+
+    assert me["success"]
+    assert me["user"]["id"] == user_id
@@ -0,0 +1,11 @@
+import time
+
+
+def wait_for(condition, timeout=5.0):
+    """Polls condition until it holds; for changes that arrive asynchronously, like NOTIFY."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.05)
+    return True
@@ -12,7 +12,8 @@ const collegeApi = {
     limit: number,
     sortBy: string = "college_code",
     sortOrder: "asc" | "desc" = "asc",
-    search: string = ""
+    search: string = "",
+    fields?: string[]
   ) => {
     const response = await api.get<FetchCollegesResponse>("/colleges/", {
       params: {
@@ -21,6 +22,7 @@ const collegeApi = {
         sort_by: sortBy,
         sort_order: sortOrder,
         search: search,
+        fields: fields?.join(","),
       },
     });
     return response.data;
@@ -12,7 +12,8 @@ const programApi = {
     limit: number,
     sortBy: string = "program_code",
     sortOrder: "asc" | "desc" = "asc",
-    search: string = ""
+    search: string = "",
+    fields?: string[]
   ) => {
     const response = await api.get<FetchProgramsResponse>("/programs/", {
       params: {
@@ -21,6 +22,7 @@ const programApi = {
         sort_by: sortBy,
         sort_order: sortOrder,
         search: search,
+        fields: fields?.join(","),
       },
     });
     return response.data;
@@ -45,7 +45,7 @@ export function StudenCardDetails({
         {/* --- IMAGE DISPLAY LOGIC --- */}
         <Avatar className="h-32 w-32 border-4 border-white shadow-lg mb-4">
           <AvatarImage
-            src={student.pfp_url || defaultpfp}
+            src={student.pfp_urls?.md || student.pfp_url || defaultpfp}
             className="object-cover"
           />
           <AvatarFallback className="text-2xl bg-slate-200">
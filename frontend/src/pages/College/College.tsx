@@ -41,7 +41,8 @@ export default function CollegePage() {
         limit,
         sortBy,
         sortOrder,
-        searchQuery
+        searchQuery,
+        ["college_code", "college_name"]
       );
 
       console.log("Colleges API Response:", response);
@@ -51,7 +51,8 @@ export default function ProgramPage() {
         queryParams.limit,
         queryParams.sortBy,
         queryParams.sortOrder,
-        queryParams.searchQuery
+        queryParams.searchQuery,
+        ["program_code", "program_name", "college_code"]
       );
 
       console.log("Program API Response:", response);
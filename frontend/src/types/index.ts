@@ -11,6 +11,12 @@ export interface Program {
   college_code: string;
 }
 
+export interface AvatarUrls {
+  sm: string;
+  md: string;
+  lg: string;
+}
+
 export interface Student {
   id: number;
   student_id: string;
@@ -20,4 +26,5 @@ export interface Student {
   year: number;
   gender: string;
   pfp_url?: string;
+  pfp_urls?: AvatarUrls | null;
 }